@@ -0,0 +1,60 @@
+"""
+Бенчмарк очистки CSV: два прохода с регулярным выражением против analyze_and_clean
+
+Запуск: python benchmarks/bench_csv_clean.py [количество_строк] [количество_колонок]
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_processing import analyze_and_clean
+
+def make_frame(rows, columns):
+    """Широкая таблица строк с ~1% пустых и пробельных значений"""
+    rng = np.random.default_rng(42)
+    values = np.array([f"значение {i}" for i in range(1000)] + ["", "  "], dtype=object)
+    data = {}
+    for column in range(columns):
+        weights = np.full(len(values), 0.99 / 1000)
+        weights[-2:] = 0.005
+        data[f"col{column}"] = pd.Series(rng.choice(values, size=rows, p=weights), dtype=str)
+    return pd.DataFrame(data)
+
+def two_pass(df):
+    """Прежняя реализация: get_csv_stats и clean_csv_data с заменой по regex"""
+    empty_counts = df.replace(r'^\s*$', np.nan, regex=True).isna().sum()
+    stats = {'missing_values': empty_counts.to_dict(), 'total_missing': empty_counts.sum()}
+    cleaned = df.replace(r'^\s*$', np.nan, regex=True).dropna()
+    return stats, cleaned
+
+def measure(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    df = make_frame(rows, columns)
+    print(f"Строк: {rows}, колонок: {columns}")
+
+    old_time, (old_stats, old_cleaned) = measure(two_pass, df)
+    new_time, (new_stats, new_cleaned) = measure(analyze_and_clean, df)
+
+    assert old_stats['missing_values'] == new_stats['missing_values']
+    assert old_cleaned.index.equals(new_cleaned.index)
+
+    print(f"Два прохода (regex):  {old_time:.2f} с")
+    print(f"analyze_and_clean:    {new_time:.2f} с")
+    print(f"Ускорение:            x{old_time / new_time:.1f}")
+    print(f"Осталось строк: {len(new_cleaned)}, пропусков: {new_stats['total_missing']}")
+
+if __name__ == "__main__":
+    main()
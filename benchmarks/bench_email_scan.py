@@ -0,0 +1,65 @@
+"""
+Бенчмарк поиска email: extract_emails по тексту файла против extract_emails_from_files
+
+Запуск: python benchmarks/bench_email_scan.py [размер_файла_МБ] [процессов]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_processing import extract_emails, unique_emails
+from utils.emails import extract_emails_from_files
+
+WORDS = "отчет за неделю по проекту задача часы команда please find attached regards".split()
+
+def make_mail_block(lines=20000):
+    """Выгрузка почты: заголовки с адресами и строки текста без них"""
+    rng = random.Random(42)
+    result = []
+    for i in range(lines):
+        if i % 25 == 0:
+            result.append(f"From: User {rng.randint(1, 5000)} <user{rng.randint(1, 5000)}@example.com>")
+        elif i % 25 == 1:
+            result.append(f"To: Team{rng.randint(1, 300)}@Corp.example.org")
+        else:
+            result.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15))))
+    return ("\n".join(result) + "\n").encode('utf-8')
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    block = make_mail_block()
+    with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
+        for _ in range(max(1, size_mb * 1024 * 1024 // len(block))):
+            f.write(block)
+        path = f.name
+    try:
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"Файл: {size:.0f} МБ, процессов: {workers}")
+
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            old = unique_emails(extract_emails(f.read()))
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = extract_emails_from_files([path], workers=workers)
+        new_time = time.perf_counter() - start
+
+        assert [match.email for match in new] == old
+
+        print(f"extract_emails (текст целиком): {old_time:.2f} с ({size / old_time:.0f} МБ/с)")
+        print(f"extract_emails_from_files:      {new_time:.2f} с ({size / new_time:.0f} МБ/с)")
+        print(f"Ускорение:                      x{old_time / new_time:.1f}")
+        print(f"Уникальных адресов: {len(new)}")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Бенчмарк импорта задач: чтение CSV, векторная проверка и подготовка данных для COPY
+
+Сервер БД не нужен: измеряется часть импорта, выполняемая приложением.
+Загрузка через COPY и перенос в таблицу tasks выполняются сервером.
+
+Запуск: python benchmarks/bench_import.py [количество_строк]
+"""
+
+import sys
+import os
+import io
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from database.importer import References, map_columns, prepare_tasks
+
+EMPLOYEES = 500
+PROJECTS = 100
+
+def make_tasks_csv(path, rows):
+    """CSV задач: сотрудники по id, проекты по названию, ~0.1% ошибочных строк"""
+    rng = np.random.default_rng(42)
+    hours = rng.integers(0, 40, rows).astype(str).astype(object)
+    hours[rng.random(rows) < 0.001] = "много"
+    pd.DataFrame({
+        'title': [f"Задача {i}" for i in range(rows)],
+        'description': "Описание задачи",
+        'status': rng.choice(["В процессе", "Завершено"], rows),
+        'hours_required': hours,
+        'employee': rng.integers(1, EMPLOYEES + 1, rows),
+        'project': [f"Проект {i}" for i in rng.integers(1, PROJECTS + 1, rows)],
+    }).to_csv(path, index=False)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    references = References([(i, f"Сотрудник {i}") for i in range(1, EMPLOYEES + 1)],
+                            [(i, f"Проект {i}") for i in range(1, PROJECTS + 1)])
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+        path = f.name
+    try:
+        make_tasks_csv(path, rows)
+        print(f"Строк: {rows}, размер файла: {os.path.getsize(path) / 1024 / 1024:.0f} МБ")
+
+        read_time = prepare_time = copy_time = 0.0
+        valid_rows = rejected_rows = 0
+        columns = None
+        start = time.perf_counter()
+        reader = pd.read_csv(path, dtype=str, keep_default_na=False,
+                             chunksize=config.IMPORT_CHUNK_ROWS)
+        for chunk in reader:
+            now = time.perf_counter()
+            read_time += now - start
+            columns = columns or map_columns(chunk.columns, 'tasks')
+            valid, rejected = prepare_tasks(chunk, columns, references)
+            start = time.perf_counter()
+            prepare_time += start - now
+            buffer = io.StringIO()
+            valid.to_csv(buffer, index=False, header=False)
+            now = time.perf_counter()
+            copy_time += now - start
+            start = now
+            valid_rows += len(valid)
+            rejected_rows += len(rejected)
+
+        total = read_time + prepare_time + copy_time
+        print(f"Чтение CSV:           {read_time:.2f} с")
+        print(f"Проверка и ссылки:    {prepare_time:.2f} с")
+        print(f"Данные для COPY:      {copy_time:.2f} с")
+        print(f"Всего:                {total:.2f} с ({rows / total:,.0f} строк/с)")
+        print(f"Принято: {valid_rows}, отклонено: {rejected_rows}")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
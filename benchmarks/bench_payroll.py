@@ -0,0 +1,54 @@
+"""
+Бенчмарк пакетного расчета зарплаты
+
+Запуск: python benchmarks/bench_payroll.py [количество_сотрудников]
+"""
+
+import sys
+import os
+import time
+from unittest.mock import MagicMock
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import Employee
+from utils.payroll import PayrollEngine, PayrollPeriod
+
+POSITIONS = ["Разработчик", "Менеджер проектов", "Дизайнер", "Тестировщик"]
+
+def make_rows(count):
+    """Строки в формате агрегирующего запроса PayrollEngine"""
+    return [
+        (i, f"Сотрудник {i}", POSITIONS[i % len(POSITIONS)], 50000.0 + i % 100 * 1000, float(i % 220))
+        for i in range(1, count + 1)
+    ]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = make_rows(count)
+    db = MagicMock()
+    db.execute_query.return_value = rows
+    engine = PayrollEngine(db, norms_by_position={"Менеджер проектов": 150},
+                           overtime_multiplier=1.5)
+    period = PayrollPeriod.month(2026, 1)
+
+    start = time.perf_counter()
+    hours = engine.load_hours(period)
+    loaded = time.perf_counter()
+    engine.compute(period, hours)
+    computed = time.perf_counter()
+
+    employees = [Employee(row[1], row[2], row[3], row[4], row[0]) for row in rows]
+    per_object_start = time.perf_counter()
+    for employee in employees:
+        employee.calculate_pay()
+    per_object = time.perf_counter() - per_object_start
+
+    print(f"Сотрудников: {count}")
+    print(f"Построение фрейма:       {(loaded - start) * 1000:8.2f} мс")
+    print(f"Векторизованный расчет:  {(computed - loaded) * 1000:8.2f} мс")
+    print(f"Employee.calculate_pay:  {per_object * 1000:8.2f} мс (без норм и сверхурочных)")
+
+if __name__ == '__main__':
+    main()
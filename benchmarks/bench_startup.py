@@ -0,0 +1,60 @@
+"""
+Профиль времени импорта при запуске приложения
+
+Запуск: python benchmarks/bench_startup.py [количество_модулей]
+
+Импортирует модули главного окна в отдельном процессе с -X importtime
+и выводит самые медленные модули, общее время и тяжелые зависимости,
+загруженные до показа окна.
+"""
+
+import sys
+import os
+import subprocess
+
+# Добавляем путь к проекту для импорта модулей
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+import config
+
+STARTUP_MODULE = "gui.main_window"
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+
+def profile_imports(module=STARTUP_MODULE):
+    """Список (модуль, вложенность, собственное и накопленное время в мкс)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Имя отделено одним пробелом, вложенность - по два пробела на уровень
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    entries = profile_imports()
+    # Общее время складывается из модулей верхнего уровня
+    total_us = sum(cumulative for _, depth, _, cumulative in entries if depth == 0)
+
+    print(f"Импорт {STARTUP_MODULE}: {total_us / 1e6:.3f} с, модулей: {len(entries)}")
+    print(f"Бюджет запуска: {config.STARTUP_TIME_BUDGET:.3f} с\n")
+    print(f"{'накопл., мс':>12} {'собств., мс':>12}  модуль")
+    for name, _, self_us, cumulative_us in sorted(entries, key=lambda e: e[3], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:12.1f} {self_us / 1000:12.1f}  {name}")
+
+    loaded = {name for name, _, _, _ in entries}
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    if heavy:
+        print(f"\nДо показа окна загружаются тяжелые модули: {', '.join(heavy)}")
+    else:
+        print(f"\nТяжелые модули ({', '.join(HEAVY_MODULES)}) загружаются отложенно")
+
+if __name__ == "__main__":
+    main()
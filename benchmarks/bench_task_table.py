@@ -0,0 +1,63 @@
+"""
+Бенчмарк памяти: список объектов Task против колоночной TaskTable
+
+Запуск: python benchmarks/bench_task_table.py [количество_строк]
+"""
+
+import sys
+import os
+import gc
+import tracemalloc
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import Employee, Task, TaskTable
+
+STATUSES = ["В процессе", "Завершено"]
+EMPLOYEES = [f"Сотрудник {i}" for i in range(500)]
+PROJECTS = [f"Проект {i}" for i in range(50)]
+
+def make_rows(count):
+    """Строки в формате запроса get_all_tasks"""
+    for i in range(1, count + 1):
+        emp_id = i % len(EMPLOYEES) + 1
+        proj_id = i % len(PROJECTS) + 1
+        yield (
+            i, f"Задача {i}", f"Описание задачи {i}", STATUSES[i % 2],
+            float(i % 40), emp_id, proj_id,
+            EMPLOYEES[emp_id - 1], PROJECTS[proj_id - 1]
+        )
+
+def build_objects(count):
+    """Текущая схема гидратации: Task + отдельный Employee на каждую задачу"""
+    tasks = []
+    for row in make_rows(count):
+        task = Task(row[1], row[2], row[3], hours_required=row[4], task_id=row[0])
+        task.assigned_employee = Employee(row[7] or "", "", 0, 0, row[5])
+        task.project_id = row[6]
+        tasks.append(task)
+    return tasks
+
+def build_table(count):
+    return TaskTable.from_rows(make_rows(count))
+
+def measure(builder, count):
+    """Объем памяти (байт), занятый результатом builder"""
+    gc.collect()
+    tracemalloc.start()
+    result = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Строк: {count}")
+    for label, builder in (("Task + Employee", build_objects), ("TaskTable", build_table)):
+        used = measure(builder, count)
+        print(f"{label:<16} {used / 1024 / 1024:8.1f} МБ  {used / count:8.1f} байт/строка")
+
+if __name__ == '__main__':
+    main()
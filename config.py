@@ -24,6 +24,35 @@ DEFAULT_DB_CONFIG = {
     "port": "5432"
 }
 
+# Таймаут установки подключения к БД, секунды
+DB_CONNECT_TIMEOUT = 5
+
 # Настройки экспорта
 CSV_ENCODING = 'utf-8'
-DATE_FORMAT = '%Y%m%d_%H%M%S'
\ No newline at end of file
+CSV_CHUNK_SIZE = 100_000  # Строк в части при потоковой обработке CSV
+CSV_WORKERS = 1  # Процессов для очистки CSV (1 - без пула процессов)
+CSV_RANGE_BYTES = 64 * 1024 * 1024  # Размер диапазона файла для одного процесса
+CSV_ENGINES = ('c', 'pyarrow')  # Движки чтения CSV
+CSV_ENGINE = 'c'  # 'pyarrow' - многопоточное чтение через Arrow (если установлен pyarrow)
+CSV_ARROW_BLOCK_BYTES = 16 * 1024 * 1024  # Размер блока, разбираемого одним потоком Arrow
+CSV_BATCH_WORKERS = 4  # Процессов для пакетной очистки каталога
+CSV_BATCH_MANIFEST = DATA_DIR / "csv_batch_manifest.json"  # Файлы, очищенные в прошлых запусках
+EMAIL_SCAN_RANGE_BYTES = 64 * 1024 * 1024  # Размер части файла при поиске email
+EMAIL_SCAN_WORKERS = 4  # Процессов для поиска email в файлах
+EMAIL_SCAN_WINDOW_BYTES = 320  # Байтов по обе стороны от '@', декодируемых при поиске email
+EXPORT_FORMATS = {'parquet': '.parquet', 'feather': '.feather'}  # Колоночные форматы (нужен pyarrow)
+PARQUET_COMPRESSION = 'zstd'
+FEATHER_COMPRESSION = 'zstd'
+EXPORT_BATCH_ROWS = 50_000  # Строк в пакете при потоковой выгрузке из БД
+EXPORT_WORKERS = 3  # Выгрузок, выполняемых одновременно (каждая - в своем подключении к БД)
+IMPORT_CHUNK_ROWS = 100_000  # Строк в части при импорте CSV в БД
+DATE_FORMAT = '%Y%m%d_%H%M%S'
+
+# Настройки расчета зарплаты
+PAYROLL_NORM_HOURS = 160  # Норма часов в месяц по умолчанию
+PAYROLL_NORMS_BY_MONTH = {}  # {'YYYY-MM' или 'MM': часы}
+PAYROLL_NORMS_BY_POSITION = {}  # {должность: часы в месяц}
+PAYROLL_OVERTIME_MULTIPLIER = 1.0  # Коэффициент оплаты часов сверх нормы
+
+# Бюджет времени запуска (от старта процесса до показа окна), секунды
+STARTUP_TIME_BUDGET = 1.0
@@ -4,11 +4,13 @@
 
 from .db_connection import DatabaseConnection
 from .db_manager import DatabaseManager
+from .schema import ensure_schema
 
 from .db_connection_gui import DatabaseConnectionDialog, DatabaseConnectionManager
 __all__ = [
     'DatabaseConnection', 
     'DatabaseManager',
+    'ensure_schema',
     'DatabaseConnectionDialog',
     'DatabaseConnectionManager'
 ]
\ No newline at end of file
@@ -2,8 +2,11 @@
 Модуль для подключения к БД
 """
 
+import uuid
+from contextlib import contextmanager
+
 import psycopg2
-from psycopg2 import OperationalError, Error
+from psycopg2 import OperationalError, Error, extras
 import config
 
 class DatabaseConnection:
@@ -22,7 +25,8 @@ class DatabaseConnection:
                 database=self.config["database"],
                 user=self.config["user"],
                 password=self.config["password"],
-                port=self.config.get("port", "5432")
+                port=self.config.get("port", "5432"),
+                connect_timeout=self.config.get("connect_timeout", config.DB_CONNECT_TIMEOUT)
             )
             self.is_connected = True
             print("Успешное подключение к БД")
@@ -39,6 +43,14 @@ class DatabaseConnection:
             self.is_connected = False
             print("Подключение к БД закрыто")
     
+    def cancel(self):
+        """Прервать выполняемый запрос (можно вызывать из другого потока).
+        
+        Прерванный запрос завершается ошибкой QueryCanceledError.
+        """
+        if self.connection and not self.connection.closed:
+            self.connection.cancel()
+    
     def test_connection(self):
         """Тестирование подключения к БД"""
         try:
@@ -74,6 +86,115 @@ class DatabaseConnection:
             print(f"Ошибка выполнения запроса: {e}")
             return None
     
+    def execute_values(self, query, rows, page_size=1000):
+        """Выполнить пакетный запрос (INSERT ... VALUES %s) для списка строк"""
+        if not self.test_connection():
+            print("Нет подключения к БД")
+            return False
+        
+        try:
+            cursor = self.connection.cursor()
+            extras.execute_values(cursor, query, rows, page_size=page_size)
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            if self.connection:
+                self.connection.rollback()
+            print(f"Ошибка выполнения пакетного запроса: {e}")
+            return False
+    
+    def copy_expert(self, query, file, params=None):
+        """Выполнить COPY ... TO STDOUT / FROM STDIN с потоковой передачей через file.
+        
+        Данные передаются частями, поэтому память не зависит от объема.
+        COPY не принимает параметры, поэтому они подставляются через mogrify.
+        """
+        if not self.test_connection():
+            print("Нет подключения к БД")
+            return False
+        
+        try:
+            cursor = self.connection.cursor()
+            if params is not None:
+                query = cursor.mogrify(query, params)
+            cursor.copy_expert(query, file)
+            self.connection.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            if self.connection:
+                self.connection.rollback()
+            print(f"Ошибка выполнения COPY: {e}")
+            return False
+    
+    @contextmanager
+    def transaction(self):
+        """Курсор для нескольких запросов в одной транзакции.
+        
+        При успешном завершении блока изменения фиксируются, при любой
+        ошибке откатываются целиком; ошибка передается вызывающему коду.
+        """
+        if not self.test_connection():
+            raise OperationalError("Нет подключения к БД")
+        
+        cursor = self.connection.cursor()
+        try:
+            yield cursor
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def iter_batches(self, query, params=None, batch_size=10000):
+        """Выполнить SELECT на серверном курсоре и выдавать (description, строки) пакетами.
+        
+        Строки передаются с сервера по batch_size, поэтому память не зависит
+        от объема результата. Первый пакет выдается и для пустого результата,
+        чтобы были известны колонки. Ошибки передаются вызывающему коду.
+        """
+        if not self.test_connection():
+            raise OperationalError("Нет подключения к БД")
+        
+        cursor = self.connection.cursor(name=f"stream_{uuid.uuid4().hex}")
+        try:
+            cursor.execute(query, params)
+            first = True
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if rows or first:
+                    yield cursor.description, rows
+                first = False
+                if len(rows) < batch_size:
+                    break
+        finally:
+            try:
+                cursor.close()
+            except Error:
+                # После ошибки в транзакции курсор уже закрыт сервером
+                pass
+            # Серверный курсор живет в транзакции; завершаем ее после чтения
+            self.connection.rollback()
+    
+    def get_server_info(self):
+        """Количество баз данных и список таблиц одним запросом (без проверки SELECT 1)"""
+        query = """
+            SELECT (SELECT count(*) FROM pg_database WHERE datistemplate = false),
+                   ARRAY(SELECT table_name::text FROM information_schema.tables
+                         WHERE table_schema = 'public' ORDER BY table_name)
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query)
+            database_count, tables = cursor.fetchone()
+        finally:
+            cursor.close()
+        # Соединение не должно оставаться в открытой транзакции
+        self.connection.rollback()
+        return {'databases': database_count, 'tables': list(tables or [])}
+    
     def get_databases(self):
         """Получить список баз данных на сервере"""
         try:
@@ -2,19 +2,34 @@
 GUI для настройки подключения к БД
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 import config
 from .db_connection import DatabaseConnection
 
 class DatabaseConnectionDialog:
-    """Диалоговое окно для настройки подключения к БД"""
+    """Диалоговое окно для настройки подключения к БД.
+    
+    Проверка подключения выполняется в фоновом потоке с таймаутом
+    config.DB_CONNECT_TIMEOUT и может быть отменена. Успешно проверенное
+    подключение сохраняется в tested_connection и используется для работы.
+    """
+    
+    POLL_INTERVAL = 50  # мс
     
     def __init__(self, parent, db_config=None, callback=None):
         self.parent = parent
         self.db_config = db_config or config.DEFAULT_DB_CONFIG
         self.callback = callback  # Функция обратного вызова после успешного подключения
         self.connection_result = None
+        self.tested_connection = None
+        self._results = queue.Queue()
+        self._attempt = 0
+        self._testing = False
+        self._running = 0  # потоки проверки, результат которых еще не получен
+        self._on_success = None
         
         self.setup_ui()
     
@@ -84,16 +99,19 @@ class DatabaseConnectionDialog:
         button_frame.grid(row=row, column=0, columnspan=2, pady=20, sticky='ew')
         
         # Кнопка тестирования
-        ttk.Button(button_frame, text="Тестировать подключение", 
-                  command=self.test_connection).pack(side='left', padx=5)
+        self.test_button = ttk.Button(button_frame, text="Тестировать подключение", 
+                                      command=self.test_connection)
+        self.test_button.pack(side='left', padx=5)
         
         # Кнопка подключения
-        ttk.Button(button_frame, text="Подключиться", 
-                  command=self.connect, style='Accent.TButton').pack(side='left', padx=5)
+        self.connect_button = ttk.Button(button_frame, text="Подключиться", 
+                                         command=self.connect, style='Accent.TButton')
+        self.connect_button.pack(side='left', padx=5)
         
-        # Кнопка отмены
-        ttk.Button(button_frame, text="Отмена", 
-                  command=self.dialog.destroy).pack(side='left', padx=5)
+        # Кнопка отмены: прерывает проверку или закрывает окно
+        self.cancel_button = ttk.Button(button_frame, text="Отмена", command=self.cancel)
+        self.cancel_button.pack(side='left', padx=5)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
         
         # Метка статуса
         self.status_label = ttk.Label(
@@ -125,50 +143,135 @@ class DatabaseConnectionDialog:
             return error_msg[:max_length] + "..."
         return error_msg
     
-    def test_connection(self):
-        """Тестирование подключения с текущими параметрами"""
+    def test_connection(self, on_success=None):
+        """Тестирование подключения с текущими параметрами (в фоновом потоке)"""
+        if self._testing:
+            return
         config_dict = self.get_current_config()
+        self.release_tested_connection()
         
+        self._attempt += 1
+        self._testing = True
+        self._on_success = on_success
+        self.set_testing_state(True)
+        self.show_status(f"Подключение к {config_dict['host']}:{config_dict['port']}...", "gray")
+        
+        thread = threading.Thread(target=self._run_test,
+                                  args=(self._attempt, config_dict), daemon=True)
+        thread.start()
+        self._running += 1
+        if self._running == 1:
+            self.parent.after(self.POLL_INTERVAL, self._poll_test)
+    
+    def _run_test(self, attempt, config_dict):
+        """Подключение и один информационный запрос вне потока Tk"""
+        db = DatabaseConnection(config_dict)
         try:
-            db = DatabaseConnection(config_dict)
-            if db.connect():
-                # Показать информацию о БД
-                databases = db.get_databases()
-                tables = db.get_tables()
-                
-                info_text = f"✓ Подключение успешно установлено\n"
-                info_text += f"Базы данных: {len(databases)}, Таблицы: {len(tables)}"
-                if tables:
-                    table_list = ", ".join(tables[:3])
-                    if len(tables) > 3:
-                        info_text += f" ({table_list}...)"
-                    else:
-                        info_text += f" ({table_list})"
-                
-                self.show_status(info_text, "green")
-                db.disconnect()
-                return True
-            else:
-                self.show_status("✗ Не удалось подключиться к БД", "red")
-                return False
+            if not db.connect():
+                self._results.put((attempt, None, None, None))
+                return
+            info = db.get_server_info()
+            self._results.put((attempt, db, info, None))
         except Exception as e:
-            error_msg = str(e)
-            truncated_error = self.truncate_error_message(error_msg)
+            db.disconnect()
+            self._results.put((attempt, None, None, e))
+    
+    def _poll_test(self):
+        """Получить результаты проверок в потоке Tk"""
+        while True:
+            try:
+                attempt, db, info, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._running -= 1
+            if attempt != self._attempt:
+                # Результат отмененной проверки или закрытого окна
+                if db:
+                    db.disconnect()
+                continue
+            self.finish_test(db, info, error)
+        
+        # Опрос продолжается, пока все потоки не вернули результат,
+        # чтобы закрыть подключения, установленные после отмены
+        if self._running > 0:
+            self.parent.after(self.POLL_INTERVAL, self._poll_test)
+    
+    def finish_test(self, db, info, error):
+        """Показать результат проверки подключения"""
+        self._testing = False
+        self.set_testing_state(False)
+        if error is not None:
+            truncated_error = self.truncate_error_message(str(error))
             self.show_status(f"✗ Ошибка подключения: {truncated_error}", "red")
-            return False
+        elif db is None:
+            self.show_status("✗ Не удалось подключиться к БД", "red")
+        else:
+            self.tested_connection = db
+            self.show_status(self.format_server_info(info), "green")
+            if self._on_success:
+                self._on_success()
+    
+    def format_server_info(self, info):
+        """Текст статуса с информацией о БД"""
+        tables = info['tables']
+        info_text = f"✓ Подключение успешно установлено\n"
+        info_text += f"Базы данных: {info['databases']}, Таблицы: {len(tables)}"
+        if tables:
+            table_list = ", ".join(tables[:3])
+            if len(tables) > 3:
+                info_text += f" ({table_list}...)"
+            else:
+                info_text += f" ({table_list})"
+        return info_text
+    
+    def set_testing_state(self, testing):
+        """Заблокировать кнопки на время проверки"""
+        state = 'disabled' if testing else 'normal'
+        self.test_button.config(state=state)
+        self.connect_button.config(state=state)
+        self.cancel_button.config(text="Прервать проверку" if testing else "Отмена")
+    
+    def cancel(self):
+        """Прервать проверку подключения или закрыть окно"""
+        if self._testing:
+            # Подключение, установленное после отмены, будет закрыто при получении
+            self._attempt += 1
+            self._testing = False
+            self.set_testing_state(False)
+            self.show_status("Проверка подключения прервана", "gray")
+        else:
+            self.close()
+    
+    def close(self):
+        """Закрыть окно без подключения"""
+        self._attempt += 1
+        self._testing = False
+        self.release_tested_connection()
+        self.dialog.destroy()
+    
+    def release_tested_connection(self):
+        """Закрыть проверенное, но не использованное подключение"""
+        if self.tested_connection:
+            self.tested_connection.disconnect()
+            self.tested_connection = None
     
     def connect(self):
         """Подключение к БД с текущими параметрами"""
-        if self.test_connection():
-            config_dict = self.get_current_config()
-            self.connection_result = config_dict
-            
-            if self.callback:
-                self.callback(config_dict)
-            
-            self.dialog.destroy()
-            return True
-        return False
+        tested = self.tested_connection
+        if tested and tested.is_connected and tested.config == self.get_current_config():
+            self.finish_connect()
+        else:
+            self.test_connection(on_success=self.finish_connect)
+    
+    def finish_connect(self):
+        """Передать проверенное подключение и закрыть окно"""
+        config_dict = self.get_current_config()
+        self.connection_result = config_dict
+        
+        if self.callback:
+            self.callback(config_dict)
+        
+        self.dialog.destroy()
     
     def get_current_config(self):
         """Получить текущую конфигурацию из полей ввода"""
@@ -191,10 +294,20 @@ class DatabaseConnectionManager:
         self.parent = parent
         self.db_connection = None
         self.db_config = None
+        self.tested_connection = None
     
     def show_connection_dialog(self, callback=None):
         """Показать диалоговое окно подключения"""
-        dialog = DatabaseConnectionDialog(self.parent, self.db_config, callback)
+        dialog = None
+        
+        def on_connected(config_dict):
+            # Проверенное подключение передается до обратного вызова,
+            # чтобы create_connection использовал его без переподключения
+            self.tested_connection = dialog.tested_connection
+            if callback:
+                callback(config_dict)
+        
+        dialog = DatabaseConnectionDialog(self.parent, self.db_config, on_connected)
         self.parent.wait_window(dialog.dialog)
         
         if dialog.connection_result:
@@ -202,6 +315,15 @@ class DatabaseConnectionManager:
             return True
         return False
     
+    def take_tested_connection(self, config_dict):
+        """Забрать проверенное в диалоге подключение с теми же параметрами"""
+        connection, self.tested_connection = self.tested_connection, None
+        if connection and connection.is_connected and connection.config == config_dict:
+            return connection
+        if connection:
+            connection.disconnect()
+        return None
+    
     def create_connection(self, config_dict=None):
         """Создать подключение к БД"""
         if config_dict:
@@ -211,6 +333,11 @@ class DatabaseConnectionManager:
             if not self.show_connection_dialog():
                 return None
         
+        tested = self.take_tested_connection(self.db_config)
+        if tested:
+            self.db_connection = tested
+            return tested
+        
         self.db_connection = DatabaseConnection(self.db_config)
         if self.db_connection.connect():
             return self.db_connection
@@ -2,8 +2,12 @@
 Менеджер БД для работы с данными
 """
 
+import os
+from functools import partial
+
+import config
 from database.db_connection import DatabaseConnection
-from models import Employee, Task, Project
+from models import Employee, EmployeeRef, Task, Project, LazyTaskList, TaskTable
 
 class DatabaseManager:
     """Менеджер для операций с БД, связанных с данными"""
@@ -22,6 +26,53 @@ class DatabaseManager:
             employees.append(emp)
         return employees
     
+    def get_employee_rows(self):
+        """Получить сотрудников без расчета часов (для массовой обработки)"""
+        query = "SELECT id, name, position, salary FROM employees ORDER BY id"
+        return self.db.execute_query(query, fetch=True) or []
+    
+    def lookup_employees(self, prefix="", limit=50):
+        """Найти сотрудников по началу имени или id: список (id, "id: имя")"""
+        rows = self._lookup("employees", "name", prefix, limit)
+        return [(row[0], f"{row[0]}: {row[1]}") for row in rows]
+    
+    def _lookup(self, table, column, prefix, limit):
+        """Поиск по префиксу с использованием индекса lower(column) text_pattern_ops.
+        
+        Пустой префикс не ищется: LIKE '%' подходит всем строкам, и индекс не помогает.
+        """
+        prefix = (prefix or "").strip()
+        if not prefix:
+            return []
+        pattern = (prefix.lower().replace('\\', '\\\\')
+                   .replace('%', '\\%').replace('_', '\\_')) + '%'
+        query = f"""
+            SELECT id, {column} FROM {table}
+            WHERE lower({column}) LIKE %s
+            ORDER BY lower({column}), id
+            LIMIT %s
+        """
+        params = (pattern, limit)
+        # Только цифры ASCII: isdigit() пропускает '²' и '٣', на которых падает int()
+        if prefix.isascii() and prefix.isdecimal() and len(prefix) < 10:
+            # Совпадение по id первым, всего не больше limit строк
+            query = f"""
+                SELECT id, {column} FROM (
+                    SELECT id, {column}, 0 AS rank FROM {table} WHERE id = %s
+                    UNION ALL
+                    (SELECT id, {column}, 1 AS rank FROM {table}
+                     WHERE lower({column}) LIKE %s AND id <> %s
+                     ORDER BY lower({column}), id
+                     LIMIT %s)
+                ) AS found
+                ORDER BY rank, lower({column}), id
+                LIMIT %s
+            """
+            entity_id = int(prefix)
+            params = (entity_id, pattern, entity_id, limit, limit)
+        rows = self.db.execute_query(query, params, fetch=True) or []
+        return [tuple(row) for row in rows]
+    
     def get_employee_by_id(self, emp_id):
         query = "SELECT id, name, position, salary FROM employees WHERE id = %s"
         result = self.db.execute_query(query, (emp_id,), fetch=True)
@@ -32,6 +83,14 @@ class DatabaseManager:
             return emp
         return None
     
+    def _employee_ref(self, refs, emp_id, name=None):
+        """Общая ссылка на сотрудника в пределах одной выборки"""
+        ref = refs.get(emp_id)
+        if ref is None:
+            ref = EmployeeRef(emp_id, name, self.get_employee_by_id)
+            refs[emp_id] = ref
+        return ref
+    
     def get_employee_hours_worked(self, emp_id):
         query = """
             SELECT COALESCE(SUM(hours_required), 0) 
@@ -73,27 +132,81 @@ class DatabaseManager:
         self.db.execute_query(query, (hours, emp_id))
     
     # Методы для проектов
+    PROJECT_SUMMARY_QUERY = """
+            SELECT p.id, p.title, COUNT(t.id),
+                   COUNT(t.id) FILTER (WHERE t.status = 'Завершено'),
+                   COALESCE(SUM(t.hours_required), 0),
+                   COALESCE(SUM(t.hours_required) FILTER (WHERE t.status = 'Завершено'), 0)
+            FROM projects p
+            LEFT JOIN tasks t ON t.project_id = p.id
+    """
+    
     def get_all_projects(self):
-        query = "SELECT id, title FROM projects ORDER BY id"
+        """Получить проекты со сводкой по задачам; сами задачи загружаются лениво"""
+        query = self.PROJECT_SUMMARY_QUERY + """
+            GROUP BY p.id, p.title
+            ORDER BY p.id
+        """
         rows = self.db.execute_query(query, fetch=True)
-        projects = []
-        for row in rows:
-            project = Project(row[1], project_id=row[0])
-            tasks_query = """
-                SELECT id, title, description, status, hours_required, employee_id
-                FROM tasks WHERE project_id = %s
-            """
-            task_rows = self.db.execute_query(tasks_query, (row[0],), fetch=True)
-            for task_row in task_rows:
-                task = Task(
-                    task_row[1], task_row[2], task_row[3],
-                    hours_required=task_row[4], task_id=task_row[0]
-                )
-                if task_row[5]:
-                    task.assigned_employee = Employee("", "", 0, 0, task_row[5])
-                project.add_task(task)
-            projects.append(project)
-        return projects
+        refs = {}
+        return [self._project_from_row(row, refs) for row in rows or []]
+    
+    def get_project_by_id(self, project_id, preload_tasks=False):
+        """Получить проект по ID; preload_tasks - сразу загрузить его задачи"""
+        if preload_tasks:
+            query = "SELECT id, title FROM projects WHERE id = %s"
+            result = self.db.execute_query(query, (project_id,), fetch=True)
+            if not result:
+                return None
+            tasks = self.get_project_tasks(project_id)
+            return Project(result[0][1], tasks, project_id=result[0][0])
+        
+        query = self.PROJECT_SUMMARY_QUERY + """
+            WHERE p.id = %s
+            GROUP BY p.id, p.title
+        """
+        result = self.db.execute_query(query, (project_id,), fetch=True)
+        return self._project_from_row(result[0], {}) if result else None
+    
+    def _project_from_row(self, row, refs):
+        """Проект из строки сводного запроса с ленивым списком задач"""
+        summary = {
+            'total_tasks': row[2],
+            'completed_tasks': row[3],
+            'total_hours': float(row[4]),
+            'completed_hours': float(row[5])
+        }
+        tasks = LazyTaskList(partial(self.get_project_tasks, row[0], refs), summary)
+        return Project(row[1], tasks, project_id=row[0])
+    
+    def get_project_tasks(self, project_id, refs=None):
+        """Получить задачи проекта"""
+        refs = {} if refs is None else refs
+        tasks_query = """
+            SELECT id, title, description, status, hours_required, employee_id
+            FROM tasks WHERE project_id = %s
+        """
+        task_rows = self.db.execute_query(tasks_query, (project_id,), fetch=True)
+        tasks = []
+        for task_row in task_rows or []:
+            task = Task(
+                task_row[1], task_row[2], task_row[3],
+                hours_required=task_row[4], project_id=project_id, task_id=task_row[0]
+            )
+            if task_row[5]:
+                task.assigned_employee = self._employee_ref(refs, task_row[5])
+            tasks.append(task)
+        return tasks
+    
+    def lookup_projects(self, prefix="", limit=50):
+        """Найти проекты по началу названия или id: список (id, "id: название")"""
+        rows = self._lookup("projects", "title", prefix, limit)
+        return [(row[0], f"{row[0]}: {row[1]}") for row in rows]
+    
+    def get_project_rows(self):
+        """Получить проекты без задач (для массовой обработки)"""
+        query = "SELECT id, title FROM projects ORDER BY id"
+        return self.db.execute_query(query, fetch=True) or []
     
     def add_project(self, project):
         query = "INSERT INTO projects (title) VALUES (%s) RETURNING id"
@@ -123,17 +236,48 @@ class DatabaseManager:
             ORDER BY t.id
         """
         rows = self.db.execute_query(query, fetch=True)
-        tasks = []
-        for row in rows:
-            task = Task(
-                row[1], row[2], row[3],
-                hours_required=row[4], task_id=row[0]
-            )
-            if row[5]:
-                task.assigned_employee = Employee(row[7] or "", "", 0, 0, row[5])
-            task.project_id = row[6]
-            tasks.append(task)
-        return tasks
+        refs = {}
+        return [self._task_from_row(row, refs) for row in rows]
+    
+    def get_task_by_id(self, task_id):
+        """Получить задачу по ID вместе с именем сотрудника и названием проекта"""
+        query = """
+            SELECT t.id, t.title, t.description, t.status, t.hours_required, 
+                   t.employee_id, t.project_id, e.name as employee_name,
+                   p.title as project_title
+            FROM tasks t
+            LEFT JOIN employees e ON t.employee_id = e.id
+            LEFT JOIN projects p ON t.project_id = p.id
+            WHERE t.id = %s
+        """
+        result = self.db.execute_query(query, (task_id,), fetch=True)
+        return self._task_from_row(result[0], {}) if result else None
+    
+    def _task_from_row(self, row, refs):
+        """Задача из строки запроса с именем сотрудника в row[7] и названием проекта в row[8]"""
+        task = Task(
+            row[1], row[2], row[3],
+            hours_required=row[4], task_id=row[0]
+        )
+        if row[5]:
+            task.assigned_employee = self._employee_ref(refs, row[5], row[7] or "")
+        task.project_id = row[6]
+        task.project_title = row[8]
+        return task
+    
+    def get_task_table(self):
+        """Получить все задачи в колоночном представлении (для массовой обработки)"""
+        query = """
+            SELECT t.id, t.title, t.description, t.status, t.hours_required, 
+                   t.employee_id, t.project_id, e.name as employee_name,
+                   p.title as project_title
+            FROM tasks t
+            LEFT JOIN employees e ON t.employee_id = e.id
+            LEFT JOIN projects p ON t.project_id = p.id
+            ORDER BY t.id
+        """
+        rows = self.db.execute_query(query, fetch=True)
+        return TaskTable.from_rows(rows)
     
     def add_task(self, task):
         query = """
@@ -217,10 +361,117 @@ class DatabaseManager:
         result = self.db.execute_query(query, (task_id,), fetch=True)
         return result[0][0] if result else "Не назначен"
     
-    def get_project_title(self, project_id):
-        """Получить название проекта по ID"""
-        if not project_id:
-            return "Не назначен"
-        query = "SELECT title FROM projects WHERE id = %s"
-        result = self.db.execute_query(query, (project_id,), fetch=True)
-        return result[0][0] if result else "Неизвестно"
\ No newline at end of file
+    # Экспорт: CSV через COPY, Parquet/Feather - пакетами серверного курсора;
+    # в обоих случаях строки пишутся в файл по мере получения
+    EMPLOYEES_EXPORT_QUERY = """
+            SELECT e.id AS "ID", e.name AS "Имя", e.position AS "Должность",
+                   e.salary::float8 AS "Зарплата",
+                   COALESCE(done.hours, 0)::float8 AS "Отработано часов",
+                   e.salary::float8 / %s * COALESCE(done.hours, 0)::float8 AS "Заработок",
+                   COALESCE(done.tasks, 0) AS "Завершено задач"
+            FROM employees e
+            LEFT JOIN (
+                SELECT employee_id, SUM(hours_required) AS hours, COUNT(*) AS tasks
+                FROM tasks
+                WHERE status = 'Завершено'
+                GROUP BY employee_id
+            ) done ON done.employee_id = e.id
+            ORDER BY e.id
+    """
+    
+    TASKS_EXPORT_QUERY = """
+            SELECT t.id AS "ID", t.title AS "Название", t.description AS "Описание",
+                   t.status AS "Статус", t.hours_required::float8 AS "Требуется часов",
+                   COALESCE(e.name, 'Не назначен') AS "Сотрудник",
+                   COALESCE(p.title, 'Не назначен') AS "Проект"
+            FROM tasks t
+            LEFT JOIN employees e ON t.employee_id = e.id
+            LEFT JOIN projects p ON t.project_id = p.id
+            ORDER BY t.id
+    """
+    
+    PROJECTS_EXPORT_QUERY = """
+            SELECT p.id AS "ID", p.title AS "Название",
+                   COUNT(t.id) AS "Всего задач",
+                   COUNT(t.id) FILTER (WHERE t.status = 'Завершено') AS "Завершено задач",
+                   {progress} AS "Прогресс",
+                   COALESCE(SUM(t.hours_required), 0)::float8 AS "Всего часов",
+                   COALESCE(SUM(t.hours_required) FILTER (WHERE t.status = 'Завершено'), 0)::float8
+                       AS "Выполнено часов"
+            FROM projects p
+            LEFT JOIN tasks t ON t.project_id = p.id
+            GROUP BY p.id, p.title
+            ORDER BY p.id
+    """
+    
+    PROJECT_PROGRESS = """CASE WHEN COUNT(t.id) > 0
+                   THEN COUNT(t.id) FILTER (WHERE t.status = 'Завершено') * 100.0 / COUNT(t.id)
+                   ELSE 0 END"""
+    
+    def export_query(self, entity, typed=False):
+        """Запрос экспорта 'employees', 'tasks' или 'projects': (SQL, параметры).
+        
+        typed=True - прогресс проекта числом (для Parquet/Feather), иначе
+        строкой вида "12.5%", как в CSV.
+        """
+        if entity == 'employees':
+            return self.EMPLOYEES_EXPORT_QUERY, (config.PAYROLL_NORM_HOURS,)
+        if entity == 'tasks':
+            return self.TASKS_EXPORT_QUERY, None
+        if entity == 'projects':
+            if typed:
+                progress = f"round({self.PROJECT_PROGRESS}, 1)::float8"
+            else:
+                progress = f"to_char({self.PROJECT_PROGRESS}, 'FM990.0') || '%'"
+            return self.PROJECTS_EXPORT_QUERY.format(progress=progress), None
+        raise ValueError(f"Неизвестный тип данных для экспорта: {entity}")
+    
+    def iter_export_rows(self, entity, batch_size=None):
+        """Строки экспорта с типами колонок пакетами (см. DatabaseConnection.iter_batches)"""
+        query, params = self.export_query(entity, typed=True)
+        return self.db.iter_batches(query, params, batch_size or config.EXPORT_BATCH_ROWS)
+    
+    def export_employees_csv(self, path, progress=None):
+        """Экспорт сводки по сотрудникам в CSV одним запросом"""
+        return self._export_csv(*self.export_query('employees'), path, progress)
+    
+    def export_tasks_csv(self, path, progress=None):
+        """Экспорт задач с именами сотрудников и проектов в CSV одним запросом"""
+        return self._export_csv(*self.export_query('tasks'), path, progress)
+    
+    def export_projects_csv(self, path, progress=None):
+        """Экспорт сводки по проектам в CSV одним запросом"""
+        return self._export_csv(*self.export_query('projects'), path, progress)
+    
+    def _export_csv(self, query, params, path, progress=None):
+        """COPY (query) TO STDOUT в файл path; при ошибке файл удаляется.
+        
+        progress(rows) вызывается по мере записи с числом выгруженных строк.
+        """
+        copy = (f"COPY ({query}) TO STDOUT "
+                f"WITH (FORMAT csv, HEADER true, ENCODING '{config.CSV_ENCODING}')")
+        with open(path, 'wb') as f:
+            target = f if progress is None else CopyProgress(f, progress)
+            exported = self.db.copy_expert(copy, target, params)
+        if not exported:
+            os.remove(path)
+        return exported
+
+
+class CopyProgress:
+    """Файл для COPY TO STDOUT, сообщающий число записанных строк CSV.
+    
+    Строки считаются по переводам строк без заголовка; перевод строки
+    внутри значения в кавычках тоже учитывается, поэтому для многострочных
+    описаний число приблизительное.
+    """
+    
+    def __init__(self, f, progress):
+        self.f = f
+        self.progress = progress
+        self.lines = 0
+    
+    def write(self, data):
+        self.f.write(data)
+        self.lines += data.count(b'\n')
+        self.progress(max(self.lines - 1, 0))
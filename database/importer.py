@@ -0,0 +1,408 @@
+"""
+Массовый импорт сотрудников и задач из CSV
+"""
+
+import os
+
+import config
+from database.schema import ensure_schema
+
+TASK_STATUSES = ("В процессе", "Завершено")
+DEFAULT_TASK_STATUS = "В процессе"
+
+# Значение колонки сотрудника/проекта, означающее отсутствие назначения (как в экспорте)
+UNASSIGNED = "не назначен"
+
+# Имя, которое носят несколько сотрудников (проектов): ссылку по нему разрешить нельзя
+AMBIGUOUS = -1
+
+# Заголовки CSV для каждого поля (без учета регистра): имена колонок БД и
+# заголовки экспорта приложения, поэтому экспортированный файл импортируется обратно
+COLUMN_ALIASES = {
+    'employees': {
+        'id': ('id',),
+        'name': ('name', 'имя'),
+        'position': ('position', 'должность'),
+        'salary': ('salary', 'зарплата'),
+    },
+    'tasks': {
+        'id': ('id',),
+        'title': ('title', 'название'),
+        'description': ('description', 'описание'),
+        'status': ('status', 'статус'),
+        'hours_required': ('hours_required', 'hours', 'требуется часов'),
+        'employee': ('employee_id', 'employee', 'сотрудник'),
+        'project': ('project_id', 'project', 'проект'),
+    },
+}
+
+REQUIRED_FIELDS = {'employees': ('name', 'salary'), 'tasks': ('title',)}
+
+# Колонки основной таблицы, заполняемые импортом (кроме id)
+MERGE_FIELDS = {
+    'employees': ('name', 'position', 'salary'),
+    'tasks': ('title', 'description', 'status', 'hours_required', 'employee_id', 'project_id'),
+}
+
+# Текстовые колонки: пустое значение в CSV - пустая строка, а не NULL
+TEXT_FIELDS = {
+    'employees': ('name', 'position'),
+    'tasks': ('title', 'description', 'status'),
+}
+
+def staging_table(entity):
+    """Промежуточная таблица импорта (см. database/schema.py)"""
+    return f"import_{entity}_staging"
+
+def map_columns(header, entity):
+    """Колонки CSV для полей импорта: {поле: заголовок}.
+
+    Если обязательного поля нет в заголовке, выбрасывается ValueError.
+    """
+    if entity not in COLUMN_ALIASES:
+        raise ValueError(f"Неизвестный тип данных для импорта: {entity}")
+    names = {}
+    for column in header:
+        names.setdefault(str(column).lstrip('\ufeff').strip().lower(), column)
+
+    columns = {}
+    for field, aliases in COLUMN_ALIASES[entity].items():
+        for alias in aliases:
+            if alias in names:
+                columns[field] = names[alias]
+                break
+
+    missing = [field for field in REQUIRED_FIELDS[entity] if field not in columns]
+    if missing:
+        raise ValueError(f"В файле нет обязательных колонок: {', '.join(missing)}")
+    return columns
+
+class References:
+    """Сотрудники и проекты БД для проверки ссылок по id или имени"""
+
+    def __init__(self, employees=(), projects=()):
+        self.employees = self._index(employees)
+        self.projects = self._index(projects)
+
+    @staticmethod
+    def _index(rows):
+        """Множество id и словарь {имя в нижнем регистре: id или AMBIGUOUS}"""
+        ids = set()
+        names = {}
+        for row_id, name in rows:
+            ids.add(row_id)
+            key = (name or "").strip().lower()
+            names[key] = AMBIGUOUS if key in names else row_id
+        return ids, names
+
+    @classmethod
+    def load(cls, db_connection):
+        employees = db_connection.execute_query("SELECT id, name FROM employees", fetch=True)
+        projects = db_connection.execute_query("SELECT id, title FROM projects", fetch=True)
+        return cls(employees or [], projects or [])
+
+def _text(chunk, columns, field):
+    """Значения поля без пробелов по краям; пустые строки, если колонки нет"""
+    import pandas as pd
+    column = columns.get(field)
+    if column is None:
+        return pd.Series("", index=chunk.index, dtype=str)
+    return chunk[column].fillna("").str.strip()
+
+def _number(text):
+    """Числа из строк (допускается десятичная запятая); некорректные - NaN"""
+    import numpy as np
+    import pandas as pd
+    number = pd.to_numeric(text.str.replace(',', '.', regex=False), errors='coerce')
+    number = number.astype('float64')
+    return number.where(np.isfinite(number))
+
+def _ids(text):
+    """Целые положительные id из строк; пустые и некорректные - NA"""
+    import pandas as pd
+    digits = text.where(text.str.fullmatch(r'\d{1,9}', na=False))
+    ids = pd.to_numeric(digits, errors='coerce').astype('Int64')
+    return ids.mask(ids == 0)
+
+def _resolve(text, index):
+    """Ссылки по id или имени: (id, маска ненайденных, маска неоднозначных)"""
+    ids, names = index
+    key = text.str.lower()
+    empty = (key == "") | (key == UNASSIGNED)
+    by_id = _ids(text)
+    by_id = by_id.where(by_id.isin(list(ids)))
+    resolved = by_id.fillna(key.map(names).astype('Int64'))
+    ambiguous = (resolved == AMBIGUOUS).fillna(False)
+    missing = ~empty & resolved.isna()
+    return resolved.mask(empty | ambiguous), missing, ambiguous
+
+def _add_error(errors, mask, message):
+    """Отметить ошибкой строки mask, у которых еще нет ошибки"""
+    return errors.mask(mask & errors.isna(), message)
+
+def _split(chunk, frame, errors):
+    """Проверенные строки и отклоненные строки исходного файла с причиной"""
+    bad = errors.notna()
+    rejected = chunk[bad].copy()
+    rejected.insert(0, 'error', errors[bad])
+    rejected.insert(0, 'record', frame['record'][bad])
+    return frame[~bad], rejected
+
+def _new_errors(chunk):
+    """Пустые ошибки и номера записей файла (первая запись после заголовка - 1).
+
+    Номер записи не равен номеру строки, если значения в кавычках содержат
+    переводы строк.
+    """
+    import pandas as pd
+    errors = pd.Series(None, index=chunk.index, dtype=object)
+    return errors, chunk.index + 1
+
+def prepare_employees(chunk, columns, references=None):
+    """Проверить и привести типы части CSV сотрудников.
+
+    Возвращает (строки для промежуточной таблицы, отклоненные строки).
+    Проверки выполняются над колонками целиком.
+    """
+    import pandas as pd
+    errors, records = _new_errors(chunk)
+
+    id_text = _text(chunk, columns, 'id')
+    ids = _ids(id_text)
+    errors = _add_error(errors, (id_text != "") & ids.isna(), "некорректный id")
+
+    name = _text(chunk, columns, 'name')
+    errors = _add_error(errors, name == "", "не указано имя")
+
+    salary = _number(_text(chunk, columns, 'salary'))
+    errors = _add_error(errors, (salary.isna() | (salary < 0)).fillna(True),
+                        "некорректная зарплата")
+
+    frame = pd.DataFrame({
+        'record': records,
+        'id': ids,
+        'name': name,
+        'position': _text(chunk, columns, 'position'),
+        'salary': salary,
+    }, index=chunk.index)
+    return _split(chunk, frame, errors)
+
+def prepare_tasks(chunk, columns, references):
+    """Проверить часть CSV задач и разрешить ссылки на сотрудников и проекты.
+
+    Сотрудник и проект задаются id или именем (названием) без учета
+    регистра; пустое значение и "Не назначен" - без назначения. Пустой
+    статус - "В процессе", пустые часы - 0. Возвращает (строки для
+    промежуточной таблицы, отклоненные строки).
+    """
+    import pandas as pd
+    errors, records = _new_errors(chunk)
+
+    id_text = _text(chunk, columns, 'id')
+    ids = _ids(id_text)
+    errors = _add_error(errors, (id_text != "") & ids.isna(), "некорректный id")
+
+    title = _text(chunk, columns, 'title')
+    errors = _add_error(errors, title == "", "не указано название")
+
+    status_text = _text(chunk, columns, 'status')
+    status = status_text.str.lower().map({status.lower(): status for status in TASK_STATUSES})
+    status = status.mask(status_text == "", DEFAULT_TASK_STATUS)
+    errors = _add_error(errors, status.isna(), "неизвестный статус")
+
+    hours_text = _text(chunk, columns, 'hours_required')
+    hours = _number(hours_text).mask(hours_text == "", 0.0)
+    errors = _add_error(errors, (hours.isna() | (hours < 0)).fillna(True),
+                        "некорректное количество часов")
+
+    employee_id, missing, ambiguous = _resolve(_text(chunk, columns, 'employee'),
+                                               references.employees)
+    errors = _add_error(errors, missing, "сотрудник не найден")
+    errors = _add_error(errors, ambiguous, "имя сотрудника неоднозначно, укажите id")
+
+    project_id, missing, ambiguous = _resolve(_text(chunk, columns, 'project'),
+                                              references.projects)
+    errors = _add_error(errors, missing, "проект не найден")
+    errors = _add_error(errors, ambiguous, "название проекта неоднозначно, укажите id")
+
+    frame = pd.DataFrame({
+        'record': records,
+        'id': ids,
+        'title': title,
+        'description': _text(chunk, columns, 'description'),
+        'status': status,
+        'hours_required': hours,
+        'employee_id': employee_id,
+        'project_id': project_id,
+    }, index=chunk.index)
+    return _split(chunk, frame, errors)
+
+PREPARERS = {'employees': prepare_employees, 'tasks': prepare_tasks}
+
+def copy_query(entity):
+    """COPY в промежуточную таблицу; пустые текстовые значения остаются строками"""
+    columns = ('record', 'id') + MERGE_FIELDS[entity]
+    return (f"COPY {staging_table(entity)} ({', '.join(columns)}) FROM STDIN "
+            f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(TEXT_FIELDS[entity])}))")
+
+def upsert_query(entity):
+    """Строки с id: вставка или обновление; при повторах id в файле побеждает последняя.
+
+    Возвращает (вставлено, обновлено): xmax = 0 только у вставленных строк.
+    """
+    fields = MERGE_FIELDS[entity]
+    updates = ", ".join(f"{field} = EXCLUDED.{field}" for field in fields)
+    return f"""
+        WITH merged AS (
+            INSERT INTO {entity} (id, {', '.join(fields)})
+            SELECT DISTINCT ON (id) id, {', '.join(fields)}
+            FROM {staging_table(entity)}
+            WHERE id IS NOT NULL
+            ORDER BY id, record DESC
+            ON CONFLICT (id) DO UPDATE SET {updates}
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+        FROM merged
+    """
+
+def sync_sequence_query(entity):
+    """Сдвинуть последовательность id за импортированные явные id"""
+    sequence = f"pg_get_serial_sequence('{entity}', 'id')"
+    return f"SELECT setval({sequence}, GREATEST(max(id), nextval({sequence}))) FROM {entity}"
+
+def insert_query(entity):
+    """Строки без id: вставка с новыми id в порядке файла"""
+    fields = ', '.join(MERGE_FIELDS[entity])
+    return f"""
+        WITH merged AS (
+            INSERT INTO {entity} ({fields})
+            SELECT {fields} FROM {staging_table(entity)}
+            WHERE id IS NULL
+            ORDER BY record
+            RETURNING 1
+        )
+        SELECT count(*) FROM merged
+    """
+
+# Прежние исполнители задач, которые импорт перезапишет по id
+PREVIOUS_ASSIGNEES_QUERY = """
+    SELECT DISTINCT t.employee_id
+    FROM tasks t
+    JOIN import_tasks_staging s ON s.id = t.id
+    WHERE t.employee_id IS NOT NULL
+"""
+
+# Отработанные часы сотрудников из промежуточной таблицы и прежних исполнителей
+# (как в DatabaseManager.update_employee_hours, одним запросом)
+UPDATE_HOURS_QUERY = """
+    UPDATE employees e
+    SET hours_worked = COALESCE((
+        SELECT SUM(t.hours_required) FROM tasks t
+        WHERE t.employee_id = e.id AND t.status = 'Завершено'
+    ), 0)
+    WHERE e.id IN (SELECT employee_id FROM import_tasks_staging WHERE employee_id IS NOT NULL)
+       OR e.id = ANY(%s)
+"""
+
+def rejected_csv_path(original_path):
+    """Файл отклоненных строк рядом с исходным: <имя>_rejected.csv"""
+    base, _ = os.path.splitext(original_path)
+    return f"{base}_rejected.csv"
+
+class CsvImporter:
+    """Импорт сотрудников или задач из CSV через промежуточную таблицу.
+
+    Файл читается частями по chunksize строк; каждая часть проверяется
+    векторно и передается в промежуточную таблицу через COPY. Затем строки
+    переносятся в основную таблицу двумя запросами (с id - upsert, без id -
+    вставка). После импорта задач пересчитываются отработанные часы
+    затронутых сотрудников. Все шаги выполняются в одной транзакции: при
+    ошибке БД данные не меняются.
+    """
+
+    def __init__(self, db_connection, chunksize=None):
+        self.db = db_connection
+        self.chunksize = chunksize or config.IMPORT_CHUNK_ROWS
+
+    def import_file(self, entity, path, reject_path=None):
+        """Импортировать 'employees' или 'tasks' из path.
+
+        Отклоненные строки с номером записи и причиной записываются в
+        reject_path (по умолчанию <имя>_rejected.csv); файл создается,
+        только если такие строки есть.
+        """
+        import pandas as pd
+        read_options = {'dtype': str, 'keep_default_na': False,
+                        'encoding': config.CSV_ENCODING}
+        header = pd.read_csv(path, nrows=0, **read_options).columns
+        columns = map_columns(header, entity)
+        prepare = PREPARERS[entity]
+        reject_path = reject_path or rejected_csv_path(path)
+        if os.path.exists(reject_path):
+            os.remove(reject_path)
+
+        ensure_schema(self.db)
+        references = References.load(self.db) if entity == 'tasks' else None
+        result = {'entity': entity, 'path': path, 'total_rows': 0, 'imported': 0,
+                  'inserted': 0, 'updated': 0, 'rejected': 0, 'reject_path': None}
+        has_ids = False
+        reject_file = None
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute(f"TRUNCATE {staging_table(entity)}")
+                for chunk in pd.read_csv(path, chunksize=self.chunksize, **read_options):
+                    valid, rejected = prepare(chunk, columns, references)
+                    result['total_rows'] += len(chunk)
+                    result['imported'] += len(valid)
+                    has_ids = has_ids or bool(valid['id'].notna().any())
+                    if len(valid):
+                        self._copy(cursor, entity, valid)
+                    if len(rejected):
+                        if reject_file is None:
+                            reject_file = open(reject_path, 'w', encoding=config.CSV_ENCODING,
+                                               newline='')
+                        rejected.to_csv(reject_file, index=False, header=result['rejected'] == 0)
+                        result['rejected'] += len(rejected)
+
+                if entity == 'tasks':
+                    cursor.execute(PREVIOUS_ASSIGNEES_QUERY)
+                    previous = [row[0] for row in cursor.fetchall()]
+                cursor.execute(upsert_query(entity))
+                result['inserted'], result['updated'] = cursor.fetchone()
+                if has_ids:
+                    cursor.execute(sync_sequence_query(entity))
+                cursor.execute(insert_query(entity))
+                result['inserted'] += cursor.fetchone()[0]
+                if entity == 'tasks':
+                    cursor.execute(UPDATE_HOURS_QUERY, (previous,))
+                cursor.execute(f"TRUNCATE {staging_table(entity)}")
+        except BaseException:
+            if reject_file is not None:
+                reject_file.close()
+                os.remove(reject_path)
+            raise
+        if reject_file is not None:
+            reject_file.close()
+            result['reject_path'] = reject_path
+        return result
+
+    def _copy(self, cursor, entity, frame):
+        """Передать проверенные строки в промежуточную таблицу через COPY FROM STDIN"""
+        import io
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(copy_query(entity), buffer)
+
+def format_import_result(result):
+    """Итог импорта строками для вывода"""
+    lines = [
+        f"Файл: {result['path']}",
+        f"Строк в файле: {result['total_rows']}",
+        f"Добавлено: {result['inserted']}, обновлено: {result['updated']}",
+        f"Отклонено: {result['rejected']}",
+    ]
+    if result['reject_path']:
+        lines.append(f"Отклоненные строки: {result['reject_path']}")
+    return lines
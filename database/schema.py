@@ -0,0 +1,81 @@
+"""
+Вспомогательные таблицы и индексы БД
+"""
+
+SCHEMA_STATEMENTS = [
+    """
+        CREATE TABLE IF NOT EXISTS payroll_results (
+            period_key VARCHAR(32) NOT NULL,
+            employee_id INTEGER NOT NULL,
+            hours_worked NUMERIC(10, 2) NOT NULL,
+            salary NUMERIC(12, 2) NOT NULL,
+            norm_hours NUMERIC(10, 2) NOT NULL,
+            pay NUMERIC(12, 2) NOT NULL,
+            computed_at TIMESTAMP NOT NULL DEFAULT now(),
+            PRIMARY KEY (period_key, employee_id)
+        )
+    """,
+    # Дата завершения задачи для расчета зарплаты за период. Заполняется
+    # триггером при любой записи статуса "Завершено" и сбрасывается при смене
+    # статуса. У задач, завершенных до появления колонки, дата неизвестна,
+    # и они не попадают ни в один расчетный период
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP",
+    """
+        CREATE OR REPLACE FUNCTION tasks_set_completed_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM 'Завершено' THEN
+                NEW.completed_at := NULL;
+            ELSIF NEW.completed_at IS NULL THEN
+                NEW.completed_at := now();
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """,
+    """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_completed_at') THEN
+                CREATE TRIGGER tasks_completed_at
+                BEFORE INSERT OR UPDATE OF status ON tasks
+                FOR EACH ROW EXECUTE FUNCTION tasks_set_completed_at();
+            END IF;
+        END
+        $$
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks (completed_at)",
+    # Промежуточные таблицы импорта из CSV: строки загружаются через COPY
+    # и переносятся в основные таблицы одним запросом (см. database/importer.py).
+    # UNLOGGED - без записи в журнал, содержимое нужно только внутри транзакции импорта
+    """
+        CREATE UNLOGGED TABLE IF NOT EXISTS import_employees_staging (
+            record BIGINT NOT NULL,
+            id INTEGER,
+            name TEXT NOT NULL,
+            position TEXT NOT NULL,
+            salary NUMERIC NOT NULL
+        )
+    """,
+    """
+        CREATE UNLOGGED TABLE IF NOT EXISTS import_tasks_staging (
+            record BIGINT NOT NULL,
+            id INTEGER,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            status TEXT NOT NULL,
+            hours_required NUMERIC NOT NULL,
+            employee_id INTEGER,
+            project_id INTEGER
+        )
+    """,
+    # Индексы для поиска по префиксу в выпадающих списках
+    "CREATE INDEX IF NOT EXISTS idx_employees_name_prefix "
+    "ON employees (lower(name) text_pattern_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_projects_title_prefix "
+    "ON projects (lower(title) text_pattern_ops)",
+]
+
+def ensure_schema(db_connection):
+    """Создать недостающие вспомогательные таблицы и индексы"""
+    for statement in SCHEMA_STATEMENTS:
+        db_connection.execute_query(statement)
@@ -5,17 +5,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-import pandas as pd
-import numpy as np
-from utils import extract_emails, clean_csv_data, get_csv_stats, save_cleaned_csv
+import config
+from utils import (extract_emails, unique_emails, extract_emails_from_files, save_emails_csv,
+                   clean_csv_file, clean_csv_directory, format_batch_summary)
+from utils.file_operations import columnar_format, read_columnar_schema
+from gui.worker import BackgroundWorker
 
 class DataTab:
+    EMAIL_DISPLAY_LIMIT = 1000  # Адресов, выводимых в поле результата
+    
     def __init__(self, parent, db_manager, app):
         self.parent = parent
         self.db_manager = db_manager
         self.app = app
         
         self.frame = ttk.Frame(parent)
+        # Отдельный поток для файлов, чтобы долгая очистка не задерживала запросы к БД
+        self.file_worker = BackgroundWorker(self.frame, name="file-worker")
+        self.email_matches = []
         self.setup_ui()
     
     def setup_ui(self):
@@ -37,6 +44,15 @@ class DataTab:
         
         ttk.Button(email_buttons_frame, text="Извлечь email", 
                   command=self.extract_emails).pack(side='left', padx=5)
+        self.email_files_button = ttk.Button(email_buttons_frame, text="Из файлов...",
+                                             command=self.extract_emails_from_files)
+        self.email_files_button.pack(side='left', padx=5)
+        self.email_dir_button = ttk.Button(email_buttons_frame, text="Из каталога...",
+                                           command=self.extract_emails_from_directory)
+        self.email_dir_button.pack(side='left', padx=5)
+        self.email_save_button = ttk.Button(email_buttons_frame, text="Сохранить в CSV...",
+                                            command=self.save_emails, state='disabled')
+        self.email_save_button.pack(side='left', padx=5)
         ttk.Button(email_buttons_frame, text="Очистить", 
                   command=self.clear_email_fields).pack(side='left', padx=5)
         
@@ -52,7 +68,7 @@ class DataTab:
         file_selection_frame = ttk.Frame(csv_frame)
         file_selection_frame.pack(fill='x', padx=5, pady=5)
         
-        ttk.Label(file_selection_frame, text="Путь к CSV файлу:").pack(side='left', padx=5)
+        ttk.Label(file_selection_frame, text="Путь к файлу (CSV, Parquet, Feather):").pack(side='left', padx=5)
         self.csv_path = ttk.Entry(file_selection_frame, width=60)
         self.csv_path.pack(side='left', padx=5, expand=True, fill='x')
         
@@ -63,11 +79,42 @@ class DataTab:
         csv_buttons_frame = ttk.Frame(csv_frame)
         csv_buttons_frame.pack(fill='x', padx=5, pady=5)
         
-        ttk.Button(csv_buttons_frame, text="Загрузить и сохранить CSV", 
-                  command=self.load_and_save_csv).pack(side='left', padx=5)
+        self.clean_button = ttk.Button(csv_buttons_frame, text="Загрузить и сохранить CSV", 
+                                       command=self.load_and_save_csv)
+        self.clean_button.pack(side='left', padx=5)
+        self.batch_button = ttk.Button(csv_buttons_frame, text="Очистить каталог...",
+                                       command=self.clean_directory)
+        self.batch_button.pack(side='left', padx=5)
         ttk.Button(csv_buttons_frame, text="Очистить", 
                   command=self.clear_csv_fields).pack(side='left', padx=5)
         
+        # Количество процессов для очистки больших файлов
+        ttk.Label(csv_buttons_frame, text="Процессов:").pack(side='left', padx=(20, 5))
+        self.workers_var = tk.StringVar(value=str(config.CSV_WORKERS))
+        ttk.Spinbox(csv_buttons_frame, from_=1, to=os.cpu_count() or 1, width=4,
+                    textvariable=self.workers_var).pack(side='left')
+        
+        # Количество файлов, очищаемых одновременно при очистке каталога
+        ttk.Label(csv_buttons_frame, text="Файлов одновременно:").pack(side='left', padx=(20, 5))
+        self.batch_workers_var = tk.StringVar(value=str(config.CSV_BATCH_WORKERS))
+        ttk.Spinbox(csv_buttons_frame, from_=1, to=os.cpu_count() or 1, width=4,
+                    textvariable=self.batch_workers_var).pack(side='left')
+        
+        # Движок чтения: pyarrow разбирает файл в несколько потоков
+        ttk.Label(csv_buttons_frame, text="Движок:").pack(side='left', padx=(20, 5))
+        self.engine_var = tk.StringVar(value=config.CSV_ENGINE)
+        ttk.Combobox(csv_buttons_frame, values=config.CSV_ENGINES, width=8, state='readonly',
+                     textvariable=self.engine_var).pack(side='left')
+        
+        # Колонки Parquet/Feather: с диска читаются только выбранные
+        columns_frame = ttk.Frame(csv_frame)
+        columns_frame.pack(fill='x', padx=5, pady=5)
+        ttk.Label(columns_frame, text="Колонки (Parquet/Feather):").pack(side='left', anchor='n', padx=5)
+        self.columns_list = tk.Listbox(columns_frame, selectmode='multiple', height=4,
+                                       exportselection=False)
+        self.columns_list.pack(side='left', fill='x', expand=True, padx=5)
+        self.columns_path = None
+        
         ttk.Label(csv_frame, text="Результат обработки:").pack(anchor='w', padx=5, pady=(10, 0))
         self.csv_result = tk.Text(csv_frame, height=10, width=80, state='disabled')
         self.csv_result.pack(padx=5, pady=5)
@@ -78,88 +125,238 @@ class DataTab:
         self.email_result.config(state='normal')
         self.email_result.delete('1.0', 'end')
         self.email_result.config(state='disabled')
+        self.email_matches = []
+        self.email_save_button.config(state='disabled')
     
     def browse_csv_file(self):
-        """Выбор CSV файла"""
+        """Выбор CSV, Parquet или Feather файла"""
         filepath = filedialog.askopenfilename(
-            title="Выберите CSV файл",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            title="Выберите файл",
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"),
+                       ("Feather files", "*.feather"), ("All files", "*.*")]
         )
         if filepath:
             self.csv_path.delete(0, 'end')
             self.csv_path.insert(0, filepath)
+            self.load_columns(filepath)
+    
+    def load_columns(self, filepath):
+        """Заполнить список колонок из схемы Parquet/Feather (все выбраны)"""
+        self.columns_list.delete(0, 'end')
+        self.columns_path = None
+        if not columnar_format(filepath):
+            return
+        try:
+            names = read_columnar_schema(filepath).names
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось прочитать схему файла: {e}")
+            return
+        for name in names:
+            self.columns_list.insert('end', name)
+        self.columns_list.select_set(0, 'end')
+        self.columns_path = filepath
+    
+    def get_columns(self, filepath):
+        """Выбранные колонки для filepath или None (все колонки)"""
+        if filepath != self.columns_path:
+            return None
+        selected = [self.columns_list.get(index) for index in self.columns_list.curselection()]
+        if not selected or len(selected) == self.columns_list.size():
+            return None
+        return selected
     
     def clear_csv_fields(self):
         """Очистка полей CSV"""
         self.csv_path.delete(0, 'end')
+        self.columns_list.delete(0, 'end')
+        self.columns_path = None
+        self.csv_result.config(state='normal')
+        self.csv_result.delete('1.0', 'end')
+        self.csv_result.config(state='disabled')
+    
+    def get_workers(self, variable=None):
+        """Количество процессов из поля ввода (по умолчанию - для одного файла, не меньше 1)"""
+        try:
+            return max(1, int((variable or self.workers_var).get()))
+        except ValueError:
+            return 1
+    
+    def show_csv_result(self, text):
+        """Заменить текст результата обработки CSV"""
         self.csv_result.config(state='normal')
         self.csv_result.delete('1.0', 'end')
+        self.csv_result.insert('1.0', text)
         self.csv_result.config(state='disabled')
     
+    def clean_directory(self):
+        """Пакетная очистка всех CSV файлов каталога в фоне"""
+        directory = filedialog.askdirectory(title="Выберите каталог с CSV файлами")
+        if not directory:
+            return
+        
+        workers = self.get_workers(self.batch_workers_var)
+        engine = self.engine_var.get()
+        self.batch_button.config(state='disabled')
+        self.show_csv_result(f"Очистка каталога {directory}...")
+        
+        def on_done(summary):
+            self.batch_button.config(state='normal')
+            self.show_csv_result(f"Каталог: {directory}\n\n" + "\n".join(format_batch_summary(summary)))
+            if summary['failed']:
+                messagebox.showwarning("Предупреждение",
+                                       f"Не удалось очистить файлов: {summary['failed']}")
+        
+        def on_error(error):
+            self.batch_button.config(state='normal')
+            self.show_csv_result("")
+            messagebox.showerror("Ошибка", f"Не удалось очистить каталог: {error}")
+        
+        self.file_worker.submit(
+            lambda: clean_csv_directory(directory, workers=workers, engine=engine),
+            on_done, on_error
+        )
+    
     def extract_emails(self):
         """Извлечение email из текста"""
         text = self.email_text.get('1.0', 'end-1c')
-        emails = extract_emails(text)
-        
+        self.show_emails(unique_emails(extract_emails(text)))
+    
+    def show_emails(self, emails, header='Найденные email-адреса:'):
+        """Вывести адреса в поле результата (не больше EMAIL_DISPLAY_LIMIT)"""
         self.email_result.config(state='normal')
         self.email_result.delete('1.0', 'end')
         
         if emails:
-            self.email_result.insert('1.0', 'Найденные email-адреса:\n\n')
-            for email in emails:
-                self.email_result.insert('end', f'{email}\n')
+            self.email_result.insert('1.0', f'{header}\n\n')
+            self.email_result.insert('end', '\n'.join(emails[:self.EMAIL_DISPLAY_LIMIT]) + '\n')
+            if len(emails) > self.EMAIL_DISPLAY_LIMIT:
+                self.email_result.insert(
+                    'end', f'... и еще {len(emails) - self.EMAIL_DISPLAY_LIMIT} (полный список - в CSV)\n')
         else:
             self.email_result.insert('1.0', 'Email-адреса не найдены')
         
         self.email_result.config(state='disabled')
     
+    def extract_emails_from_files(self):
+        """Поиск email в выбранных файлах"""
+        paths = filedialog.askopenfilenames(title="Выберите файлы для поиска email")
+        if paths:
+            self.scan_emails(list(paths))
+    
+    def extract_emails_from_directory(self):
+        """Поиск email во всех файлах каталога"""
+        directory = filedialog.askdirectory(title="Выберите каталог для поиска email")
+        if directory:
+            self.scan_emails([directory])
+    
+    def scan_emails(self, paths):
+        """Поиск email в файлах в фоне; результат можно сохранить в CSV"""
+        buttons = (self.email_files_button, self.email_dir_button)
+        for button in buttons:
+            button.config(state='disabled')
+        self.email_save_button.config(state='disabled')
+        self.email_result.config(state='normal')
+        self.email_result.delete('1.0', 'end')
+        self.email_result.insert('1.0', 'Поиск email-адресов...')
+        self.email_result.config(state='disabled')
+        
+        def on_done(matches):
+            for button in buttons:
+                button.config(state='normal')
+            self.email_matches = matches
+            self.email_save_button.config(state='normal' if matches else 'disabled')
+            self.show_emails([match.email for match in matches],
+                             header=f'Найдено email-адресов: {len(matches)}')
+        
+        def on_error(error):
+            for button in buttons:
+                button.config(state='normal')
+            self.show_emails([])
+            messagebox.showerror("Ошибка", f"Не удалось выполнить поиск: {error}")
+        
+        self.file_worker.submit(lambda: extract_emails_from_files(paths), on_done, on_error)
+    
+    def save_emails(self):
+        """Сохранить найденные в файлах адреса в CSV"""
+        path = filedialog.asksaveasfilename(
+            title="Сохранить email-адреса",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if not path:
+            return
+        try:
+            save_emails_csv(self.email_matches, path)
+            messagebox.showinfo("Успех", f"Сохранено адресов: {len(self.email_matches)}\n\n{path}")
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {e}")
+    
     def load_and_save_csv(self):
-        """Загрузка и обработка CSV файла"""
+        """Загрузка и обработка CSV файла в фоне"""
         filepath = self.csv_path.get()
         if not filepath:
             messagebox.showwarning("Предупреждение", "Выберите CSV файл")
             return
         
-        try:
-            df_original = pd.read_csv(filepath)
-            stats = get_csv_stats(df_original)
-            
-            df_cleaned = clean_csv_data(df_original)
-            cleaned_file_path = save_cleaned_csv(df_cleaned, filepath)
-            
-            self.csv_result.config(state='normal')
-            self.csv_result.delete('1.0', 'end')
-            
-            self.csv_result.insert('1.0', f"Исходный файл: {filepath}\n")
-            self.csv_result.insert('end', f"Очищенный файл: {cleaned_file_path}\n\n")
-            self.csv_result.insert('end', f"Записей в исходном файле: {stats['total_rows']}\n")
-            self.csv_result.insert('end', f"Записей после удаления пустых значений: {len(df_cleaned)}\n")
-            self.csv_result.insert('end', f"Удалено записей: {stats['total_rows'] - len(df_cleaned)}\n\n")
-            
-            if stats['total_missing'] > 0:
-                self.csv_result.insert('end', "Статистика по пропущенным значениям:\n")
-                for column, count in stats['missing_values'].items():
-                    if count > 0:
-                        self.csv_result.insert('end', f"  {column}: {count} пропущенных значений\n")
-            
-            self.csv_result.insert('end', f"\nКолонки: {', '.join(df_cleaned.columns)}\n\n")
-            self.csv_result.insert('end', "Первые 10 строк очищенного файла:\n")
-            self.csv_result.insert('end', df_cleaned.head(10).to_string())
-            
-            self.csv_result.config(state='disabled')
-            
-            messagebox.showinfo(
-                "Успех", 
-                f"Файл успешно обработан!\n\n"
-                f"Исходный файл: {stats['total_rows']} записей\n"
-                f"Очищенный файл: {len(df_cleaned)} записей\n"
-                f"Удалено записей с пустыми значениями: {stats['total_rows'] - len(df_cleaned)}\n\n"
-                f"Сохранен как: {cleaned_file_path}"
-            )
-            
-        except FileNotFoundError:
-            messagebox.showerror("Ошибка", f"Файл не найден: {filepath}")
-        except pd.errors.EmptyDataError:
-            messagebox.showerror("Ошибка", "Файл пуст или имеет неверный формат")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось обработать CSV файл: {e}")
\ No newline at end of file
+        workers = self.get_workers()
+        engine = self.engine_var.get()
+        columns = self.get_columns(filepath)
+        self.clean_button.config(state='disabled')
+        self.show_csv_result(f"Обработка файла {filepath}...")
+        
+        def on_done(result):
+            self.clean_button.config(state='normal')
+            self.show_clean_result(filepath, result)
+        
+        def on_error(error):
+            import pandas as pd
+            self.clean_button.config(state='normal')
+            self.show_csv_result("")
+            if isinstance(error, FileNotFoundError):
+                messagebox.showerror("Ошибка", f"Файл не найден: {filepath}")
+            elif isinstance(error, pd.errors.EmptyDataError):
+                messagebox.showerror("Ошибка", "Файл пуст или имеет неверный формат")
+            else:
+                messagebox.showerror("Ошибка", f"Не удалось обработать CSV файл: {error}")
+        
+        # Файл обрабатывается по частям, поэтому размер не ограничен памятью
+        self.file_worker.submit(
+            lambda: clean_csv_file(filepath, workers=workers, engine=engine, columns=columns),
+            on_done, on_error
+        )
+    
+    def show_clean_result(self, filepath, result):
+        """Показать статистику очистки файла"""
+        stats = result['stats']
+        cleaned_rows = result['cleaned_rows']
+        cleaned_file_path = result['output_path']
+        
+        self.csv_result.config(state='normal')
+        self.csv_result.delete('1.0', 'end')
+        
+        self.csv_result.insert('1.0', f"Исходный файл: {filepath}\n")
+        self.csv_result.insert('end', f"Очищенный файл: {cleaned_file_path}\n\n")
+        self.csv_result.insert('end', f"Записей в исходном файле: {stats['total_rows']}\n")
+        self.csv_result.insert('end', f"Записей после удаления пустых значений: {cleaned_rows}\n")
+        self.csv_result.insert('end', f"Удалено записей: {stats['total_rows'] - cleaned_rows}\n\n")
+        
+        if stats['total_missing'] > 0:
+            self.csv_result.insert('end', "Статистика по пропущенным значениям:\n")
+            for column, count in stats['missing_values'].items():
+                if count > 0:
+                    self.csv_result.insert('end', f"  {column}: {count} пропущенных значений\n")
+        
+        self.csv_result.insert('end', f"\nКолонки: {', '.join(result['columns'])}\n\n")
+        self.csv_result.insert('end', "Первые 10 строк очищенного файла:\n")
+        self.csv_result.insert('end', result['preview'].to_string())
+        
+        self.csv_result.config(state='disabled')
+        
+        messagebox.showinfo(
+            "Успех", 
+            f"Файл успешно обработан!\n\n"
+            f"Исходный файл: {stats['total_rows']} записей\n"
+            f"Очищенный файл: {cleaned_rows} записей\n"
+            f"Удалено записей с пустыми значениями: {stats['total_rows'] - cleaned_rows}\n\n"
+            f"Сохранен как: {cleaned_file_path}"
+        )
\ No newline at end of file
@@ -3,11 +3,11 @@
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
-import pandas as pd
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from datetime import datetime, date
 from models import Employee
-from utils import export_to_csv
+from gui.virtual_tree import VirtualTreeview
+from database.importer import CsvImporter, format_import_result
 
 class EmployeesTab:
     def __init__(self, parent, db_manager, app):
@@ -32,6 +32,8 @@ class EmployeesTab:
                   command=self.delete).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Показать задачи", 
                   command=self.show_tasks).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Зарплата за месяц", 
+                  command=self.show_payroll).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Экспорт в CSV", 
                   command=self.export_to_csv).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Обновить", 
@@ -39,36 +41,44 @@ class EmployeesTab:
         
         # Таблица сотрудников
         columns = ('ID', 'Имя', 'Должность', 'Зарплата', 'Отработано часов', 'Заработок', 'Завершено задач')
-        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings')
+        self.tree = VirtualTreeview(self.frame, columns, sortable=True, filterable=True)
         
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
         
-        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", 
-                                 command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-        scrollbar.pack(side='right', fill='y', padx=5, pady=5)
+        self.tree.pack(fill='both', expand=True, padx=5, pady=5)
     
     def load_data(self):
-        """Загрузка данных сотрудников"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        employees = self.db_manager.get_all_employees()
-        for emp in employees:
-            pay = emp.calculate_pay()
-            
-            completed_tasks = self.db_manager.get_tasks_by_employee(emp.id, "Завершено")
-            completed_count = len(completed_tasks) if completed_tasks else 0
-            
-            self.tree.insert('', 'end', values=(
-                emp.id, emp.name, emp.position, 
+        """Загрузка данных сотрудников (в фоновом потоке)"""
+        self.app.worker.submit(
+            self.fetch_summary, self.show_data, self.app.show_db_error, key='employees'
+        )
+    
+    def fetch_summary(self):
+        """Сводка по сотрудникам; pandas загружается при первом вызове"""
+        from utils.analytics import TaskAnalytics
+        return TaskAnalytics.from_db(self.db_manager).employee_summary()
+    
+    def show_data(self, summary):
+        """Отображение загруженных данных сотрудников"""
+        rows = []
+        keys = {}
+        for emp in summary.itertuples():
+            emp_id = int(emp.Index)
+            rows.append((emp_id, (
+                emp_id, emp.name, emp.position, 
                 f"{emp.salary:.2f}", f"{emp.hours_worked:.1f}",
-                f"{pay:.2f}", completed_count
-            ))
+                f"{emp.pay:.2f}", emp.completed_tasks
+            )))
+            # Типизированные ключи сортировки рассчитываются один раз
+            keys[emp_id] = (
+                emp_id, str(emp.name).lower(),
+                emp.position.lower() if isinstance(emp.position, str) else "",
+                float(emp.salary), float(emp.hours_worked),
+                float(emp.pay), int(emp.completed_tasks)
+            )
+        self.tree.set_rows(rows, keys)
     
     def add_dialog(self):
         """Диалог добавления сотрудника"""
@@ -81,11 +91,14 @@ class EmployeesTab:
             messagebox.showwarning("Предупреждение", "Выберите сотрудника для редактирования")
             return
         
-        item = self.tree.item(selection[0])
-        emp_id = item['values'][0]       
-        employee = self.db_manager.get_employee_by_id(emp_id)
-        if employee:
-            self.employee_dialog("Редактировать сотрудника", employee)
+        emp_id = selection[0]
+        
+        def open_dialog(employee):
+            if employee:
+                self.employee_dialog("Редактировать сотрудника", employee)
+        
+        self.app.worker.submit(lambda: self.db_manager.get_employee_by_id(emp_id),
+                               open_dialog, self.app.show_db_error)
     
     def employee_dialog(self, title, employee):
         """Общий диалог для добавления/редактирования сотрудника"""
@@ -93,7 +106,7 @@ class EmployeesTab:
         dialog.title(title)
         dialog.geometry("400x300")
         
-        current_hours = self.db_manager.get_employee_hours_worked(employee.id) if employee else 0
+        current_hours = employee.hours_worked if employee else 0
         
         ttk.Label(dialog, text="Имя:").grid(row=0, column=0, padx=10, pady=10, sticky='w')
         name_var = tk.StringVar(value=employee.name if employee else "")
@@ -127,14 +140,18 @@ class EmployeesTab:
                     employee.name = name
                     employee.position = position
                     employee.salary = salary
-                    self.db_manager.update_employee(employee)
+                    write = lambda: self.db_manager.update_employee(employee)
                 else:
                     new_employee = Employee(name, position, salary, 0)
-                    self.db_manager.add_employee(new_employee)
+                    write = lambda: self.db_manager.add_employee(new_employee)
+                
+                def on_saved(result):
+                    self.app.events.publish('employees', 'update' if employee else 'insert',
+                                            employee.id if employee else None)
+                    dialog.destroy()
+                    messagebox.showinfo("Успех", "Сотрудник сохранен")
                 
-                self.load_data()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Сотрудник сохранен")
+                self.app.worker.submit(write, on_saved, self.app.show_db_error)
                 
             except ValueError:
                 messagebox.showerror("Ошибка", "Некорректные числовые значения")
@@ -150,11 +167,13 @@ class EmployeesTab:
             return
         
         if messagebox.askyesno("Подтверждение", "Удалить выбранного сотрудника?"):
-            item = self.tree.item(selection[0])
-            emp_id = item['values'][0]
-            self.db_manager.delete_employee(emp_id)
-            self.load_data()
-            self.app.tasks_tab.load_data()
+            emp_id = selection[0]
+            
+            def on_deleted(result):
+                self.app.events.publish('employees', 'delete', emp_id)
+            
+            self.app.worker.submit(lambda: self.db_manager.delete_employee(emp_id),
+                                   on_deleted, self.app.show_db_error)
     
     def show_tasks(self):
         """Показать задачи сотрудника"""
@@ -163,11 +182,19 @@ class EmployeesTab:
             messagebox.showwarning("Предупреждение", "Выберите сотрудника")
             return
         
-        item = self.tree.item(selection[0])
-        emp_id = item['values'][0]
-        emp_name = item['values'][1]
+        emp_id = selection[0]
+        emp_name = self.tree.item_values(emp_id)[1]
         
-        tasks = self.db_manager.get_tasks_by_employee(emp_id)
+        def fetch():
+            tasks = self.db_manager.get_tasks_by_employee(emp_id)
+            return [(task, self.db_manager.get_task_project_title(task[0])) for task in tasks]
+        
+        self.app.worker.submit(fetch, lambda rows: self.tasks_dialog(emp_name, rows),
+                               self.app.show_db_error)
+    
+    def tasks_dialog(self, emp_name, rows):
+        """Окно со списком задач сотрудника"""
+        tasks = [task for task, _ in rows]
         
         dialog = tk.Toplevel(self.app.root)
         dialog.title(f"Задачи сотрудника: {emp_name}")
@@ -181,9 +208,8 @@ class EmployeesTab:
             tree.column(col, width=120)
         
         completed_hours = 0
-        for task in tasks:
+        for task, project_title in rows:
             task_id, title, status, hours = task
-            project_title = self.db_manager.get_task_project_title(task_id)
             
             tree.insert('', 'end', values=(
                 task_id, title, status, f"{hours:.1f}", project_title
@@ -204,24 +230,75 @@ class EmployeesTab:
         ttk.Label(stats_frame, text=f"Завершено: {completed_tasks}").pack(side='left', padx=10)
         ttk.Label(stats_frame, text=f"Отработано часов: {completed_hours:.1f}").pack(side='left', padx=10)
     
+    def show_payroll(self):
+        """Расчет зарплаты за месяц по задачам, завершенным в этом месяце"""
+        month = simpledialog.askstring("Зарплата за месяц", "Месяц (ГГГГ-ММ):",
+                                       initialvalue=date.today().strftime('%Y-%m'),
+                                       parent=self.app.root)
+        if not month:
+            return
+        try:
+            start = datetime.strptime(month.strip(), '%Y-%m').date()
+        except ValueError:
+            messagebox.showerror("Ошибка", "Введите месяц в формате ГГГГ-ММ")
+            return
+        
+        def run():
+            # pandas загружается только при первом расчете
+            from utils.payroll import PayrollEngine, PayrollPeriod
+            return PayrollEngine(self.app.db_connection).run(PayrollPeriod(start))
+        
+        self.app.worker.submit(run, self.payroll_dialog, self.app.show_db_error)
+    
+    def payroll_dialog(self, result):
+        """Окно с расчетом зарплаты за период"""
+        period_key = result['period_key'].iloc[0] if len(result) else ""
+        dialog = tk.Toplevel(self.app.root)
+        dialog.title(f"Зарплата за {period_key}")
+        dialog.geometry("800x400")
+        
+        columns = ('ID', 'Имя', 'Должность', 'Норма часов', 'Отработано часов',
+                   'Сверхурочно', 'К выплате')
+        tree = ttk.Treeview(dialog, columns=columns, show='headings')
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110)
+        
+        for row in result.itertuples():
+            tree.insert('', 'end', values=(
+                row.employee_id, row.name, row.position, f"{row.norm_hours:.1f}",
+                f"{row.hours_worked:.1f}", f"{row.overtime_hours:.1f}", f"{row.pay:.2f}"
+            ))
+        tree.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        ttk.Label(dialog, text=f"Итого к выплате: {result['pay'].sum():.2f}").pack(
+            side='left', padx=10, pady=5)
+    
     def export_to_csv(self):
-        """Экспорт сотрудников в CSV"""
-        employees = self.db_manager.get_all_employees()
-        data = []
-        for emp in employees:
-            completed_tasks = self.db_manager.get_tasks_by_employee(emp.id, "Завершено")
-            completed_count = len(completed_tasks) if completed_tasks else 0
-            
-            data.append({
-                'ID': emp.id,
-                'Имя': emp.name,
-                'Должность': emp.position,
-                'Зарплата': emp.salary,
-                'Отработано часов': emp.hours_worked,
-                'Заработок': emp.calculate_pay(),
-                'Завершено задач': completed_count
-            })
-        
-        df = pd.DataFrame(data)
-        filename = export_to_csv(df, "employees")
-        messagebox.showinfo("Экспорт", f"Данные экспортированы в {filename}")
\ No newline at end of file
+        """Экспорт сотрудников в CSV в фоне (COPY в отдельном подключении к БД)"""
+        self.app.exports.start("employees")
+    
+    def export_columnar(self, file_format):
+        """Экспорт сотрудников в Parquet/Feather с типизированными колонками в фоне"""
+        self.app.exports.start("employees", file_format)
+    
+    def import_from_csv(self):
+        """Импорт сотрудников из CSV одной транзакцией (в фоновом потоке)"""
+        filepath = filedialog.askopenfilename(
+            title="Импорт сотрудников из CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not filepath:
+            return
+        
+        def on_imported(result):
+            self.app.events.publish('employees', 'import')
+            messagebox.showinfo("Импорт", "\n".join(format_import_result(result)))
+        
+        def on_error(error):
+            messagebox.showerror("Ошибка", f"Не удалось импортировать данные: {error}")
+        
+        self.app.worker.submit(
+            lambda: CsvImporter(self.app.db_connection).import_file('employees', filepath),
+            on_imported, on_error
+        )
\ No newline at end of file
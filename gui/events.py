@@ -0,0 +1,43 @@
+"""
+Шина событий изменения данных
+"""
+
+from collections import namedtuple
+
+ChangeEvent = namedtuple('ChangeEvent', ['entity', 'action', 'entity_id'])
+
+class EventBus:
+    """Центральная шина событий изменения сущностей.
+
+    Записи публикуют события (employees/tasks/projects), вкладки подписываются
+    на нужные сущности. События накапливаются и доставляются не чаще одного
+    раза за кадр: каждый подписчик получает один вызов со списком событий.
+    """
+
+    FRAME_INTERVAL = 16  # мс
+
+    def __init__(self, root):
+        self.root = root
+        self._subscribers = []
+        self._pending = []
+        self._scheduled = False
+
+    def subscribe(self, entities, callback):
+        """Подписаться на изменения сущностей: callback(events)"""
+        self._subscribers.append((frozenset(entities), callback))
+
+    def publish(self, entity, action='update', entity_id=None):
+        """Опубликовать изменение сущности"""
+        self._pending.append(ChangeEvent(entity, action, entity_id))
+        if not self._scheduled:
+            self._scheduled = True
+            self.root.after(self.FRAME_INTERVAL, self.flush)
+
+    def flush(self):
+        """Доставить накопленные события подписчикам"""
+        self._scheduled = False
+        events, self._pending = self._pending, []
+        for entities, callback in self._subscribers:
+            relevant = [event for event in events if event.entity in entities]
+            if relevant:
+                callback(relevant)
@@ -0,0 +1,129 @@
+"""
+Окно фоновых выгрузок
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from utils.export_jobs import ExportJob, ExportQueue
+
+ENTITY_TITLES = {'employees': "Сотрудники", 'tasks': "Задачи", 'projects': "Проекты"}
+FORMAT_TITLES = {'csv': "CSV", 'parquet': "Parquet", 'feather': "Feather"}
+STATUS_TITLES = {
+    ExportJob.PENDING: "В очереди",
+    ExportJob.RUNNING: "Выполняется",
+    ExportJob.DONE: "Готово",
+    ExportJob.CANCELLED: "Отменено",
+    ExportJob.FAILED: "Ошибка",
+}
+
+class ExportsWindow:
+    """Список выгрузок с числом выгруженных строк и отменой.
+
+    Выгрузки выполняются в ExportQueue; их состояние опрашивается через
+    root.after, пока есть незавершенные. Если окно закрыто, оно
+    открывается снова при завершении выгрузки, чтобы показать результат.
+    """
+
+    REFRESH_INTERVAL = 200  # мс
+
+    def __init__(self, app):
+        self.app = app
+        self.queue = None
+        self.window = None
+        self.tree = None
+        self._jobs = {}
+        self._finished = set()
+        self._polling = False
+
+    def start(self, entity, file_format='csv'):
+        """Запустить выгрузку в фоне и показать окно выгрузок"""
+        if self.queue is None:
+            self.queue = ExportQueue()
+        job = self.queue.submit(ExportJob(self.app.db_connection.config, entity, file_format))
+        self._jobs[str(id(job))] = job
+        self.show()
+        self._schedule()
+        return job
+
+    def is_open(self):
+        return self.window is not None and self.window.winfo_exists()
+
+    def show(self):
+        """Показать окно выгрузок"""
+        if not self.is_open():
+            self.window = tk.Toplevel(self.app.root)
+            self.window.title("Выгрузки")
+            self.window.geometry("750x300")
+
+            columns = ('Данные', 'Формат', 'Строк', 'Статус', 'Файл')
+            self.tree = ttk.Treeview(self.window, columns=columns, show='headings')
+            for col, width in zip(columns, (100, 70, 90, 200, 270)):
+                self.tree.heading(col, text=col)
+                self.tree.column(col, width=width)
+            self.tree.pack(fill='both', expand=True, padx=5, pady=5)
+
+            button_frame = ttk.Frame(self.window)
+            button_frame.pack(fill='x', padx=5, pady=5)
+            ttk.Button(button_frame, text="Отменить",
+                      command=self.cancel_selected).pack(side='left', padx=5)
+            ttk.Button(button_frame, text="Очистить завершенные",
+                      command=self.clear_finished).pack(side='left', padx=5)
+            ttk.Button(button_frame, text="Закрыть",
+                      command=self.window.destroy).pack(side='right', padx=5)
+        else:
+            self.window.deiconify()
+            self.window.lift()
+        self.refresh()
+
+    def refresh(self):
+        """Обновить строки выгрузок в открытом окне"""
+        if not self.is_open():
+            return
+        for key, job in self._jobs.items():
+            values = self.row_values(job)
+            if self.tree.exists(key):
+                self.tree.item(key, values=values)
+            else:
+                self.tree.insert('', 'end', iid=key, values=values)
+
+    def _schedule(self):
+        if not self._polling and self.queue is not None and self.queue.active():
+            self._polling = True
+            self.app.root.after(self.REFRESH_INTERVAL, self._poll)
+
+    def _poll(self):
+        """Опрос состояния выгрузок, пока есть незавершенные"""
+        self._polling = False
+        newly_finished = [key for key, job in self._jobs.items()
+                          if job.finished and key not in self._finished]
+        self._finished.update(newly_finished)
+        if newly_finished and not self.is_open():
+            self.show()
+        else:
+            self.refresh()
+        self._schedule()
+
+    def row_values(self, job):
+        status = STATUS_TITLES[job.status]
+        if job.status == ExportJob.FAILED and job.error:
+            status = f"{status}: {job.error}"
+        return (ENTITY_TITLES[job.entity], FORMAT_TITLES[job.file_format],
+                job.rows, status, job.path)
+
+    def cancel_selected(self):
+        """Отменить выбранные выгрузки"""
+        for key in self.tree.selection():
+            self._jobs[key].cancel()
+        self.refresh()
+
+    def clear_finished(self):
+        """Убрать из списка и из очереди завершенные выгрузки"""
+        if self.queue is None:
+            return
+        for job in self.queue.prune():
+            key = str(id(job))
+            self._jobs.pop(key, None)
+            self._finished.discard(key)
+            if self.is_open() and self.tree.exists(key):
+                self.tree.delete(key)
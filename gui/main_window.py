@@ -3,6 +3,7 @@
 """
 
 import tkinter as tk
+from functools import partial
 from tkinter import ttk, messagebox
 import config
 
@@ -10,6 +11,7 @@ import config
 try:
     from database.db_connection_gui import DatabaseConnectionManager
     from database.db_manager import DatabaseManager
+    from database.schema import ensure_schema
 except ImportError as e:
     print(f"Ошибка импорта: {e}")
     # Альтернативный импорт
@@ -18,6 +20,11 @@ except ImportError as e:
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
     from database.db_connection_gui import DatabaseConnectionManager
     from database.db_manager import DatabaseManager
+    from database.schema import ensure_schema
+
+from gui.worker import BackgroundWorker
+from gui.events import EventBus
+from gui.exports_window import ExportsWindow
 
 # Импорт вкладок
 from gui.employees_tab import EmployeesTab
@@ -41,9 +48,19 @@ class TimeTrackingApp:
             self.root.destroy()
             return
         
-        # Инициализация менеджера БД
+        # Инициализация менеджера БД и вспомогательных таблиц
+        ensure_schema(self.db_connection)
         self.db_manager = DatabaseManager(self.db_connection)
         
+        # Фоновый поток для операций с БД
+        self.worker = BackgroundWorker(root)
+        
+        # Шина событий изменения данных
+        self.events = EventBus(root)
+        
+        # Фоновые выгрузки (каждая - в своем подключении к БД)
+        self.exports = ExportsWindow(self)
+        
         # Инициализация GUI компонентов
         self.setup_ui()
         self.load_data()
@@ -53,6 +70,14 @@ class TimeTrackingApp:
     
     def setup_ui(self):
         """Настройка пользовательского интерфейса"""
+        # Строка состояния с индикатором загрузки
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side='bottom', fill='x', padx=10, pady=(0, 5))
+        self.status_label = ttk.Label(status_frame, text="", foreground="gray")
+        self.status_label.pack(side='left')
+        self.progress = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self.worker.add_busy_listener(self.show_loading)
+        
         # Панель вкладок
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
@@ -76,6 +101,15 @@ class TimeTrackingApp:
         self.notebook.add(self.tasks_tab.frame, text='Задачи')
         self.notebook.add(self.projects_tab.frame, text='Проекты')
         self.notebook.add(self.data_tab.frame, text='Работа с данными')
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
+        # Вкладки с данными загружаются при первом показе.
+        # Зависимости вкладок от сущностей: удаление проекта удаляет задачи,
+        # удаление сотрудника снимает назначение задач
+        self.entity_tabs = (self.employees_tab, self.tasks_tab, self.projects_tab)
+        self.watch_tab(self.employees_tab, ('employees', 'tasks', 'projects'))
+        self.watch_tab(self.tasks_tab, ('tasks', 'employees', 'projects'))
+        self.watch_tab(self.projects_tab, ('projects', 'tasks'))
     
     def setup_menu(self):
         """Создание меню приложения"""
@@ -96,6 +130,11 @@ class TimeTrackingApp:
         data_menu.add_command(label="Обновить все данные", 
                             command=self.load_data)
         data_menu.add_separator()
+        data_menu.add_command(label="Импорт сотрудников из CSV...", 
+                            command=self.employees_tab.import_from_csv)
+        data_menu.add_command(label="Импорт задач из CSV...", 
+                            command=self.tasks_tab.import_from_csv)
+        data_menu.add_separator()
         data_menu.add_command(label="Экспорт сотрудников в CSV", 
                             command=self.employees_tab.export_to_csv)
         data_menu.add_command(label="Экспорт задач в CSV", 
@@ -103,6 +142,18 @@ class TimeTrackingApp:
         data_menu.add_command(label="Экспорт проектов в CSV", 
                             command=self.projects_tab.export_to_csv)
         
+        # Колоночные форматы для аналитики: Parquet и Feather
+        for file_format, title in (('parquet', 'Parquet'), ('feather', 'Feather')):
+            export_menu = tk.Menu(data_menu, tearoff=0)
+            data_menu.add_cascade(label=f"Экспорт в {title}", menu=export_menu)
+            for label, tab in (("Сотрудники", self.employees_tab),
+                               ("Задачи", self.tasks_tab),
+                               ("Проекты", self.projects_tab)):
+                export_menu.add_command(label=label,
+                                        command=partial(tab.export_columnar, file_format))
+        data_menu.add_separator()
+        data_menu.add_command(label="Выгрузки...", command=self.exports.show)
+        
         # Меню Справка
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Справка", menu=help_menu)
@@ -123,16 +174,57 @@ class TimeTrackingApp:
         
         self.db_connection = self.connection_manager.create_connection(new_config)
         if self.db_connection:
+            ensure_schema(self.db_connection)
             self.db_manager = DatabaseManager(self.db_connection)
+            for tab in self.entity_tabs + (self.data_tab,):
+                tab.db_manager = self.db_manager
             self.load_data()
         else:
             messagebox.showerror("Ошибка", "Не удалось переподключиться к базе данных")
     
     def load_data(self):
-        """Загрузка всех данных"""
-        self.employees_tab.load_data()
-        self.tasks_tab.load_data()
-        self.projects_tab.load_data()
+        """Пометить все вкладки устаревшими и загрузить только видимую"""
+        for tab in self.entity_tabs:
+            tab.dirty = True
+        self.on_tab_changed()
+    
+    def watch_tab(self, tab, entities):
+        """Обновлять вкладку при изменении сущностей"""
+        tab.dirty = True
+        self.events.subscribe(entities, lambda events: self.refresh_tab(tab))
+    
+    def is_tab_visible(self, tab):
+        return self.notebook.select() == str(tab.frame)
+    
+    def refresh_tab(self, tab):
+        """Обновить видимую вкладку, скрытую - только пометить устаревшей"""
+        if self.is_tab_visible(tab):
+            tab.dirty = False
+            tab.load_data()
+        else:
+            tab.dirty = True
+    
+    def on_tab_changed(self, event=None):
+        """Загрузить или обновить устаревшую вкладку при ее показе"""
+        for tab in self.entity_tabs:
+            if getattr(tab, 'dirty', False) and self.is_tab_visible(tab):
+                tab.dirty = False
+                tab.load_data()
+    
+    def show_loading(self, busy):
+        """Показать/скрыть индикатор загрузки"""
+        if busy:
+            self.status_label.config(text="Загрузка...")
+            self.progress.pack(side='left', padx=10)
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.status_label.config(text="")
+    
+    def show_db_error(self, error):
+        """Показать ошибку фоновой операции с БД"""
+        messagebox.showerror("Ошибка", f"Ошибка при работе с БД: {error}")
     
     def show_about(self):
         """Показать информацию о программе"""
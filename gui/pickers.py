@@ -0,0 +1,86 @@
+"""
+Выпадающие списки с поиском по мере ввода
+"""
+
+import itertools
+from tkinter import ttk
+
+_keys = itertools.count(1)
+
+class LookupPicker(ttk.Combobox):
+    """Поле выбора сущности с подгрузкой вариантов по введенному префиксу.
+
+    lookup(prefix, limit) возвращает список (id, подпись) и выполняется
+    в фоновом потоке; запрос отправляется после паузы во вводе, а ответ на
+    устаревший префикс отбрасывается. Пока поле пусто, варианты не
+    загружаются.
+    """
+
+    DEBOUNCE = 200  # мс
+    LIMIT = 50
+
+    def __init__(self, parent, lookup, worker, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.lookup = lookup
+        self.worker = worker
+        self._options = {}
+        self._selected = None
+        self._after_id = None
+        self._key = f"lookup-{next(_keys)}"
+
+        self.bind('<KeyRelease>', self._on_key)
+        self.bind('<<ComboboxSelected>>', self._on_selected)
+        self.bind('<Destroy>', self._on_destroy)
+
+    def set_selection(self, entity_id, label):
+        """Установить выбранную сущность"""
+        self._options[label] = entity_id
+        self._selected = entity_id
+        self.set(label)
+
+    def get_id(self):
+        """Id выбранной сущности или None"""
+        text = self.get()
+        if not text:
+            return None
+        if text in self._options:
+            return self._options[text]
+        return self._selected
+
+    def refresh(self, prefix):
+        """Загрузить варианты для префикса"""
+        if not prefix.strip():
+            self.worker.cancel(self._key)
+            self['values'] = []
+            return
+        self.worker.submit(lambda: self.lookup(prefix, self.LIMIT),
+                           self._show_options, key=self._key)
+
+    def _show_options(self, options):
+        if not self.winfo_exists():
+            return
+        self._options.update((label, entity_id) for entity_id, label in options)
+        self['values'] = [label for _, label in options]
+
+    def _on_key(self, event):
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        self._selected = None
+        if self._after_id:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.DEBOUNCE, self._on_pause)
+
+    def _on_pause(self):
+        self._after_id = None
+        self.refresh(self.get())
+
+    def _on_selected(self, event):
+        self._selected = self._options.get(self.get())
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self._after_id:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self.worker.release(self._key)
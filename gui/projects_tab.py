@@ -4,9 +4,8 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
 from models import Project
-from utils import export_to_csv
+from gui.virtual_tree import VirtualTreeview
 
 class ProjectsTab:
     def __init__(self, parent, db_manager, app):
@@ -36,35 +35,43 @@ class ProjectsTab:
         
         # Таблица проектов
         columns = ('ID', 'Название', 'Всего задач', 'Завершено', 'Прогресс', 'Всего часов')
-        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings')
+        self.tree = VirtualTreeview(self.frame, columns, sortable=True, filterable=True)
         
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=120)
         
-        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", 
-                                 command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-        scrollbar.pack(side='right', fill='y', padx=5, pady=5)
+        self.tree.pack(fill='both', expand=True, padx=5, pady=5)
     
     def load_data(self):
-        """Загрузка данных проектов"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        projects = self.db_manager.get_all_projects()
-        for project in projects:
-            project_dict = project.to_dict()
-            
-            total_hours = sum(task.hours_required for task in project.tasks)
-            
-            self.tree.insert('', 'end', values=(
-                project.id, project.title, 
-                project_dict['total_tasks'], project_dict['completed_tasks'],
-                project_dict['progress'], f"{total_hours:.1f}"
-            ))
+        """Загрузка данных проектов (в фоновом потоке)"""
+        self.app.worker.submit(
+            self.fetch_summary, self.show_data, self.app.show_db_error, key='projects'
+        )
+    
+    def fetch_summary(self):
+        """Сводка по проектам; pandas загружается при первом вызове"""
+        from utils.analytics import TaskAnalytics
+        return TaskAnalytics.from_db(self.db_manager).project_summary()
+    
+    def show_data(self, summary):
+        """Отображение загруженных данных проектов"""
+        rows = []
+        keys = {}
+        for project in summary.itertuples():
+            project_id = int(project.Index)
+            rows.append((project_id, (
+                project_id, project.title, 
+                project.total_tasks, project.completed_tasks,
+                f"{project.progress:.1f}%", f"{project.total_hours:.1f}"
+            )))
+            # Типизированные ключи сортировки рассчитываются один раз
+            keys[project_id] = (
+                project_id, project.title.lower(),
+                int(project.total_tasks), int(project.completed_tasks),
+                float(project.progress), float(project.total_hours)
+            )
+        self.tree.set_rows(rows, keys)
     
     def add_dialog(self):
         """Диалог добавления проекта"""
@@ -77,14 +84,14 @@ class ProjectsTab:
             messagebox.showwarning("Предупреждение", "Выберите проект для редактирования")
             return
         
-        item = self.tree.item(selection[0])
-        project_id = item['values'][0]
+        project_id = selection[0]
         
-        projects = self.db_manager.get_all_projects()
-        project = next((p for p in projects if p.id == project_id), None)
+        def open_dialog(project):
+            if project:
+                self.project_dialog("Редактировать проект", project)
         
-        if project:
-            self.project_dialog("Редактировать проект", project)
+        self.app.worker.submit(lambda: self.db_manager.get_project_by_id(project_id),
+                               open_dialog, self.app.show_db_error)
     
     def project_dialog(self, title, project):
         """Общий диалог для добавления/редактирования проекта"""
@@ -106,15 +113,18 @@ class ProjectsTab:
             
             if project:
                 project.title = title_val
-                self.db_manager.update_project(project)
+                write = lambda: self.db_manager.update_project(project)
             else:
                 new_project = Project(title_val)
-                self.db_manager.add_project(new_project)
+                write = lambda: self.db_manager.add_project(new_project)
             
-            self.load_data()
-            self.app.tasks_tab.load_data()
-            dialog.destroy()
-            messagebox.showinfo("Успех", "Проект сохранен")
+            def on_saved(result):
+                self.app.events.publish('projects', 'update' if project else 'insert',
+                                        project.id if project else None)
+                dialog.destroy()
+                messagebox.showinfo("Успех", "Проект сохранен")
+            
+            self.app.worker.submit(write, on_saved, self.app.show_db_error)
         
         ttk.Button(dialog, text="Сохранить", command=save_project).grid(row=1, column=0, columnspan=2, pady=20)
         ttk.Button(dialog, text="Отмена", command=dialog.destroy).grid(row=2, column=0, columnspan=2)
@@ -127,34 +137,19 @@ class ProjectsTab:
             return
         
         if messagebox.askyesno("Подтверждение", "Удалить выбранный проект и все его задачи?"):
-            item = self.tree.item(selection[0])
-            project_id = item['values'][0]
-            self.db_manager.delete_project(project_id)
-            self.load_data()
-            self.app.tasks_tab.load_data()
-            self.app.employees_tab.load_data()
-            messagebox.showinfo("Удалено", "Проект и все его задачи удалены")
-    
-    def export_to_csv(self):
-        """Экспорт проектов в CSV"""
-        projects = self.db_manager.get_all_projects()
-        data = []
-        for project in projects:
-            project_dict = project.to_dict()
+            project_id = selection[0]
             
-            total_hours = sum(task.hours_required for task in project.tasks)
-            completed_hours = sum(task.hours_required for task in project.tasks if task.status == "Завершено")
+            def on_deleted(result):
+                self.app.events.publish('projects', 'delete', project_id)
+                messagebox.showinfo("Удалено", "Проект и все его задачи удалены")
             
-            data.append({
-                'ID': project.id,
-                'Название': project.title,
-                'Всего задач': project_dict['total_tasks'],
-                'Завершено задач': project_dict['completed_tasks'],
-                'Прогресс': project_dict['progress'],
-                'Всего часов': total_hours,
-                'Выполнено часов': completed_hours
-            })
-        
-        df = pd.DataFrame(data)
-        filename = export_to_csv(df, "projects")
-        messagebox.showinfo("Экспорт", f"Данные экспортированы в {filename}")
\ No newline at end of file
+            self.app.worker.submit(lambda: self.db_manager.delete_project(project_id),
+                                   on_deleted, self.app.show_db_error)
+    
+    def export_to_csv(self):
+        """Экспорт проектов в CSV в фоне (COPY в отдельном подключении к БД)"""
+        self.app.exports.start("projects")
+    
+    def export_columnar(self, file_format):
+        """Экспорт проектов в Parquet/Feather с типизированными колонками в фоне"""
+        self.app.exports.start("projects", file_format)
\ No newline at end of file
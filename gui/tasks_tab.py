@@ -3,10 +3,11 @@
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pandas as pd
-from models import Task, Employee
-from utils import export_to_csv
+from tkinter import ttk, messagebox, filedialog
+from models import Task, EmployeeRef
+from gui.virtual_tree import VirtualTreeview
+from gui.pickers import LookupPicker
+from database.importer import CsvImporter, format_import_result
 
 class TasksTab:
     def __init__(self, parent, db_manager, app):
@@ -38,33 +39,39 @@ class TasksTab:
         
         # Таблица задач
         columns = ('ID', 'Название', 'Статус', 'Часы', 'Сотрудник', 'Проект')
-        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings')
+        self.tree = VirtualTreeview(self.frame, columns, sortable=True, filterable=True)
         
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150)
         
-        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", 
-                                 command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-        scrollbar.pack(side='right', fill='y', padx=5, pady=5)
+        self.tree.pack(fill='both', expand=True, padx=5, pady=5)
     
     def load_data(self):
-        """Загрузка данных задач"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        tasks = self.db_manager.get_all_tasks()
-        for task in tasks:
-            emp_name = task.assigned_employee.name if task.assigned_employee else "Не назначен"
-            project_title = self.db_manager.get_project_title(task.project_id) if task.project_id else "Не назначен"
+        """Загрузка данных задач (в фоновом потоке)"""
+        self.app.worker.submit(self.db_manager.get_task_table, self.show_data,
+                               self.app.show_db_error, key='tasks')
+    
+    def show_data(self, table):
+        """Отображение загруженных задач"""
+        rows = []
+        keys = {}
+        for index in range(len(table)):
+            task_id = table.ids[index]
+            hours = table.hours[index]
+            emp_name = table.employee_names[index] if table.employee_id(index) else "Не назначен"
+            project_title = table.project_titles[index] if table.project_id(index) else "Не назначен"
             
-            self.tree.insert('', 'end', values=(
-                task.id, task.title, task.status, 
-                f"{task.hours_required:.1f}", emp_name, project_title
-            ))
+            rows.append((task_id, (
+                task_id, table.titles[index], table.status(index), 
+                f"{hours:.1f}", emp_name, project_title
+            )))
+            # Типизированные ключи сортировки рассчитываются один раз
+            keys[task_id] = (
+                task_id, table.titles[index].lower(), table.status(index),
+                hours, emp_name.lower(), project_title.lower()
+            )
+        self.tree.set_rows(rows, keys)
     
     def add_dialog(self):
         """Диалог добавления задачи"""
@@ -77,24 +84,24 @@ class TasksTab:
             messagebox.showwarning("Предупреждение", "Выберите задачу для редактирования")
             return
         
-        item = self.tree.item(selection[0])
-        task_id = item['values'][0]
+        task_id = selection[0]
         
-        tasks = self.db_manager.get_all_tasks()
-        task = next((t for t in tasks if t.id == task_id), None)
+        def open_dialog(task):
+            if task:
+                self.task_dialog("Редактировать задачу", task)
         
-        if task:
-            self.task_dialog("Редактировать задачу", task)
+        self.app.worker.submit(lambda: self.db_manager.get_task_by_id(task_id),
+                               open_dialog, self.app.show_db_error)
     
     def task_dialog(self, title, task):
-        """Общий диалог для добавления/редактирования задачи"""
+        """Общий диалог для добавления/редактирования задачи.
+        
+        Сотрудники и проекты подгружаются по мере ввода.
+        """
         dialog = tk.Toplevel(self.app.root)
         dialog.title(title)
         dialog.geometry("500x400")
         
-        employees = self.db_manager.get_all_employees()
-        projects = self.db_manager.get_all_projects()
-        
         ttk.Label(dialog, text="Название:").grid(row=0, column=0, padx=10, pady=10, sticky='w')
         title_var = tk.StringVar(value=task.title if task else "")
         title_entry = ttk.Entry(dialog, textvariable=title_var, width=40)
@@ -118,25 +125,22 @@ class TasksTab:
         hours_entry.grid(row=3, column=1, padx=10, pady=10)
         
         ttk.Label(dialog, text="Сотрудник:").grid(row=4, column=0, padx=10, pady=10, sticky='w')
-        employee_var = tk.StringVar()
-        employee_combo = ttk.Combobox(dialog, textvariable=employee_var, state="readonly")
-        employee_combo['values'] = [f"{e.id}: {e.name}" for e in employees]
-        employee_combo.grid(row=4, column=1, padx=10, pady=10)
+        employee_picker = LookupPicker(dialog, self.db_manager.lookup_employees,
+                                       self.app.worker, width=37)
+        employee_picker.grid(row=4, column=1, padx=10, pady=10)
         
         if task and task.assigned_employee:
-            employee_combo.set(f"{task.assigned_employee.id}: {task.assigned_employee.name}")
+            employee_picker.set_selection(
+                task.assigned_employee.id,
+                f"{task.assigned_employee.id}: {task.assigned_employee.name}")
         
         ttk.Label(dialog, text="Проект:").grid(row=5, column=0, padx=10, pady=10, sticky='w')
-        project_var = tk.StringVar()
-        project_combo = ttk.Combobox(dialog, textvariable=project_var, state="readonly")
-        project_combo['values'] = [f"{p.id}: {p.title}" for p in projects]
-        project_combo.grid(row=5, column=1, padx=10, pady=10)
+        project_picker = LookupPicker(dialog, self.db_manager.lookup_projects,
+                                      self.app.worker, width=37)
+        project_picker.grid(row=5, column=1, padx=10, pady=10)
         
         if task and task.project_id:
-            for p in projects:
-                if p.id == task.project_id:
-                    project_combo.set(f"{p.id}: {p.title}")
-                    break
+            project_picker.set_selection(task.project_id, f"{task.project_id}: {task.project_title}")
         
         def save_task():
             try:
@@ -145,15 +149,19 @@ class TasksTab:
                 status = status_var.get()
                 hours = float(hours_var.get())
                 
-                emp_id = None
                 emp_obj = None
-                if employee_var.get():
-                    emp_id = int(employee_var.get().split(':')[0])
-                    emp_obj = next((e for e in employees if e.id == emp_id), None)
+                emp_id = employee_picker.get_id()
+                if employee_picker.get() and emp_id is None:
+                    messagebox.showerror("Ошибка", "Выберите сотрудника из списка")
+                    return
+                if emp_id is not None:
+                    emp_name = employee_picker.get().split(':', 1)[-1].strip()
+                    emp_obj = EmployeeRef(emp_id, emp_name, self.db_manager.get_employee_by_id)
                 
-                proj_id = None
-                if project_var.get():
-                    proj_id = int(project_var.get().split(':')[0])
+                proj_id = project_picker.get_id()
+                if project_picker.get() and proj_id is None:
+                    messagebox.showerror("Ошибка", "Выберите проект из списка")
+                    return
                 
                 if task:
                     task.title = title_val
@@ -163,20 +171,22 @@ class TasksTab:
                     if emp_obj:
                         task.assigned_employee = emp_obj
                     task.project_id = proj_id
-                    self.db_manager.update_task(task)
+                    write = lambda: self.db_manager.update_task(task)
                 else:
                     new_task = Task(title_val, description, status, 
                                    hours_required=hours)
                     if emp_obj:
                         new_task.assigned_employee = emp_obj
                     new_task.project_id = proj_id
-                    self.db_manager.add_task(new_task)
+                    write = lambda: self.db_manager.add_task(new_task)
                 
-                self.load_data()
-                self.app.projects_tab.load_data()
-                self.app.employees_tab.load_data()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Задача сохранена")
+                def on_saved(result):
+                    self.app.events.publish('tasks', 'update' if task else 'insert',
+                                            task.id if task else None)
+                    dialog.destroy()
+                    messagebox.showinfo("Успех", "Задача сохранена")
+                
+                self.app.worker.submit(write, on_saved, self.app.show_db_error)
                 
             except ValueError:
                 messagebox.showerror("Ошибка", "Некорректные числовые значения")
@@ -192,14 +202,14 @@ class TasksTab:
             return
         
         if messagebox.askyesno("Подтверждение", "Удалить выбранную задачу?"):
-            item = self.tree.item(selection[0])
-            task_id = item['values'][0]
+            task_id = selection[0]
+            
+            def on_deleted(result):
+                self.app.events.publish('tasks', 'delete', task_id)
+                messagebox.showinfo("Удалено", "Задача удалена")
             
-            self.db_manager.delete_task(task_id)
-            self.load_data()
-            self.app.projects_tab.load_data()
-            self.app.employees_tab.load_data()
-            messagebox.showinfo("Удалено", "Задача удалена")
+            self.app.worker.submit(lambda: self.db_manager.delete_task(task_id),
+                                   on_deleted, self.app.show_db_error)
     
     def mark_complete(self):
         """Отметить задачу как выполненную"""
@@ -208,39 +218,52 @@ class TasksTab:
             messagebox.showwarning("Предупреждение", "Выберите задачу для отметки как выполненную")
             return
         
-        item = self.tree.item(selection[0])
-        task_id = item['values'][0]
+        task_id = selection[0]
         
-        employee_id, hours = self.db_manager.mark_task_complete(task_id)
+        def write():
+            employee_id, hours = self.db_manager.mark_task_complete(task_id)
+            if employee_id:
+                self.db_manager.update_employee_hours(employee_id)
+            return employee_id, hours
         
-        if employee_id:
-            self.db_manager.update_employee_hours(employee_id)
-            messagebox.showinfo("Выполнено", f"Задача отмечена как выполненная. Сотруднику добавлено {hours} часов.")
-        else:
-            messagebox.showinfo("Выполнено", "Задача отмечена как выполненная.")
+        def on_completed(result):
+            employee_id, hours = result
+            if employee_id:
+                messagebox.showinfo("Выполнено", f"Задача отмечена как выполненная. Сотруднику добавлено {hours} часов.")
+            else:
+                messagebox.showinfo("Выполнено", "Задача отмечена как выполненная.")
+            
+            self.app.events.publish('tasks', 'update', task_id)
+            if employee_id:
+                self.app.events.publish('employees', 'update', employee_id)
         
-        self.load_data()
-        self.app.projects_tab.load_data()
-        self.app.employees_tab.load_data()
+        self.app.worker.submit(write, on_completed, self.app.show_db_error)
     
     def export_to_csv(self):
-        """Экспорт задач в CSV"""
-        tasks = self.db_manager.get_all_tasks()
-        data = []
-        for task in tasks:
-            emp_name = task.assigned_employee.name if task.assigned_employee else "Не назначен"
-            project_title = self.db_manager.get_project_title(task.project_id)
-            
-            data.append({
-                'ID': task.id,
-                'Название': task.title,
-                'Описание': task.description,
-                'Статус': task.status,
-                'Требуется часов': task.hours_required,
-                'Сотрудник': emp_name,
-                'Проект': project_title
-            })
-        
-        df = pd.DataFrame(data)
-        filename = export_to_csv(df, "tasks")
-        messagebox.showinfo("Экспорт", f"Данные экспортированы в {filename}")
\ No newline at end of file
+        """Экспорт задач в CSV в фоне (COPY в отдельном подключении к БД)"""
+        self.app.exports.start("tasks")
+    
+    def export_columnar(self, file_format):
+        """Экспорт задач в Parquet/Feather с типизированными колонками в фоне"""
+        self.app.exports.start("tasks", file_format)
+    
+    def import_from_csv(self):
+        """Импорт задач из CSV одной транзакцией (в фоновом потоке)"""
+        filepath = filedialog.askopenfilename(
+            title="Импорт задач из CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not filepath:
+            return
+        
+        def on_imported(result):
+            self.app.events.publish('tasks', 'import')
+            messagebox.showinfo("Импорт", "\n".join(format_import_result(result)))
+        
+        def on_error(error):
+            messagebox.showerror("Ошибка", f"Не удалось импортировать данные: {error}")
+        
+        self.app.worker.submit(
+            lambda: CsvImporter(self.app.db_connection).import_file('tasks', filepath),
+            on_imported, on_error
+        )
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Обновление Treeview по ключу вместо полной перерисовки
+"""
+
+def diff_rows(old_rows, new_rows):
+    """Сравнить два словаря {id: values}: добавленные, измененные и удаленные id"""
+    inserted = [row_id for row_id in new_rows if row_id not in old_rows]
+    updated = [row_id for row_id, values in new_rows.items()
+               if row_id in old_rows and old_rows[row_id] != values]
+    removed = [row_id for row_id in old_rows if row_id not in new_rows]
+    return inserted, updated, removed
+
+
+class TreeReconciler:
+    """Приводит элементы Treeview к списку строк, затрагивая только изменения.
+
+    Элементы идентифицируются по id сущности (iid = str(id)). Удаленные строки
+    удаляются, новые вставляются на свою позицию, у измененных обновляются
+    только отличающиеся ячейки; выделение и прокрутка Tk не сбрасываются.
+    """
+
+    def __init__(self, tree, parent=''):
+        self.tree = tree
+        self.parent = parent
+        self._rendered = {}
+
+    def apply(self, rows):
+        """rows - список (id, values) в порядке отображения; возвращает (inserted, updated, removed)"""
+        new_rows = {str(row_id): tuple(values) for row_id, values in rows}
+        new_ids = list(new_rows)
+        inserted, updated, removed = diff_rows(self._rendered, new_rows)
+
+        if removed:
+            self.tree.delete(*removed)
+
+        existing = [iid for iid in self.tree.get_children(self.parent) if iid in new_rows]
+        existing_set = set(existing)
+        target = [iid for iid in new_ids if iid in existing_set]
+        reorder = existing != target
+
+        columns = self.tree['columns']
+        for index, iid in enumerate(new_ids):
+            values = new_rows[iid]
+            if iid in existing_set:
+                old_values = self._rendered[iid]
+                if old_values != values:
+                    for column, old_value, value in zip(columns, old_values, values):
+                        if old_value != value:
+                            self.tree.set(iid, column, value)
+                if reorder:
+                    self.tree.move(iid, self.parent, index)
+            else:
+                self.tree.insert(self.parent, index, iid=iid, values=values)
+
+        self._rendered = new_rows
+        return inserted, updated, removed
+
+    def clear(self):
+        """Удалить все отрисованные строки"""
+        if self._rendered:
+            self.tree.delete(*self._rendered)
+        self._rendered = {}
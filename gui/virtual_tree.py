@@ -0,0 +1,356 @@
+"""
+Виртуализированная таблица для больших наборов строк
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from gui.tree_sync import TreeReconciler, diff_rows
+
+def _nulls_last(value):
+    return (value is None, value)
+
+
+class RowStore:
+    """Строки таблицы в памяти: порядок отображения и индекс по id.
+
+    Для сортировки по колонкам можно передать типизированные ключи
+    (числа, строки в нижнем регистре), рассчитанные один раз при загрузке,
+    чтобы не разбирать отформатированные значения при каждой сортировке.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self._keys = {}
+        self._order = []
+        self._positions = None
+        self._sort_key = None
+        self._sort_reverse = False
+        self._filter = None
+
+    def __len__(self):
+        """Количество отображаемых (прошедших фильтр) строк"""
+        return len(self._order)
+
+    def __contains__(self, row_id):
+        return row_id in self._rows
+
+    def set_rows(self, rows, keys=None):
+        """Заменить все строки; rows - итерируемое из пар (id, values),
+        keys - словарь {id: ключи сортировки по колонкам}.
+
+        Возвращает id добавленных, измененных и удаленных строк.
+        """
+        old_rows = self._rows
+        self._rows = dict(rows)
+        self._keys = keys or {}
+        self._rebuild()
+        return diff_rows(old_rows, self._rows)
+
+    def get(self, row_id):
+        return self._rows.get(row_id)
+
+    def ids(self):
+        return list(self._order)
+
+    def window(self, start, count):
+        """Строки [start, start + count) в порядке отображения"""
+        return [(row_id, self._rows[row_id]) for row_id in self._order[start:start + count]]
+
+    def index_of(self, row_id):
+        """Позиция строки в порядке отображения (или None)"""
+        if self._positions is None:
+            self._positions = {row_id: index for index, row_id in enumerate(self._order)}
+        return self._positions.get(row_id)
+
+    def is_visible(self, row_id):
+        """Строка есть и проходит фильтр"""
+        return self.index_of(row_id) is not None
+
+    def sort(self, key=None, reverse=False):
+        """Упорядочить строки; key(row_id, values) -> ключ сортировки, None - исходный порядок"""
+        self._sort_key = key
+        self._sort_reverse = reverse
+        self._rebuild()
+
+    def sort_column(self, index, reverse=False):
+        """Упорядочить по колонке, используя предрассчитанные ключи"""
+        def key(row_id, values):
+            return _nulls_last(self._keys.get(row_id, values)[index])
+        self.sort(key, reverse)
+
+    def set_filter(self, predicate=None):
+        """Оставить строки, для которых predicate(row_id, values) истинно"""
+        self._filter = predicate
+        self._rebuild()
+
+    def filter_columns(self, filters):
+        """Фильтр по подстроке без учета регистра: {индекс колонки: текст}"""
+        filters = [(index, text.lower()) for index, text in filters.items() if text]
+        if not filters:
+            self.set_filter(None)
+            return
+
+        def predicate(row_id, values):
+            return all(text in str(values[index]).lower() for index, text in filters)
+        self.set_filter(predicate)
+
+    def _rebuild(self):
+        """Пересчитать порядок отображения с учетом фильтра и сортировки"""
+        if self._filter is None:
+            order = list(self._rows)
+        else:
+            predicate = self._filter
+            order = [row_id for row_id, values in self._rows.items() if predicate(row_id, values)]
+        if self._sort_key is not None:
+            key = self._sort_key
+            rows = self._rows
+            order.sort(key=lambda row_id: key(row_id, rows[row_id]), reverse=self._sort_reverse)
+        self._order = order
+        self._positions = None
+
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview, в котором элементами Tk являются только видимые строки.
+
+    Данные хранятся в RowStore, при прокрутке окно строк перерисовывается.
+    Идентификатор элемента Tk (iid) равен id строки, поэтому выделение и
+    позиция прокрутки сохраняются по id при сортировке и обновлении данных.
+    sortable - сортировка щелчком по заголовку, filterable - строка фильтров.
+    """
+
+    FILTER_DELAY = 150  # мс
+
+    def __init__(self, parent, columns, sortable=False, filterable=False, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.columns = tuple(columns)
+        self.store = RowStore()
+        self.offset = 0
+        self.visible_count = 1
+        self._selected = []
+        self._rendering = False
+        self._titles = {}
+        self._sort_column = None
+        self._sort_reverse = False
+        self._filters = {}
+        self._filter_after = None
+        self._filter_labels = {}
+        self.sortable = sortable
+        self.filterable = filterable
+
+        if filterable:
+            self._create_filters()
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', selectmode='browse')
+        self.reconciler = TreeReconciler(self.tree)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_rows(3))
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._move_selection(-self.visible_count))
+        self.tree.bind('<Next>', lambda e: self._move_selection(self.visible_count))
+
+    # Настройка колонок
+    def heading(self, column, **kwargs):
+        if 'text' in kwargs:
+            self._titles[column] = kwargs['text']
+            if self.sortable:
+                kwargs.setdefault('command', lambda: self.sort_by(column))
+            if self.filterable:
+                self._filter_labels[column].config(text=kwargs['text'])
+        return self.tree.heading(column, **kwargs)
+
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+
+    # Данные и выделение
+    def set_rows(self, rows, keys=None):
+        """Заменить строки, сохранив выделение и верхнюю видимую строку по id.
+
+        keys - словарь {id: ключи сортировки по колонкам}.
+        Возвращает id добавленных, измененных и удаленных строк.
+        """
+        top_id = self._top_id()
+        changes = self.store.set_rows(rows, keys)
+        self._drop_hidden_selection()
+        self._restore_top(top_id)
+        return changes
+
+    def sort(self, key=None, reverse=False):
+        """Отсортировать строки без обращения к БД"""
+        self.store.sort(key, reverse)
+        self._show_selection()
+
+    def sort_by(self, column):
+        """Сортировка по колонке; повторный щелчок меняет направление"""
+        if self._sort_column == column:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            if self._sort_column is not None:
+                previous = self._sort_column
+                self.tree.heading(previous, text=self._titles.get(previous, previous))
+            self._sort_column = column
+            self._sort_reverse = False
+        arrow = " ▼" if self._sort_reverse else " ▲"
+        self.tree.heading(column, text=self._titles.get(column, column) + arrow)
+        self.store.sort_column(self.columns.index(column), self._sort_reverse)
+        self._show_selection()
+
+    def set_filter(self, column, text):
+        """Фильтр по подстроке в колонке (пустой текст снимает фильтр)"""
+        self._filters[self.columns.index(column)] = text.strip()
+        self._apply_filters()
+
+    def _apply_filters(self):
+        self._filter_after = None
+        self.store.filter_columns(self._filters)
+        self._drop_hidden_selection()
+        self.offset = 0
+        self._show_selection()
+
+    def _show_selection(self):
+        if self._selected:
+            self.see(self._selected[0])
+        else:
+            self.render()
+
+    def _drop_hidden_selection(self):
+        self._selected = [row_id for row_id in self._selected if self.store.is_visible(row_id)]
+
+    def _create_filters(self):
+        """Строка полей фильтра, по одному на колонку"""
+        frame = ttk.Frame(self)
+        frame.pack(side='top', fill='x', pady=(0, 3))
+        for column in self.columns:
+            label = ttk.Label(frame, text=column)
+            label.pack(side='left', padx=(5, 2))
+            variable = tk.StringVar()
+            entry = ttk.Entry(frame, textvariable=variable, width=10)
+            entry.pack(side='left')
+            variable.trace_add('write', lambda *args, c=column, v=variable: self._on_filter_typed(c, v))
+            self._filter_labels[column] = label
+
+    def _on_filter_typed(self, column, variable):
+        # Фильтр применяется после паузы во вводе
+        self._filters[self.columns.index(column)] = variable.get().strip()
+        if self._filter_after:
+            self.after_cancel(self._filter_after)
+        self._filter_after = self.after(self.FILTER_DELAY, self._apply_filters)
+
+    def selection(self):
+        """Id выделенных строк"""
+        return list(self._selected)
+
+    def selection_set(self, row_ids):
+        self._selected = [row_id for row_id in row_ids if row_id in self.store]
+        self.render()
+
+    def item_values(self, row_id):
+        return self.store.get(row_id)
+
+    def see(self, row_id):
+        """Прокрутить так, чтобы строка была видна"""
+        index = self.store.index_of(row_id)
+        if index is not None:
+            if index < self.offset:
+                self.offset = index
+            elif index >= self.offset + self.visible_count:
+                self.offset = index - self.visible_count + 1
+        self.render()
+
+    # Отрисовка видимого окна
+    def render(self):
+        total = len(self.store)
+        self.offset = max(0, min(self.offset, total - self.visible_count))
+        rows = self.store.window(self.offset, self.visible_count)
+
+        self._rendering = True
+        try:
+            # Tk затрагивает только появившиеся, исчезнувшие и измененные строки
+            self.reconciler.apply(rows)
+            visible = {str(row_id) for row_id, _ in rows}
+            selected = [str(row_id) for row_id in self._selected if str(row_id) in visible]
+            if list(self.tree.selection()) != selected:
+                self.tree.selection_set(selected)
+        finally:
+            self._rendering = False
+
+        if total:
+            self.scrollbar.set(self.offset / total,
+                               min(1.0, (self.offset + self.visible_count) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _top_id(self):
+        rows = self.store.window(self.offset, 1)
+        return rows[0][0] if rows else None
+
+    def _restore_top(self, top_id):
+        index = self.store.index_of(top_id) if top_id is not None else None
+        if index is not None:
+            self.offset = index
+        self.render()
+
+    def _row_height(self):
+        height = ttk.Style().lookup('Treeview', 'rowheight')
+        try:
+            return int(height) or 20
+        except (TypeError, ValueError):
+            return 20
+
+    def _on_resize(self, event):
+        row_height = self._row_height()
+        # Одна строка под заголовки колонок
+        count = max(1, event.height // row_height - 1)
+        if count != self.visible_count:
+            self.visible_count = count
+            self.render()
+
+    def _on_select(self, event):
+        if self._rendering:
+            return
+        visible = {str(row_id): row_id for row_id, _ in
+                   self.store.window(self.offset, self.visible_count)}
+        selected = [visible[iid] for iid in self.tree.selection() if iid in visible]
+        hidden = [row_id for row_id in self._selected if str(row_id) not in visible]
+        # Выделение строк за пределами окна не сбрасывается при прокрутке
+        if str(self.tree.cget('selectmode')) == 'browse':
+            self._selected = selected or hidden
+        else:
+            self._selected = hidden + selected
+
+    def _on_scrollbar(self, *args):
+        total = len(self.store)
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible_count
+            self.offset += step
+        self.render()
+
+    def _on_mousewheel(self, event):
+        self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _scroll_rows(self, count):
+        self.offset += count
+        self.render()
+
+    def _move_selection(self, step):
+        if not len(self.store):
+            return 'break'
+        index = self.store.index_of(self._selected[0]) if self._selected else None
+        index = 0 if index is None else max(0, min(len(self.store) - 1, index + step))
+        row_id = self.store.window(index, 1)[0][0]
+        self._selected = [row_id]
+        self.see(row_id)
+        self.tree.focus(str(row_id))
+        return 'break'
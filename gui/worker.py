@@ -0,0 +1,151 @@
+"""
+Фоновое выполнение операций с БД
+"""
+
+import queue
+import threading
+
+class BackgroundWorker:
+    """Выполняет операции с БД вне потока Tk.
+
+    Все задания выполняются одним рабочим потоком в порядке отправки,
+    поэтому последовательные записи не переупорядочиваются, а обновление,
+    отправленное после записи, видит ее результат. Результаты передаются
+    в главный поток через root.after. Задание с ключом (key) отменяет
+    еще не выполненные или не доставленные задания с тем же ключом.
+    """
+
+    POLL_INTERVAL = 30  # мс
+
+    def __init__(self, root, name="db-worker"):
+        self.root = root
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._generations = {}
+        self._key_jobs = {}  # Недоставленные задания по ключу
+        self._released = set()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._polling = False
+        self._busy_listeners = []
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def add_busy_listener(self, callback):
+        """Подписаться на изменение состояния занятости: callback(busy)"""
+        self._busy_listeners.append(callback)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def submit(self, func, on_success=None, on_error=None, key=None):
+        """Поставить func в очередь; колбэки вызываются в главном потоке"""
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            if key is not None:
+                self._generations[key] = generation
+                self._key_jobs[key] = self._key_jobs.get(key, 0) + 1
+                self._released.discard(key)
+        self._jobs.put((func, on_success, on_error, key, generation))
+        self._pending += 1
+        if self._pending == 1:
+            self._notify_busy(True)
+        self._schedule_poll()
+
+    def cancel(self, key):
+        """Отменить все ожидающие задания с ключом key"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def release(self, key):
+        """Отменить ожидающие задания с ключом key и забыть ключ.
+
+        Для ключей, которые больше не будут использоваться (например,
+        ключ уничтоженного виджета). Поколение ключа не сбрасывается, пока
+        есть недоставленные задания с ним: иначе новое задание с тем же
+        ключом получило бы поколение устаревшего и его результат был бы
+        доставлен. Ключ удаляется после доставки последнего такого задания.
+        """
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            if self._key_jobs.get(key):
+                self._released.add(key)
+            else:
+                self._generations.pop(key, None)
+
+    def shutdown(self):
+        """Остановить рабочий поток после выполнения очереди"""
+        self._jobs.put(None)
+
+    def _is_current(self, key, generation):
+        if key is None:
+            return True
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, on_success, on_error, key, generation = job
+            if not self._is_current(key, generation):
+                self._results.put((None, None, key, generation, None, None))
+                continue
+            try:
+                result = func()
+                self._results.put((on_success, on_error, key, generation, result, None))
+            except Exception as e:
+                self._results.put((on_success, on_error, key, generation, None, e))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        """Доставить готовые результаты в главном потоке"""
+        self._polling = False
+        while True:
+            try:
+                on_success, on_error, key, generation, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._job_delivered(key)
+            if not self._is_current(key, generation):
+                continue
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Ошибка фоновой операции: {error}")
+                elif on_success:
+                    on_success(result)
+            except Exception as e:
+                print(f"Ошибка обработки результата: {e}")
+
+        if self._pending > 0:
+            self._schedule_poll()
+        else:
+            self._notify_busy(False)
+
+    def _job_delivered(self, key):
+        """Учесть доставленное задание и забыть освобожденный ключ без заданий"""
+        if key is None:
+            return
+        with self._lock:
+            remaining = self._key_jobs[key] - 1
+            if remaining:
+                self._key_jobs[key] = remaining
+                return
+            del self._key_jobs[key]
+            if key in self._released:
+                self._released.discard(key)
+                self._generations.pop(key, None)
+
+    def _notify_busy(self, busy):
+        for callback in self._busy_listeners:
+            callback(busy)
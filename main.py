@@ -1,8 +1,21 @@
+import time
+
+# Отсчет времени запуска до импорта модулей приложения
+LAUNCH_TIME = time.perf_counter()
+
 import tkinter as tk
 
+import config
 # Используем абсолютный импорт
 from gui.main_window import TimeTrackingApp
 
+def report_startup_time():
+    """Сравнить время до показа окна с бюджетом запуска"""
+    elapsed = time.perf_counter() - LAUNCH_TIME
+    if elapsed > config.STARTUP_TIME_BUDGET:
+        print(f"Запуск занял {elapsed:.2f} с (бюджет {config.STARTUP_TIME_BUDGET:.2f} с). "
+              f"Профиль импорта: python benchmarks/bench_startup.py")
+
 def main():
     """Основная функция запуска приложения"""
     root = tk.Tk()
@@ -16,7 +29,9 @@ def main():
     y = (root.winfo_screenheight() // 2) - (height // 2)
     root.geometry(f'{width}x{height}+{x}+{y}')
     
+    # Окно показывается при первом простое главного цикла
+    root.after_idle(report_startup_time)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,8 +2,9 @@
 Модели данных приложения
 """
 
-from .employee import Employee
+from .employee import Employee, EmployeeRef
 from .task import Task
-from .project import Project
+from .project import Project, LazyTaskList
+from .task_table import TaskTable
 
-__all__ = ['Employee', 'Task', 'Project']
\ No newline at end of file
+__all__ = ['Employee', 'EmployeeRef', 'Task', 'Project', 'LazyTaskList', 'TaskTable']
\ No newline at end of file
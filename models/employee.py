@@ -2,7 +2,11 @@
 Модель сотрудника
 """
 
+import config
+
 class Employee:
+    __slots__ = ('id', 'name', 'position', 'salary', 'hours_worked')
+    
     def __init__(self, name, position, salary, hours_worked=0, emp_id=None):
         self.id = emp_id
         self.name = name
@@ -11,7 +15,7 @@ class Employee:
         self.hours_worked = float(hours_worked)
     
     def calculate_pay(self):
-        hourly_rate = self.salary / 160
+        hourly_rate = self.salary / config.PAYROLL_NORM_HOURS
         return hourly_rate * self.hours_worked
     
     def update_hours_worked(self, db_connection):
@@ -31,4 +35,58 @@ class Employee:
             'position': self.position,
             'salary': self.salary,
             'hours_worked': self.hours_worked
-        }
\ No newline at end of file
+        }
+
+
+# Запись еще не загружалась (None - загружалась, но не найдена)
+_NOT_LOADED = object()
+
+class EmployeeRef:
+    """Общая ссылка на сотрудника (один объект на id), полная запись загружается по требованию"""
+    __slots__ = ('id', '_name', '_loader', '_employee')
+    
+    def __init__(self, emp_id, name=None, loader=None):
+        self.id = emp_id
+        self._name = name
+        self._loader = loader
+        self._employee = _NOT_LOADED
+    
+    def resolve(self):
+        """Получить полную запись сотрудника (загружается один раз, в том числе отсутствующая)"""
+        if self._employee is _NOT_LOADED:
+            if self._loader is None:
+                return None
+            self._employee = self._loader(self.id)
+        return self._employee
+    
+    @property
+    def name(self):
+        if self._name is None:
+            employee = self.resolve()
+            self._name = employee.name if employee else ""
+        return self._name
+    
+    @property
+    def position(self):
+        employee = self.resolve()
+        return employee.position if employee else ""
+    
+    @property
+    def salary(self):
+        employee = self.resolve()
+        return employee.salary if employee else 0.0
+    
+    @property
+    def hours_worked(self):
+        employee = self.resolve()
+        return employee.hours_worked if employee else 0.0
+    
+    def calculate_pay(self):
+        employee = self.resolve()
+        return employee.calculate_pay() if employee else 0.0
+    
+    def to_dict(self):
+        employee = self.resolve()
+        if employee:
+            return employee.to_dict()
+        return {'id': self.id, 'name': self.name}
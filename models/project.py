@@ -2,26 +2,84 @@
 Модель проекта
 """
 
+class LazyTaskList:
+    """Задачи проекта, загружаемые при первом обращении.
+
+    До загрузки количество задач и суммы часов берутся из сводки
+    (summary), полученной вместе со списком проектов.
+    """
+    __slots__ = ('_loader', '_tasks', 'summary')
+    
+    def __init__(self, loader, summary=None):
+        self._loader = loader
+        self._tasks = None
+        self.summary = summary
+    
+    @property
+    def loaded(self):
+        return self._tasks is not None
+    
+    def _load(self):
+        if self._tasks is None:
+            self._tasks = list(self._loader())
+        return self._tasks
+    
+    def __iter__(self):
+        return iter(self._load())
+    
+    def __len__(self):
+        if self._tasks is None and self.summary is not None:
+            return self.summary['total_tasks']
+        return len(self._load())
+    
+    def __getitem__(self, index):
+        return self._load()[index]
+    
+    def __contains__(self, task):
+        return task in self._load()
+    
+    def append(self, task):
+        self._load().append(task)
+
+
 class Project:
+    __slots__ = ('id', 'title', 'tasks')
+    
     def __init__(self, title, tasks=None, project_id=None):
         self.id = project_id
         self.title = title
-        self.tasks = tasks or []
+        self.tasks = tasks if tasks is not None else []
     
     def add_task(self, task):
         self.tasks.append(task)
         task.project_id = self.id
     
+    def task_totals(self):
+        """Всего задач, завершено задач, всего часов, выполнено часов"""
+        if isinstance(self.tasks, LazyTaskList) and not self.tasks.loaded and self.tasks.summary:
+            summary = self.tasks.summary
+            return (summary['total_tasks'], summary['completed_tasks'],
+                    summary['total_hours'], summary['completed_hours'])
+        
+        total_tasks = completed_tasks = 0
+        total_hours = completed_hours = 0.0
+        for task in self.tasks:
+            total_tasks += 1
+            total_hours += task.hours_required
+            if task.status == "Завершено":
+                completed_tasks += 1
+                completed_hours += task.hours_required
+        return total_tasks, completed_tasks, total_hours, completed_hours
+    
     def project_progress(self):
-        if not self.tasks:
+        total_tasks, completed_tasks, _, _ = self.task_totals()
+        if not total_tasks:
             return 0
-        completed = sum(1 for task in self.tasks if task.status == "Завершено")
-        return (completed / len(self.tasks)) * 100
+        return (completed_tasks / total_tasks) * 100
     
     def to_dict(self):
-        total_tasks = len(self.tasks)
-        completed_tasks = sum(1 for task in self.tasks if task.status == "Завершено")
-        progress = self.project_progress()
+        total_tasks, completed_tasks, _, _ = self.task_totals()
+        progress = (completed_tasks / total_tasks) * 100 if total_tasks else 0
         
         return {
             'id': self.id,
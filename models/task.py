@@ -3,6 +3,9 @@
 """
 
 class Task:
+    __slots__ = ('id', 'title', 'description', 'status', 'assigned_employee',
+                 'hours_required', 'project_id', 'project_title')
+    
     def __init__(self, title, description, status="В процессе", assigned_employee=None,
                  hours_required=0, project_id=None, task_id=None):
         self.id = task_id
@@ -12,6 +15,7 @@ class Task:
         self.assigned_employee = assigned_employee
         self.hours_required = float(hours_required) if hours_required else 0.0
         self.project_id = project_id
+        self.project_title = None  # Заполняется при загрузке из БД
     
     def mark_complete(self):
         old_status = self.status
@@ -0,0 +1,122 @@
+"""
+Колоночное представление задач
+"""
+
+from array import array
+
+from .task import Task
+
+class TaskTable:
+    """Компактное колоночное хранилище задач для массовой обработки.
+
+    Идентификаторы, часы и коды статусов хранятся в типизированных
+    массивах, повторяющиеся строки (статусы, имена сотрудников,
+    названия проектов) интернируются и хранятся в одном экземпляре.
+    """
+
+    __slots__ = ('ids', 'hours', 'status_codes', 'employee_ids', 'project_ids',
+                 'titles', 'descriptions', 'employee_names', 'project_titles',
+                 'statuses', '_status_index', '_strings')
+
+    # Отсутствующий id (NULL) хранится в массивах как 0
+    NO_ID = 0
+
+    def __init__(self):
+        self.ids = array('q')
+        self.hours = array('d')
+        self.status_codes = array('B')
+        self.employee_ids = array('q')
+        self.project_ids = array('q')
+        self.titles = []
+        self.descriptions = []
+        self.employee_names = []
+        self.project_titles = []
+        self.statuses = []
+        self._status_index = {}
+        self._strings = {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Создать таблицу из строк запроса задач.
+
+        Порядок полей: id, title, description, status, hours_required,
+        employee_id, project_id, employee_name, project_title.
+        """
+        table = cls()
+        for row in rows or []:
+            table.append(*row)
+        return table
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def _status_code(self, status):
+        code = self._status_index.get(status)
+        if code is None:
+            code = len(self.statuses)
+            self.statuses.append(status)
+            self._status_index[status] = code
+        return code
+
+    def append(self, task_id, title, description, status, hours_required,
+               employee_id=None, project_id=None, employee_name=None,
+               project_title=None):
+        """Добавить задачу в таблицу"""
+        self.ids.append(task_id or self.NO_ID)
+        self.hours.append(float(hours_required) if hours_required else 0.0)
+        self.status_codes.append(self._status_code(status))
+        self.employee_ids.append(employee_id or self.NO_ID)
+        self.project_ids.append(project_id or self.NO_ID)
+        self.titles.append(title)
+        self.descriptions.append(description)
+        self.employee_names.append(self._intern(employee_name))
+        self.project_titles.append(self._intern(project_title))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def status(self, index):
+        return self.statuses[self.status_codes[index]]
+
+    def employee_id(self, index):
+        return self.employee_ids[index] or None
+
+    def project_id(self, index):
+        return self.project_ids[index] or None
+
+    def row(self, index):
+        """Строка таблицы в том же порядке полей, что и в from_rows"""
+        return (
+            self.ids[index], self.titles[index], self.descriptions[index],
+            self.status(index), self.hours[index], self.employee_id(index),
+            self.project_id(index), self.employee_names[index],
+            self.project_titles[index]
+        )
+
+    def iter_rows(self):
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def to_task(self, index):
+        """Собрать объект Task для одной строки"""
+        return Task(
+            self.titles[index], self.descriptions[index], self.status(index),
+            hours_required=self.hours[index], project_id=self.project_id(index),
+            task_id=self.ids[index]
+        )
+
+    def to_columns(self):
+        """Словарь колонок для построения DataFrame или экспорта"""
+        return {
+            'id': list(self.ids),
+            'title': self.titles,
+            'description': self.descriptions,
+            'status': [self.statuses[code] for code in self.status_codes],
+            'hours_required': list(self.hours),
+            'employee_id': [value or None for value in self.employee_ids],
+            'project_id': [value or None for value in self.project_ids],
+            'employee_name': self.employee_names,
+            'project_title': self.project_titles
+        }
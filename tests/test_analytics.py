@@ -0,0 +1,93 @@
+"""
+Тесты для векторизованной аналитики
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import Employee, Task, Project, TaskTable
+from utils.analytics import TaskAnalytics
+
+class TestTaskAnalytics(unittest.TestCase):
+    """Тесты для класса TaskAnalytics"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.task_rows = [
+            (1, 'Задача 1', 'Описание 1', 'Завершено', 20, 1, 1, 'Иван Иванов', 'Проект 1'),
+            (2, 'Задача 2', 'Описание 2', 'В процессе', 30, 1, 1, 'Иван Иванов', 'Проект 1'),
+            (3, 'Задача 3', 'Описание 3', 'В процессе', 10, 2, 1, 'Петр Петров', 'Проект 1'),
+            (4, 'Задача 4', 'Описание 4', 'Завершено', 15, None, 2, None, 'Проект 2')
+        ]
+        self.employee_rows = [
+            (1, 'Иван Иванов', 'Разработчик', 100000),
+            (2, 'Петр Петров', 'Менеджер', 80000),
+            (3, 'Анна Сидорова', 'Дизайнер', 90000)
+        ]
+        self.project_rows = [(1, 'Проект 1'), (2, 'Проект 2'), (3, 'Проект 3')]
+        self.analytics = TaskAnalytics.from_table(
+            TaskTable.from_rows(self.task_rows), self.employee_rows, self.project_rows
+        )
+    
+    def test_project_summary_matches_model(self):
+        """Тест: сводка по проектам совпадает с расчетом модели Project"""
+        summary = self.analytics.project_summary()
+        
+        project = Project('Проект 1', project_id=1)
+        for row in self.task_rows[:3]:
+            project.add_task(Task(row[1], row[2], row[3], hours_required=row[4]))
+        project_dict = project.to_dict()
+        
+        self.assertEqual(summary.loc[1, 'total_tasks'], project_dict['total_tasks'])
+        self.assertEqual(summary.loc[1, 'completed_tasks'], project_dict['completed_tasks'])
+        self.assertEqual(f"{summary.loc[1, 'progress']:.1f}%", project_dict['progress'])
+        self.assertEqual(summary.loc[1, 'total_hours'], 60)
+        self.assertEqual(summary.loc[1, 'completed_hours'], 20)
+    
+    def test_project_without_tasks(self):
+        """Тест: проект без задач присутствует в сводке с нулями"""
+        summary = self.analytics.project_summary()
+        self.assertEqual(list(summary.index), [1, 2, 3])
+        self.assertEqual(summary.loc[3, 'total_tasks'], 0)
+        self.assertEqual(summary.loc[3, 'progress'], 0)
+        self.assertEqual(summary.loc[2, 'progress'], 100)
+    
+    def test_employee_summary_matches_model(self):
+        """Тест: часы и заработок совпадают с Employee.calculate_pay"""
+        summary = self.analytics.employee_summary()
+        
+        employee = Employee('Иван Иванов', 'Разработчик', 100000, 20, emp_id=1)
+        self.assertEqual(summary.loc[1, 'hours_worked'], employee.hours_worked)
+        self.assertAlmostEqual(summary.loc[1, 'pay'], employee.calculate_pay())
+        self.assertEqual(summary.loc[1, 'completed_tasks'], 1)
+        
+        self.assertEqual(summary.loc[2, 'hours_worked'], 0)
+        self.assertEqual(summary.loc[3, 'pay'], 0)
+        self.assertEqual(summary.loc[3, 'completed_tasks'], 0)
+    
+    def test_from_db(self):
+        """Тест загрузки данных через DatabaseManager"""
+        db_manager = MagicMock()
+        db_manager.get_task_table.return_value = TaskTable.from_rows(self.task_rows)
+        db_manager.get_employee_rows.return_value = self.employee_rows
+        db_manager.get_project_rows.return_value = self.project_rows
+        
+        analytics = TaskAnalytics.from_db(db_manager)
+        
+        self.assertEqual(len(analytics.tasks), 4)
+        self.assertEqual(len(analytics.employee_summary()), 3)
+    
+    def test_empty(self):
+        """Тест пустых данных"""
+        analytics = TaskAnalytics.from_table(TaskTable(), [], [])
+        self.assertEqual(len(analytics.project_summary()), 0)
+        self.assertEqual(len(analytics.employee_summary()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Тесты пакетной очистки CSV каталога
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.batch import clean_csv_directory, list_csv_files, format_batch_summary
+from utils.cli import main
+
+class TestBatchCleaning(unittest.TestCase):
+    """Тесты clean_csv_directory"""
+
+    def setUp(self):
+        """Каталог с тремя CSV файлами"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.tmp_dir, 'clocks')
+        os.mkdir(self.data_dir)
+        self.manifest = os.path.join(self.tmp_dir, 'manifest.json')
+        self.write('day1.csv', 'name,hours\nИван,8\n,4\n')
+        self.write('day2.csv', 'name,hours\nПетр, \nАнна,6\nОлег,7\n')
+        self.write('day3.csv', 'name,comment\nИван,\n')
+        self.write('notes.txt', 'не CSV')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, text):
+        with open(os.path.join(self.data_dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def clean(self, **kwargs):
+        return clean_csv_directory(self.data_dir, manifest_path=self.manifest, **kwargs)
+
+    def test_combined_summary(self):
+        """Тест: все файлы очищены, статистика сложена по колонкам"""
+        summary = self.clean(workers=2)
+
+        self.assertEqual(summary['total_files'], 3)
+        self.assertEqual(summary['cleaned'], 3)
+        self.assertEqual(summary['total_rows'], 6)
+        self.assertEqual(summary['cleaned_rows'], 3)
+        self.assertEqual(summary['missing_values'], {'name': 1, 'hours': 1, 'comment': 1})
+        self.assertEqual([os.path.basename(entry['path']) for entry in summary['files']],
+                         ['day1.csv', 'day2.csv', 'day3.csv'])
+        with open(os.path.join(self.data_dir, 'day2_cleaned.csv'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'name,hours\nАнна,6\nОлег,7\n')
+        self.assertIn("Файлов: 3 (очищено: 3, без изменений: 0, ошибок: 0)",
+                      format_batch_summary(summary))
+
+    def test_unchanged_files_skipped(self):
+        """Тест: повторный запуск очищает только измененные файлы"""
+        self.clean(workers=1)
+        # Очищенные файлы не считаются исходными при следующем запуске
+        self.assertEqual(len(list_csv_files(self.data_dir)), 3)
+
+        self.write('day1.csv', 'name,hours\nИван,8\nМария,5\n')
+        summary = self.clean(workers=1)
+
+        statuses = {os.path.basename(entry['path']): entry['status'] for entry in summary['files']}
+        self.assertEqual(statuses, {'day1.csv': 'cleaned', 'day2.csv': 'skipped', 'day3.csv': 'skipped'})
+        # Статистика пропущенных файлов берется из манифеста
+        self.assertEqual(summary['total_rows'], 6)
+        self.assertEqual(summary['cleaned_rows'], 4)
+
+        self.assertEqual(self.clean(force=True)['cleaned'], 3)
+
+    def test_removed_output_cleaned_again(self):
+        """Тест: файл очищается снова, если результат удален"""
+        self.clean(workers=1)
+        os.remove(os.path.join(self.data_dir, 'day3_cleaned.csv'))
+
+        summary = self.clean(workers=1)
+
+        self.assertEqual(summary['cleaned'], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, 'day3_cleaned.csv')))
+
+    def test_failed_file(self):
+        """Тест: ошибка в одном файле не останавливает пакет и не попадает в манифест"""
+        self.write('empty.csv', '')
+
+        summary = self.clean(workers=2)
+
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['cleaned'], 3)
+        with open(self.manifest, encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.assertEqual(len(manifest), 3)
+        self.assertNotIn(os.path.abspath(os.path.join(self.data_dir, 'empty.csv')), manifest)
+
+    def test_output_dir(self):
+        """Тест: очищенные файлы записываются в отдельный каталог"""
+        output_dir = os.path.join(self.tmp_dir, 'cleaned')
+
+        self.clean(output_dir=output_dir)
+
+        self.assertEqual(sorted(os.listdir(output_dir)),
+                         ['day1_cleaned.csv', 'day2_cleaned.csv', 'day3_cleaned.csv'])
+
+    def test_cli_batch(self):
+        """Тест команды batch"""
+        out = io.StringIO()
+        with patch('config.CSV_BATCH_MANIFEST', self.manifest), redirect_stdout(out):
+            code = main(['batch', self.data_dir, '--workers', '2'])
+
+        self.assertEqual(code, 0)
+        self.assertIn("Удалено записей: 3", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Тесты для обработки CSV из командной строки
+"""
+
+import unittest
+import sys
+import os
+import io
+import shutil
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cli import main
+
+class TestCli(unittest.TestCase):
+    """Тесты команд utils.cli"""
+    
+    def setUp(self):
+        """Подготовка тестового файла"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'timesheet.csv')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('name,hours\nИван,8\n,4\nПетр, \nАнна,6\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_clean(self):
+        """Тест команды clean"""
+        output_path = os.path.join(self.tmp_dir, 'out.csv')
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = main(['clean', self.path, '-o', output_path, '--workers', '2'])
+        
+        self.assertEqual(code, 0)
+        self.assertIn("Удалено записей: 2", out.getvalue())
+        with open(output_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'name,hours\nИван,8\nАнна,6\n')
+    
+    def test_clean_engine(self):
+        """Тест команды clean с движком pyarrow (без него - движок c)"""
+        output_path = os.path.join(self.tmp_dir, 'out.csv')
+        with redirect_stdout(io.StringIO()):
+            code = main(['clean', self.path, '-o', output_path, '--engine', 'pyarrow'])
+        
+        self.assertEqual(code, 0)
+        with open(output_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'name,hours\nИван,8\nАнна,6\n')
+    
+    def test_clean_missing_file(self):
+        """Тест команды clean для несуществующего файла"""
+        err = io.StringIO()
+        with redirect_stderr(err):
+            code = main(['clean', os.path.join(self.tmp_dir, 'missing.csv')])
+        self.assertEqual(code, 1)
+        self.assertIn("Файл не найден", err.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Тесты экспорта и чтения Parquet/Feather
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import importlib.util
+from collections import namedtuple
+from decimal import Decimal
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from utils.data_processing import clean_csv_file
+from utils.file_operations import (columnar_format, read_columnar, read_columnar_schema,
+                                   write_columnar, cleaned_csv_path)
+
+Column = namedtuple('Column', ['name', 'type_code'])
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow не установлен")
+class TestColumnarFiles(unittest.TestCase):
+    """Тесты колоночных форматов"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.names = ['Иван', '', None, ' ', 'Петр', 'Анна', 'Олег', 'Мария', 'Ольга', 'Нина']
+        self.hours = [8.0, 4.0, None, 6.0, 7.5, 8.0, 1.0, 2.0, 3.0, 4.0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def write_frame(self, name):
+        """Сохранить тестовую таблицу через write_columnar пакетами по 4 строки"""
+        description = [Column('id', 20), Column('name', 25), Column('hours', 1700)]
+        rows = [
+            (row_id, name, None if hours is None else Decimal(str(hours)))
+            for row_id, (name, hours) in enumerate(zip(self.names, self.hours))
+        ]
+        batches = ((description, rows[start:start + 4]) for start in range(0, len(rows), 4))
+        path = self.path(name)
+        self.assertEqual(write_columnar(batches, path), 10)
+        return path
+
+    def test_write_typed_columns(self):
+        """Тест: типы колонок берутся из описания курсора"""
+        for name in ('export.parquet', 'export.feather'):
+            path = self.write_frame(name)
+            schema = read_columnar_schema(path)
+            self.assertEqual([str(field.type) for field in schema], ['int64', 'string', 'double'])
+
+            df = read_columnar(path)
+            self.assertEqual(df['hours'].dtype, np.float64)
+            self.assertEqual(df['hours'].isna().sum(), 1)
+            self.assertEqual(df['name'].tolist()[:2], ['Иван', ''])
+
+    def test_empty_result_keeps_schema(self):
+        """Тест: пустой результат запроса записывает файл со схемой"""
+        path = self.path('empty.parquet')
+        batches = iter([([Column('id', 20), Column('title', 1043)], [])])
+
+        self.assertEqual(write_columnar(batches, path), 0)
+        self.assertEqual(list(read_columnar(path).columns), ['id', 'title'])
+
+    def test_read_selected_columns_in_chunks(self):
+        """Тест: чтение выбранных колонок частями по строкам"""
+        path = self.write_frame('export.feather')
+
+        chunks = list(read_columnar(path, columns=['hours'], chunksize=3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+        self.assertEqual(list(chunks[0].columns), ['hours'])
+        self.assertEqual(chunks[-1].index[0], 9)
+
+    def test_clean_columnar_keeps_format(self):
+        """Тест: очищенный файл сохраняется в том же формате с исходными типами"""
+        for name in ('export.parquet', 'export.feather'):
+            path = self.write_frame(name)
+
+            result = clean_csv_file(path, chunksize=4)
+
+            self.assertEqual(result['output_path'], cleaned_csv_path(path))
+            self.assertEqual(columnar_format(result['output_path']), columnar_format(path))
+            self.assertEqual(result['stats']['missing_values'], {'id': 0, 'name': 3, 'hours': 1})
+            self.assertEqual(result['cleaned_rows'], 7)
+            cleaned = read_columnar(result['output_path'])
+            self.assertEqual(len(cleaned), 7)
+            self.assertEqual(cleaned['id'].dtype, np.int64)
+
+    def test_clean_selected_columns_to_csv(self):
+        """Тест: очистка только выбранных колонок с записью в CSV"""
+        path = self.write_frame('export.parquet')
+        output = self.path('hours.csv')
+
+        result = clean_csv_file(path, output, columns=['id', 'hours'])
+
+        self.assertEqual(result['columns'], ['id', 'hours'])
+        self.assertEqual(result['cleaned_rows'], 9)
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(f.readline(), 'id,hours\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
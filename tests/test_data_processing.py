@@ -5,13 +5,22 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
+import io
+import importlib.util
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
 
 # Добавляем путь к проекту для импорта модулей
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.data_processing import extract_emails, clean_csv_data, get_csv_stats
+from utils.data_processing import (extract_emails, clean_csv_data, get_csv_stats,
+                                   analyze_and_clean, CsvStatsAccumulator, clean_csv_file)
+from utils.file_operations import (read_csv, save_cleaned_csv, split_csv_ranges,
+                                   resolve_csv_engine)
+import config
 
 class TestDataProcessing(unittest.TestCase):
     """Тесты для функций обработки данных"""
@@ -168,5 +177,207 @@ class TestDataProcessing(unittest.TestCase):
         self.assertEqual(stats['missing_values'], {})
 
 
+    
+    def test_analyze_and_clean_matches_regex(self):
+        """Тест: маска пустых значений совпадает с заменой по регулярному выражению"""
+        df = pd.DataFrame({
+            'A': ['x', '', ' \t', None, 'y\n', 'z'],
+            'B': [1, 2, None, 4, 5, 6],
+            'C': pd.Series([1, '', 3.0, ' ', None, 'w'], dtype=object)
+        })
+        expected = df.replace(r'^\s*$', np.nan, regex=True)
+        
+        stats, cleaned = analyze_and_clean(df)
+        
+        self.assertEqual(stats['missing_values'], expected.isna().sum().to_dict())
+        self.assertEqual(stats['total_missing'], int(expected.isna().sum().sum()))
+        self.assertEqual(list(cleaned.index), list(expected.dropna().index))
+        self.assertEqual(list(cleaned['A']), ['x', 'z'])
+    
+    def test_non_string_object_columns(self):
+        """Тест: колонки object без строк (логические значения из CSV) не ломают маску"""
+        df = pd.read_csv(io.StringIO("flag,note\nTrue,a\n,b\nFalse, \n"))
+        df['mixed'] = pd.Series([True, '', None], dtype=object)
+        self.assertEqual(df['flag'].dtype, object)
+        expected = df.replace(r'^\s*$', np.nan, regex=True)
+        
+        stats = get_csv_stats(df)
+        
+        self.assertEqual(stats['missing_values'], expected.isna().sum().to_dict())
+        self.assertEqual(list(clean_csv_data(df).index), list(expected.dropna().index))
+
+
+class TestChunkedCsvCleaning(unittest.TestCase):
+    """Тесты потоковой очистки CSV"""
+    
+    def setUp(self):
+        """Подготовка тестового файла"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'timesheet.csv')
+        lines = ['employee,hours,comment']
+        for i in range(25):
+            hours = '' if i % 4 == 0 else f'{i}.50' if i % 3 else str(i)
+            comment = '   ' if i % 5 == 0 else f'"смена, {i}"'
+            lines.append(f'Сотрудник {i},{hours},{comment}')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def test_chunked_matches_in_memory(self):
+        """Тест: результат по частям совпадает с обработкой файла целиком"""
+        df = read_csv(self.path)
+        expected_stats = get_csv_stats(df)
+        expected_path = save_cleaned_csv(clean_csv_data(df), self.path)
+        with open(expected_path, 'rb') as f:
+            expected = f.read()
+        
+        output_path = os.path.join(self.tmp_dir, 'chunked.csv')
+        result = clean_csv_file(self.path, output_path, chunksize=4)
+        with open(output_path, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+        
+        stats = result['stats']
+        self.assertEqual(stats['total_rows'], expected_stats['total_rows'])
+        self.assertEqual(stats['missing_values'], expected_stats['missing_values'])
+        self.assertEqual(stats['total_missing'], expected_stats['total_missing'])
+        self.assertEqual(result['cleaned_rows'], len(clean_csv_data(df)))
+        self.assertEqual(len(result['preview']), 10)
+    
+    def test_parallel_matches_sequential(self):
+        """Тест: очистка в пуле процессов побайтно совпадает с последовательной"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for i in range(40):
+                f.write(f'Сотрудник {i},{i},"многострочный\nкомментарий, ""{i}"""\n')
+        
+        sequential_path = os.path.join(self.tmp_dir, 'sequential.csv')
+        parallel_path = os.path.join(self.tmp_dir, 'parallel.csv')
+        sequential = clean_csv_file(self.path, sequential_path, chunksize=7)
+        with patch.object(config, 'CSV_RANGE_BYTES', 200):
+            header, ranges = split_csv_ranges(self.path)
+            parallel = clean_csv_file(self.path, parallel_path, workers=3)
+        
+        self.assertGreater(len(ranges), 3)
+        self.assertEqual(header, 'employee,hours,comment\n'.encode('utf-8'))
+        with open(sequential_path, 'rb') as f1, open(parallel_path, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(parallel['stats'], sequential['stats'])
+        self.assertEqual(parallel['cleaned_rows'], sequential['cleaned_rows'])
+        # Временные части удалены
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ['parallel.csv', 'sequential.csv', 'timesheet.csv'])
+    
+    def test_header_only_file(self):
+        """Тест файла без строк данных"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('a,b\n')
+        
+        result = clean_csv_file(self.path, chunksize=2)
+        
+        self.assertEqual(result['cleaned_rows'], 0)
+        self.assertEqual(result['columns'], ['a', 'b'])
+        with open(result['output_path'], encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'a,b\n')
+    
+    def test_stats_accumulator(self):
+        """Тест накопления статистики по частям"""
+        accumulator = CsvStatsAccumulator()
+        accumulator.add(pd.DataFrame({'a': ['1', ' '], 'b': ['x', None]}))
+        accumulator.add(pd.DataFrame({'a': [None], 'b': ['y']}))
+        
+        stats = accumulator.result()
+        self.assertEqual(stats['total_rows'], 3)
+        self.assertEqual(stats['missing_values'], {'a': 2, 'b': 1})
+        self.assertEqual(stats['total_missing'], 3)
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow не установлен")
+class TestArrowCsvEngine(unittest.TestCase):
+    """Тесты чтения CSV движком pyarrow"""
+    
+    def setUp(self):
+        """Файл с пропусками, кавычками и переводами строк в значениях"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'timesheet.csv')
+        values = ['8', '', '  ', 'NA', 'null', '"смена, 1"', '"многострочный\nкомментарий"', 'N/A']
+        lines = ['employee,hours,comment']
+        for i in range(60):
+            lines.append(f'Сотрудник {i},{values[i % len(values)]},{values[i * 3 % len(values)]}')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def clean(self, name, **kwargs):
+        """Очистить файл и вернуть (результат, содержимое выходного файла)"""
+        output_path = os.path.join(self.tmp_dir, name)
+        result = clean_csv_file(self.path, output_path, **kwargs)
+        with open(output_path, 'rb') as f:
+            return result, f.read()
+    
+    def test_arrow_string_dtype(self):
+        """Тест: значения читаются в Arrow-тип string[pyarrow]"""
+        df = read_csv(self.path, engine='pyarrow')
+        expected = read_csv(self.path, engine='c')
+        
+        self.assertEqual(df['hours'].dtype, pd.StringDtype('pyarrow'))
+        self.assertEqual(list(df.columns), list(expected.columns))
+        self.assertTrue(df.isna().equals(expected.isna()))
+    
+    def test_chunks_match_c_engine(self):
+        """Тест: части по строкам с той же нумерацией, что у движка c"""
+        arrow_chunks = list(read_csv(self.path, chunksize=25, engine='pyarrow'))
+        c_chunks = list(read_csv(self.path, chunksize=25, engine='c'))
+        
+        self.assertEqual([len(chunk) for chunk in arrow_chunks], [25, 25, 10])
+        for arrow_chunk, c_chunk in zip(arrow_chunks, c_chunks):
+            self.assertTrue(arrow_chunk.index.equals(c_chunk.index))
+    
+    def test_cleaned_output_matches_c_engine(self):
+        """Тест: очищенный файл и статистика не зависят от движка"""
+        c_result, expected = self.clean('c.csv', chunksize=7, engine='c')
+        arrow_result, chunked = self.clean('arrow.csv', chunksize=7, engine='pyarrow')
+        with patch.object(config, 'CSV_RANGE_BYTES', 300):
+            parallel_result, parallel = self.clean('parallel.csv', workers=2, engine='pyarrow')
+        
+        self.assertEqual(chunked, expected)
+        self.assertEqual(parallel, expected)
+        for result in (arrow_result, parallel_result):
+            self.assertEqual(result['stats']['missing_values'], c_result['stats']['missing_values'])
+            self.assertEqual(result['cleaned_rows'], c_result['cleaned_rows'])
+    
+    def test_fallback_without_pyarrow(self):
+        """Тест: без pyarrow используется движок c"""
+        with patch('importlib.util.find_spec', return_value=None):
+            self.assertEqual(resolve_csv_engine('pyarrow'), 'c')
+            df = read_csv(self.path, engine='pyarrow')
+        self.assertEqual(len(df), 60)
+        self.assertEqual(resolve_csv_engine('pyarrow'), 'pyarrow')
+        with self.assertRaises(ValueError):
+            resolve_csv_engine('python')
+    
+    def test_fallback_for_irregular_rows(self):
+        """Тест: строки с другим числом полей и повторяющиеся колонки читает pandas"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('Сотрудник 60,8\n')
+        self.assertEqual(len(read_csv(self.path, engine='pyarrow')), 61)
+        
+        # Ошибка в одном из следующих блоков: выданные части не повторяются
+        with patch.object(config, 'CSV_ARROW_BLOCK_BYTES', 256):
+            chunks = list(read_csv(self.path, chunksize=10, engine='pyarrow'))
+        expected = list(read_csv(self.path, chunksize=10, engine='c'))
+        self.assertEqual([len(chunk) for chunk in chunks], [10] * 6 + [1])
+        for chunk, expected_chunk in zip(chunks, expected):
+            self.assertTrue(chunk.index.equals(expected_chunk.index))
+            self.assertEqual(chunk.astype(object).where(chunk.notna(), None).values.tolist(),
+                             expected_chunk.astype(object).where(expected_chunk.notna(), None).values.tolist())
+        
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('a,a\n1,2\n')
+        self.assertEqual(list(read_csv(self.path, engine='pyarrow').columns), ['a', 'a.1'])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
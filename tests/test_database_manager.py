@@ -5,6 +5,8 @@
 import unittest
 import sys
 import os
+import shutil
+import tempfile
 from unittest.mock import MagicMock, patch, call
 
 # Добавляем путь к проекту для импорта модулей
@@ -219,12 +221,11 @@ class TestDatabaseManager(unittest.TestCase):
         )
     
     def test_get_all_projects(self):
-        """Тест получения всех проектов"""
-        # Настраиваем моки для проектов
-        self.mock_db.execute_query.side_effect = [
-            self.test_project_data,  # Первый вызов: проекты
-            [],  # Второй вызов: задачи для первого проекта
-            []   # Третий вызов: задачи для второго проекта
+        """Тест получения всех проектов (без загрузки задач)"""
+        # Настраиваем мок: одна сводная выборка по проектам
+        self.mock_db.execute_query.return_value = [
+            (1, 'Проект 1', 2, 1, 60, 20),
+            (2, 'Проект 2', 0, 0, 0, 0)
         ]
         
         # Вызываем метод
@@ -236,27 +237,144 @@ class TestDatabaseManager(unittest.TestCase):
         # Проверяем первый проект
         self.assertEqual(projects[0].id, 1)
         self.assertEqual(projects[0].title, 'Проект 1')
-        self.assertEqual(len(projects[0].tasks), 0)
+        self.assertEqual(len(projects[0].tasks), 2)
+        self.assertEqual(projects[0].to_dict()['progress'], "50.0%")
+        self.assertEqual(projects[0].task_totals(), (2, 1, 60.0, 20.0))
         
         # Проверяем второй проект
         self.assertEqual(projects[1].id, 2)
         self.assertEqual(projects[1].title, 'Проект 2')
         self.assertEqual(len(projects[1].tasks), 0)
         
-        # Проверяем вызовы
-        expected_calls = [
-            call("SELECT id, title FROM projects ORDER BY id", fetch=True),
-            call("""
-                SELECT id, title, description, status, hours_required, employee_id
-                FROM tasks WHERE project_id = %s
-            """.strip(), (1,), fetch=True),
-            call("""
-                SELECT id, title, description, status, hours_required, employee_id
-                FROM tasks WHERE project_id = %s
-            """.strip(), (2,), fetch=True)
+        # Задачи не загружались: один запрос на все проекты
+        self.assertFalse(projects[0].tasks.loaded)
+        self.mock_db.execute_query.assert_called_once()
+    
+    def test_get_all_projects_lazy_tasks(self):
+        """Тест загрузки задач проекта при первой итерации"""
+        self.mock_db.execute_query.side_effect = [
+            [(1, 'Проект 1', 2, 1, 60, 20)],
+            [(11, 'Задача 1', 'Описание', 'Завершено', 20, 3),
+             (12, 'Задача 2', 'Описание', 'В процессе', 40, 3)]
         ]
-        self.mock_db.execute_query.assert_has_calls(expected_calls)
+        
+        projects = self.db_manager.get_all_projects()
+        tasks = list(projects[0].tasks)
+        
+        self.assertEqual([task.id for task in tasks], [11, 12])
+        self.assertEqual(tasks[0].project_id, 1)
+        self.assertIs(tasks[0].assigned_employee, tasks[1].assigned_employee)
+        self.mock_db.execute_query.assert_called_with(
+            """
+            SELECT id, title, description, status, hours_required, employee_id
+            FROM tasks WHERE project_id = %s
+        """,
+            (1,),
+            fetch=True
+        )
     
+    def test_get_project_by_id(self):
+        """Тест получения проекта по ID со сводкой по задачам"""
+        self.mock_db.execute_query.return_value = [(1, 'Проект 1', 2, 1, 60, 20)]
+
+        project = self.db_manager.get_project_by_id(1)
+
+        self.assertEqual(project.title, 'Проект 1')
+        self.assertEqual(project.task_totals(), (2, 1, 60.0, 20.0))
+        self.assertFalse(project.tasks.loaded)
+        query, params = self.mock_db.execute_query.call_args[0]
+        self.assertIn("WHERE p.id = %s", query)
+        self.assertEqual(params, (1,))
+
+    def test_get_project_by_id_preload_tasks(self):
+        """Тест получения проекта по ID с загрузкой задач"""
+        self.mock_db.execute_query.side_effect = [
+            [(1, 'Проект 1')],
+            [(11, 'Задача 1', 'Описание', 'Завершено', 20, None)]
+        ]
+
+        project = self.db_manager.get_project_by_id(1, preload_tasks=True)
+
+        self.assertEqual([task.id for task in project.tasks], [11])
+        self.assertEqual(project.project_progress(), 100)
+        self.assertEqual(self.mock_db.execute_query.call_count, 2)
+
+    def test_get_project_by_id_not_found(self):
+        """Тест получения несуществующего проекта"""
+        self.mock_db.execute_query.return_value = []
+
+        self.assertIsNone(self.db_manager.get_project_by_id(999))
+        self.assertIsNone(self.db_manager.get_project_by_id(999, preload_tasks=True))
+
+    def test_get_task_by_id(self):
+        """Тест получения задачи по ID"""
+        self.mock_db.execute_query.return_value = [
+            (1, 'Задача 1', 'Описание 1', 'В процессе', 40, 1, 2, 'Иван Иванов', 'Проект 2')
+        ]
+
+        task = self.db_manager.get_task_by_id(1)
+
+        self.assertEqual(task.id, 1)
+        self.assertEqual(task.project_id, 2)
+        self.assertEqual(task.project_title, 'Проект 2')
+        self.assertEqual(task.assigned_employee.name, 'Иван Иванов')
+        self.assertIn('LEFT JOIN projects', self.mock_db.execute_query.call_args[0][0])
+        self.mock_db.execute_query.assert_called_once()
+        self.assertEqual(self.mock_db.execute_query.call_args[0][1], (1,))
+
+    def test_get_task_by_id_not_found(self):
+        """Тест получения несуществующей задачи"""
+        self.mock_db.execute_query.return_value = []
+        self.assertIsNone(self.db_manager.get_task_by_id(999))
+
+    def test_lookup_employees(self):
+        """Тест поиска сотрудников по префиксу имени"""
+        self.mock_db.execute_query.return_value = [(1, 'Иван Иванов')]
+
+        result = self.db_manager.lookup_employees("Ив", 10)
+
+        self.assertEqual(result, [(1, '1: Иван Иванов')])
+        query, params = self.mock_db.execute_query.call_args[0]
+        self.assertIn("lower(name) LIKE %s", query)
+        self.assertEqual(params, ('ив%', 10))
+
+    def test_lookup_escapes_wildcards(self):
+        """Тест экранирования символов шаблона LIKE"""
+        self.mock_db.execute_query.return_value = []
+
+        self.assertEqual(self.db_manager.lookup_projects("50%_"), [])
+        _, params = self.mock_db.execute_query.call_args[0]
+        self.assertEqual(params, ('50\\%\\_%', 50))
+
+    def test_lookup_empty_prefix(self):
+        """Тест: пустой префикс не выполняет запрос"""
+        self.assertEqual(self.db_manager.lookup_employees("  "), [])
+        self.assertEqual(self.db_manager.lookup_projects(), [])
+        self.mock_db.execute_query.assert_not_called()
+
+    def test_lookup_projects_by_id(self):
+        """Тест поиска проекта по id"""
+        self.mock_db.execute_query.return_value = [(12, 'Проект 12')]
+
+        result = self.db_manager.lookup_projects("12", 5)
+
+        self.assertEqual(result, [(12, '12: Проект 12')])
+        query, params = self.mock_db.execute_query.call_args[0]
+        self.assertIn("UNION ALL", query)
+        # LIMIT применяется и к объединенному результату
+        self.assertTrue(query.strip().endswith("LIMIT %s"))
+        self.assertEqual(params, (12, '12%', 12, 5, 5))
+
+    def test_lookup_non_ascii_digits(self):
+        """Тест: '²' и арабские цифры ищутся как текст, а не как id"""
+        self.mock_db.execute_query.return_value = []
+
+        for prefix in ("²", "٣"):
+            self.assertEqual(self.db_manager.lookup_projects(prefix, 5), [])
+            query, params = self.mock_db.execute_query.call_args[0]
+            self.assertNotIn("UNION ALL", query)
+            self.assertEqual(params, (prefix + '%', 5))
+
     def test_add_task(self):
         """Тест добавления задачи"""
         # Настраиваем мок
@@ -404,6 +522,85 @@ class TestDatabaseManager(unittest.TestCase):
             fetch=True
         )
 
+    def test_export_tasks_csv_single_copy(self):
+        """Тест: экспорт задач - один COPY в файл с заголовками колонок"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'tasks.csv')
+        
+        def copy_expert(query, file, params=None):
+            file.write('ID,Название\n1,Задача 1\n'.encode('utf-8'))
+            return True
+        self.mock_db.copy_expert.side_effect = copy_expert
+        
+        self.assertTrue(self.db_manager.export_tasks_csv(path))
+        
+        query, _, params = self.mock_db.copy_expert.call_args[0]
+        self.assertTrue(query.startswith("COPY ("))
+        self.assertIn("TO STDOUT WITH (FORMAT csv, HEADER true, ENCODING 'utf-8')", query)
+        self.assertIn('AS "Проект"', query)
+        self.assertIsNone(params)
+        self.mock_db.execute_query.assert_not_called()
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'ID,Название\n1,Задача 1\n')
+    
+    def test_export_employees_csv_params(self):
+        """Тест: норма часов передается параметром, файл при ошибке удаляется"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'employees.csv')
+        self.mock_db.copy_expert.return_value = False
+        
+        with patch('config.PAYROLL_NORM_HOURS', 168):
+            self.assertFalse(self.db_manager.export_employees_csv(path))
+        
+        query, _, params = self.mock_db.copy_expert.call_args[0]
+        self.assertIn('AS "Заработок"', query)
+        self.assertEqual(params, (168,))
+        self.assertFalse(os.path.exists(path))
+
+    def test_export_csv_progress(self):
+        """Тест: число выгруженных строк сообщается по мере записи COPY"""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, 'projects.csv')
+        progress = []
+        
+        def copy_expert(query, file, params=None):
+            for row in (b'ID,\xd0\x9d\n', b'1,A\n', b'2,B\n'):
+                file.write(row)
+            return True
+        self.mock_db.copy_expert.side_effect = copy_expert
+        
+        self.assertTrue(self.db_manager.export_projects_csv(path, progress=progress.append))
+        
+        self.assertEqual(progress, [0, 1, 2])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'ID,\xd0\x9d\n1,A\n2,B\n')
+    
+    def test_export_query_progress_format(self):
+        """Тест: прогресс проекта - строкой для CSV и числом для Parquet/Feather"""
+        text_query, params = self.db_manager.export_query('projects')
+        typed_query, _ = self.db_manager.export_query('projects', typed=True)
+        
+        self.assertIsNone(params)
+        self.assertIn("'FM990.0') || '%'", text_query)
+        self.assertIn("::float8 AS \"Прогресс\"", typed_query)
+        with self.assertRaises(ValueError):
+            self.db_manager.export_query('payroll')
+    
+    def test_iter_export_rows(self):
+        """Тест: строки для колоночного экспорта читаются пакетами одним запросом"""
+        self.mock_db.iter_batches.return_value = iter([])
+        
+        with patch('config.EXPORT_BATCH_ROWS', 500), patch('config.PAYROLL_NORM_HOURS', 160):
+            self.db_manager.iter_export_rows('employees')
+        
+        query, params, batch_size = self.mock_db.iter_batches.call_args[0]
+        self.assertIn('AS "Завершено задач"', query)
+        self.assertEqual(params, (160,))
+        self.assertEqual(batch_size, 500)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 sys.modules['psycopg2'] = MagicMock()
 
 from database.db_connection import DatabaseConnection
+from database.db_connection_gui import DatabaseConnectionManager
 import config
 
 class TestDatabaseConnection(unittest.TestCase):
@@ -49,7 +50,8 @@ class TestDatabaseConnection(unittest.TestCase):
             database="test_db",
             user="test_user",
             password="test_pass",
-            port="5432"
+            port="5432",
+            connect_timeout=config.DB_CONNECT_TIMEOUT
         )
     
     @patch('database.db_connection.psycopg2')
@@ -251,6 +253,132 @@ class TestDatabaseConnection(unittest.TestCase):
                 WHERE table_schema = 'public' ORDER BY table_name
             """
         mock_cursor.execute.assert_called_once_with(expected_query.strip())
+    
+    @patch('database.db_connection.psycopg2')
+    def test_get_server_info(self, mock_psycopg2):
+        """Тест получения информации о сервере одним запросом"""
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (3, ['employees', 'projects', 'tasks'])
+        mock_psycopg2.connect.return_value = mock_connection
+        
+        db = DatabaseConnection(self.test_config)
+        db.connect()
+        
+        info = db.get_server_info()
+        
+        self.assertEqual(info, {'databases': 3, 'tables': ['employees', 'projects', 'tasks']})
+        # Без отдельных запросов SELECT 1 и транзакция не остается открытой
+        mock_cursor.execute.assert_called_once()
+        mock_connection.rollback.assert_called_once()
+
+
+    @patch('database.db_connection.psycopg2')
+    def test_copy_expert(self, mock_psycopg2):
+        """Тест COPY с подстановкой параметров через mogrify"""
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_cursor.mogrify.return_value = b"COPY (SELECT 160) TO STDOUT"
+        mock_psycopg2.connect.return_value = mock_connection
+        
+        db = DatabaseConnection(self.test_config)
+        db.connect()
+        target = MagicMock()
+        
+        self.assertTrue(db.copy_expert("COPY (SELECT %s) TO STDOUT", target, (160,)))
+        mock_cursor.mogrify.assert_called_once_with("COPY (SELECT %s) TO STDOUT", (160,))
+        mock_cursor.copy_expert.assert_called_once_with(b"COPY (SELECT 160) TO STDOUT", target)
+        mock_connection.commit.assert_called_once()
+        
+        # Без параметров запрос передается как есть
+        db.copy_expert("COPY (SELECT '%') TO STDOUT", target)
+        mock_cursor.copy_expert.assert_called_with("COPY (SELECT '%') TO STDOUT", target)
+        self.assertEqual(mock_cursor.mogrify.call_count, 1)
+
+
+    @patch('database.db_connection.psycopg2')
+    def test_iter_batches(self, mock_psycopg2):
+        """Тест чтения результата пакетами через серверный курсор"""
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value = mock_cursor
+        mock_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)]]
+        mock_cursor.description = [('id',)]
+        mock_psycopg2.connect.return_value = mock_connection
+        
+        db = DatabaseConnection(self.test_config)
+        db.connect()
+        
+        batches = list(db.iter_batches("SELECT id FROM tasks", batch_size=2))
+        
+        self.assertEqual(batches, [([('id',)], [(1,), (2,)]), ([('id',)], [(3,)])])
+        # Именованный курсор - строки не загружаются на клиент целиком
+        self.assertIn('name', mock_connection.cursor.call_args.kwargs)
+        mock_cursor.close.assert_called_once()
+        mock_connection.rollback.assert_called_once()
+
+    @patch('database.db_connection.psycopg2')
+    def test_cancel(self, mock_psycopg2):
+        """Тест: прерывание запроса передается открытому подключению"""
+        mock_connection = MagicMock(closed=0)
+        mock_psycopg2.connect.return_value = mock_connection
+
+        db = DatabaseConnection(self.test_config)
+        db.cancel()
+        db.connect()
+        db.cancel()
+
+        mock_connection.cancel.assert_called_once()
+
+    @patch('database.db_connection.psycopg2')
+    def test_transaction(self, mock_psycopg2):
+        """Тест: изменения блока фиксируются вместе, при ошибке откатываются"""
+        mock_connection = MagicMock()
+        mock_psycopg2.connect.return_value = mock_connection
+
+        db = DatabaseConnection(self.test_config)
+        db.connect()
+
+        with db.transaction() as cursor:
+            cursor.execute("TRUNCATE import_tasks_staging")
+        mock_connection.commit.assert_called_once()
+        mock_connection.rollback.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            with db.transaction():
+                raise ValueError("ошибка в блоке")
+        mock_connection.commit.assert_called_once()
+        mock_connection.rollback.assert_called_once()
+
+
+class TestDatabaseConnectionManager(unittest.TestCase):
+    """Тесты передачи проверенного подключения"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.config = {"host": "localhost", "port": "5432", "database": "test_db",
+                       "user": "test_user", "password": "test_pass"}
+        self.manager = DatabaseConnectionManager(MagicMock())
+        self.tested = MagicMock(is_connected=True, config=dict(self.config))
+        self.manager.tested_connection = self.tested
+    
+    def test_create_connection_reuses_tested(self):
+        """Тест: create_connection использует проверенное подключение"""
+        with patch('database.db_connection_gui.DatabaseConnection') as connection_class:
+            connection = self.manager.create_connection(dict(self.config))
+        
+        self.assertIs(connection, self.tested)
+        connection_class.assert_not_called()
+        self.assertIsNone(self.manager.tested_connection)
+    
+    def test_tested_connection_with_other_config_closed(self):
+        """Тест: подключение с другими параметрами закрывается"""
+        other = dict(self.config, database="other_db")
+        
+        self.assertIsNone(self.manager.take_tested_connection(other))
+        self.tested.disconnect.assert_called_once()
 
 
 if __name__ == '__main__':
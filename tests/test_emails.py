@@ -0,0 +1,126 @@
+"""
+Тесты поиска email-адресов в файлах
+"""
+
+import unittest
+import sys
+import os
+import io
+import csv
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.data_processing import extract_emails, unique_emails
+from utils.emails import (scan_email_file, extract_emails_from_files, save_emails_csv,
+                          EmailMatch)
+from utils.cli import main
+
+class TestEmailScan(unittest.TestCase):
+    """Тесты extract_emails_from_files"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'mail.txt')
+        lines = []
+        for i in range(200):
+            lines.append(f"From: Сотрудник {i} <user{i % 7}@example.com>, copy.{i}@Mail.Example.org")
+            lines.append("текст письма без адресов " * 3)
+        self.text = "\n".join(lines) + "\n"
+        self.write(self.path, self.text)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, path, text):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_matches_extract_emails(self):
+        """Тест: поиск в файле совпадает с extract_emails по тексту"""
+        self.assertEqual(scan_email_file(self.path), extract_emails(self.text))
+
+    def test_range_boundaries(self):
+        """Тест: адреса на границах частей не теряются и не дублируются"""
+        expected = extract_emails(self.text)
+        size = os.path.getsize(self.path)
+        for range_bytes in (7, 64, 333, 4096):
+            found = []
+            for start in range(0, size, range_bytes):
+                found.extend(scan_email_file(self.path, start, start + range_bytes))
+            self.assertEqual(found, expected, range_bytes)
+
+    def test_single_line_file_split(self):
+        """Тест: файл без переводов строк делится на части по байтам"""
+        text = ", ".join(f'"Сотрудник {i}": "user{i}@example.com"' for i in range(300))
+        path = os.path.join(self.tmp_dir, 'minified.json')
+        self.write(path, text)
+        expected = extract_emails(text)
+
+        size = os.path.getsize(path)
+        parts = [scan_email_file(path, start, start + 1000) for start in range(0, size, 1000)]
+        self.assertTrue(all(parts))
+        self.assertEqual([email for part in parts for email in part], expected)
+        matches = extract_emails_from_files([path], workers=2, range_bytes=1000)
+        self.assertEqual([match.email for match in matches], expected)
+
+    def test_cyrillic_word_boundaries(self):
+        """Тест: кириллица вплотную к адресу обрабатывается так же, как в extract_emails"""
+        text = ("Контакт:ivan@mail.ru; почтаpetr@x.com, ann@пример.рф joe@site.comё end\n"
+                "foo@bar.org\n")
+        path = os.path.join(self.tmp_dir, 'cyrillic.txt')
+        self.write(path, text)
+
+        self.assertEqual(extract_emails(text), ['ivan@mail.ru', 'foo@bar.org'])
+        self.assertEqual(scan_email_file(path), ['ivan@mail.ru', 'foo@bar.org'])
+        matches = extract_emails_from_files([path], workers=1)
+        self.assertEqual([match.email for match in matches], ['ivan@mail.ru', 'foo@bar.org'])
+
+    def test_case_insensitive_dedup(self):
+        """Тест: повторы объединяются без учета регистра"""
+        self.assertEqual(unique_emails(['A@x.com', 'b@x.com', 'a@X.com']), ['A@x.com', 'b@x.com'])
+
+        self.write(os.path.join(self.tmp_dir, 'more.txt'), "USER1@EXAMPLE.COM new@example.com\n")
+        matches = extract_emails_from_files([self.tmp_dir], workers=1)
+
+        by_email = {match.email.lower(): match for match in matches}
+        self.assertEqual(len(matches), len(unique_emails(extract_emails(self.text))) + 1)
+        self.assertEqual(by_email['user1@example.com'].count, 30)
+        self.assertEqual(by_email['user1@example.com'].email, 'user1@example.com')
+        self.assertEqual(by_email['new@example.com'].source, os.path.join(self.tmp_dir, 'more.txt'))
+
+    def test_parallel_matches_sequential(self):
+        """Тест: результат пула процессов совпадает с последовательным"""
+        os.mkdir(os.path.join(self.tmp_dir, 'sub'))
+        self.write(os.path.join(self.tmp_dir, 'sub', 'empty.txt'), '')
+
+        sequential = extract_emails_from_files([self.tmp_dir], workers=1)
+        parallel = extract_emails_from_files([self.tmp_dir], workers=3, range_bytes=500)
+
+        self.assertEqual(parallel, sequential)
+
+    def test_save_csv(self):
+        """Тест сохранения адресов в CSV"""
+        path = os.path.join(self.tmp_dir, 'emails.csv')
+        save_emails_csv([EmailMatch('a@x.com', 2, 'mail.txt')], path)
+
+        with open(path, encoding='utf-8', newline='') as f:
+            self.assertEqual(list(csv.reader(f)),
+                             [['email', 'count', 'source'], ['a@x.com', '2', 'mail.txt']])
+
+    def test_cli_emails(self):
+        """Тест команды emails"""
+        output = os.path.join(self.tmp_dir, 'emails.csv')
+        with redirect_stdout(io.StringIO()) as out:
+            code = main(['emails', self.path, '-o', output, '--workers', '1'])
+
+        self.assertEqual(code, 0)
+        self.assertIn("Найдено адресов: 207", out.getvalue())
+        self.assertTrue(os.path.exists(output))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Тесты для шины событий изменения данных
+"""
+
+import unittest
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.events import EventBus, ChangeEvent
+
+class FakeRoot:
+    """Заглушка Tk: откладывает колбэки after до явного вызова run_pending"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def run_pending(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+
+class TestEventBus(unittest.TestCase):
+    """Тесты для класса EventBus"""
+
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.root = FakeRoot()
+        self.bus = EventBus(self.root)
+        self.calls = []
+
+    def test_events_coalesced_per_frame(self):
+        """Тест объединения событий в один вызов за кадр"""
+        self.bus.subscribe(('tasks', 'employees'), self.calls.append)
+        self.bus.publish('tasks', 'update', 1)
+        self.bus.publish('tasks', 'delete', 2)
+        self.bus.publish('employees', 'update', 3)
+
+        self.assertEqual(len(self.root.callbacks), 1)
+        self.assertEqual(self.calls, [])
+
+        self.root.run_pending()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.calls[0], [ChangeEvent('tasks', 'update', 1),
+                                         ChangeEvent('tasks', 'delete', 2),
+                                         ChangeEvent('employees', 'update', 3)])
+
+    def test_only_relevant_subscribers(self):
+        """Тест доставки только подписчикам на измененные сущности"""
+        projects = []
+        self.bus.subscribe(('tasks',), self.calls.append)
+        self.bus.subscribe(('projects',), projects.append)
+        self.bus.publish('tasks', 'insert')
+        self.root.run_pending()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(projects, [])
+
+    def test_next_frame_scheduled_after_flush(self):
+        """Тест планирования нового кадра после доставки"""
+        self.bus.subscribe(('tasks',), self.calls.append)
+        self.bus.publish('tasks')
+        self.root.run_pending()
+        self.bus.publish('tasks')
+        self.root.run_pending()
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.calls[1]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Тесты фоновых выгрузок с прогрессом и отменой
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import importlib.util
+from collections import namedtuple
+from unittest.mock import patch
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.export_jobs import ExportJob, ExportQueue, claim_export_path, release_export_path
+
+Column = namedtuple('Column', ['name', 'type_code'])
+
+class TestExportJob(unittest.TestCase):
+    """Тесты ExportJob (подключение к БД заменено моком)"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        connection_patch = patch('utils.export_jobs.DatabaseConnection')
+        manager_patch = patch('utils.export_jobs.DatabaseManager')
+        self.connection = connection_patch.start().return_value
+        self.manager = manager_patch.start().return_value
+        self.addCleanup(patch.stopall)
+        self.connection.connect.return_value = True
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def job(self, entity='tasks', file_format='csv', name='export.csv'):
+        return ExportJob({'host': 'localhost'}, entity, file_format,
+                         path=os.path.join(self.tmp_dir, name))
+
+    def test_csv_export_renamed_when_done(self):
+        """Тест: CSV пишется во временный файл и переименовывается после выгрузки"""
+        def export_csv(path, progress):
+            self.assertTrue(path.endswith('.part'))
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('ID\n1\n2\n')
+            progress(2)
+            return True
+        self.manager.export_tasks_csv.side_effect = export_csv
+        job = self.job()
+
+        job.run()
+
+        self.assertEqual(job.status, ExportJob.DONE)
+        self.assertEqual(job.rows, 2)
+        self.assertEqual(os.listdir(self.tmp_dir), ['export.csv'])
+        self.connection.disconnect.assert_called_once()
+
+    def test_failed_export(self):
+        """Тест: неудачная выгрузка не оставляет файла и хранит причину"""
+        self.manager.export_projects_csv.return_value = False
+        job = self.job('projects')
+
+        job.run()
+
+        self.assertEqual(job.status, ExportJob.FAILED)
+        self.assertEqual(job.error, "Не удалось экспортировать данные")
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+        self.connection.connect.return_value = False
+        job = self.job('projects')
+        job.run()
+        self.assertEqual(job.error, "Нет подключения к БД")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow не установлен")
+    def test_cancel_columnar_export(self):
+        """Тест: отмена между пакетами прерывает запрос и удаляет частичный файл"""
+        description = [Column('id', 20)]
+
+        def batches():
+            yield description, [(1,), (2,)]
+            job.cancel()
+            yield description, [(3,)]
+        self.manager.iter_export_rows.return_value = batches()
+        job = self.job('employees', 'feather', 'export.feather')
+
+        job.run()
+
+        self.assertEqual(job.status, ExportJob.CANCELLED)
+        self.assertEqual(job.rows, 2)
+        self.assertIsNone(job.error)
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+        self.connection.cancel.assert_called_once()
+
+    def test_cancel_pending(self):
+        """Тест: отмененная до запуска выгрузка не подключается к БД"""
+        job = self.job()
+        job.cancel()
+
+        job.run()
+
+        self.assertEqual(job.status, ExportJob.CANCELLED)
+        self.connection.connect.assert_not_called()
+
+    def test_same_second_exports_get_unique_paths(self):
+        """Тест: выгрузки, запущенные в одну секунду, пишут в разные файлы"""
+        path = os.path.join(self.tmp_dir, 'tasks_20250101_120000.csv')
+        with patch('utils.export_jobs.export_filename', return_value=path):
+            first = ExportJob({'host': 'localhost'}, 'tasks')
+            second = ExportJob({'host': 'localhost'}, 'tasks')
+
+        self.assertEqual(first.path, path)
+        self.assertEqual(second.path, os.path.join(self.tmp_dir, 'tasks_20250101_120000_1.csv'))
+
+        # Освобожденное имя, файл которого существует, тоже не выдается повторно
+        self.manager.export_tasks_csv.side_effect = lambda path, progress: open(path, 'w').close() or True
+        first.run()
+        second.cancel()
+        second.run()
+        self.assertEqual(claim_export_path(path),
+                         os.path.join(self.tmp_dir, 'tasks_20250101_120000_1.csv'))
+        release_export_path(os.path.join(self.tmp_dir, 'tasks_20250101_120000_1.csv'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.job(file_format='xlsx')
+        with self.assertRaises(ValueError):
+            self.job(entity='payroll')
+
+
+class TestExportQueue(unittest.TestCase):
+    """Тесты очереди выгрузок"""
+
+    def test_parallel_jobs(self):
+        """Тест: выгрузки выполняются одновременно в разных потоках"""
+        barrier = threading.Barrier(2, timeout=5)
+        threads = []
+
+        class Job:
+            finished = False
+
+            def run(self):
+                threads.append(threading.current_thread().name)
+                barrier.wait()
+                self.finished = True
+
+        export_queue = ExportQueue(workers=2)
+        jobs = [export_queue.submit(Job()), export_queue.submit(Job())]
+        export_queue.shutdown()
+        for thread in export_queue._threads:
+            thread.join(5)
+
+        self.assertTrue(all(job.finished for job in jobs))
+        self.assertEqual(len(set(threads)), 2)
+        self.assertEqual(export_queue.active(), [])
+
+    def test_prune(self):
+        """Тест: завершенные выгрузки убираются из очереди, незавершенные остаются"""
+        class Job:
+            def __init__(self, finished):
+                self.finished = finished
+
+        export_queue = ExportQueue(workers=1)
+        export_queue.shutdown()
+        done, running = Job(True), Job(False)
+        export_queue.jobs = [done, running]
+
+        self.assertEqual(export_queue.prune(), [done])
+        self.assertEqual(export_queue.jobs, [running])
+
+
+if __name__ == '__main__':
+    unittest.main()
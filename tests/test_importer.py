@@ -0,0 +1,168 @@
+"""
+Тесты импорта сотрудников и задач из CSV
+"""
+
+import unittest
+import sys
+import os
+import io
+import csv
+import shutil
+import tempfile
+from unittest.mock import MagicMock
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from database.importer import (CsvImporter, References, map_columns, prepare_employees,
+                               prepare_tasks, rejected_csv_path, format_import_result)
+
+TASKS_CSV = """ID,Название,Описание,Статус,Требуется часов,Сотрудник,Проект
+,Задача 1,,,8,Иванов Иван,1
+12,Задача 2,"Описание, с запятой",завершено,"4,5",2,Сайт
+x,Задача 3,,,1,,
+,,,,1,,
+,Задача 5,,Отложено,1,,
+,Задача 6,,,-1,,
+,Задача 7,,,1,Петров,
+,Задача 8,,,1,Анна,
+,Задача 9,,,1,Не назначен,99
+"""
+
+def read_chunk(text):
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+
+class TestPrepareRows(unittest.TestCase):
+    """Тесты векторной проверки строк"""
+
+    def setUp(self):
+        self.references = References(
+            [(2, 'Иванов Иван'), (3, 'Анна'), (4, 'анна ')],
+            [(1, 'Сайт'), (5, 'Приложение')]
+        )
+
+    def test_map_export_headers(self):
+        """Тест: заголовки экспорта приложения распознаются"""
+        columns = map_columns(['\ufeffID', 'Имя', 'Должность', 'Зарплата', 'Заработок'], 'employees')
+        self.assertEqual(columns, {'id': '\ufeffID', 'name': 'Имя',
+                                   'position': 'Должность', 'salary': 'Зарплата'})
+
+        with self.assertRaises(ValueError):
+            map_columns(['name', 'position'], 'employees')
+        with self.assertRaises(ValueError):
+            map_columns(['title'], 'projects')
+
+    def test_prepare_tasks(self):
+        """Тест: типы, значения по умолчанию и разрешение ссылок"""
+        chunk = read_chunk(TASKS_CSV)
+        valid, rejected = prepare_tasks(chunk, map_columns(chunk.columns, 'tasks'), self.references)
+
+        self.assertEqual(valid['record'].tolist(), [1, 2])
+        self.assertEqual(valid['status'].tolist(), ['В процессе', 'Завершено'])
+        self.assertEqual(valid['hours_required'].tolist(), [8.0, 4.5])
+        self.assertEqual(valid['employee_id'].tolist(), [2, 2])
+        self.assertEqual(valid['project_id'].tolist(), [1, 1])
+        self.assertTrue(pd.isna(valid['id'].iloc[0]))
+        self.assertEqual(valid['id'].iloc[1], 12)
+
+        self.assertEqual(rejected['record'].tolist(), [3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(rejected['error'].tolist(), [
+            "некорректный id", "не указано название", "неизвестный статус",
+            "некорректное количество часов", "сотрудник не найден",
+            "имя сотрудника неоднозначно, укажите id", "проект не найден",
+        ])
+        # Отклоненные строки сохраняют исходные значения всех колонок
+        self.assertEqual(rejected.iloc[0]['ID'], 'x')
+
+    def test_prepare_employees(self):
+        """Тест: проверка имени, зарплаты и id сотрудников"""
+        chunk = read_chunk("name,position,salary\nИван,,100000\n,Менеджер,1\nПетр,Дизайнер,\nОлег,,-5\n")
+        valid, rejected = prepare_employees(chunk, map_columns(chunk.columns, 'employees'))
+
+        self.assertEqual(valid['name'].tolist(), ['Иван'])
+        self.assertEqual(valid['position'].tolist(), [''])
+        self.assertEqual(rejected['error'].tolist(),
+                         ["не указано имя", "некорректная зарплата", "некорректная зарплата"])
+
+
+class TestCsvImporter(unittest.TestCase):
+    """Тесты загрузки через промежуточную таблицу (с моком подключения)"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'tasks.csv')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(TASKS_CSV)
+
+        self.db = MagicMock()
+        self.db.execute_query.side_effect = lambda query, params=None, fetch=False: (
+            [(2, 'Иванов Иван'), (3, 'Анна'), (4, 'Анна')] if 'employees' in query
+            else [(1, 'Сайт')] if fetch else None
+        )
+        self.cursor = self.db.transaction.return_value.__enter__.return_value
+        self.cursor.fetchone.side_effect = [(1, 0), (1,)]
+        self.cursor.fetchall.return_value = [(7,)]
+        self.copied = []
+        self.cursor.copy_expert.side_effect = lambda query, f: self.copied.append(f.read())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def executed(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list]
+
+    def test_import_tasks(self):
+        """Тест: строки передаются через COPY частями, отклоненные - в отдельный файл"""
+        result = CsvImporter(self.db, chunksize=4).import_file('tasks', self.path)
+
+        self.assertEqual(len(self.copied), 1)
+        rows = list(csv.reader(io.StringIO(self.copied[0])))
+        self.assertEqual(rows, [
+            ['1', '', 'Задача 1', '', 'В процессе', '8.0', '2', '1'],
+            ['2', '12', 'Задача 2', 'Описание, с запятой', 'Завершено', '4.5', '2', '1'],
+        ])
+        self.assertEqual(result['total_rows'], 9)
+        self.assertEqual(result['imported'], 2)
+        self.assertEqual((result['inserted'], result['updated']), (2, 0))
+        self.assertEqual(result['rejected'], 7)
+        self.assertEqual(result['reject_path'], rejected_csv_path(self.path))
+
+        executed = self.executed()
+        self.assertTrue(executed[0].startswith("TRUNCATE import_tasks_staging"))
+        # Есть явный id - последовательность сдвигается за него
+        self.assertTrue(any('setval' in query for query in executed))
+        # Часы пересчитываются в той же транзакции, в том числе у прежнего
+        # исполнителя задачи, переназначенной импортом
+        self.assertIn("UPDATE employees", executed[-2])
+        self.assertEqual(self.cursor.execute.call_args_list[-2].args[1], ([7],))
+        self.assertTrue(executed[-1].startswith("TRUNCATE import_tasks_staging"))
+
+        with open(result['reject_path'], encoding='utf-8', newline='') as f:
+            rejected = list(csv.reader(f))
+        self.assertEqual(rejected[0][:3], ['record', 'error', 'ID'])
+        self.assertEqual(len(rejected), 8)
+        self.assertIn("Отклонено: 7", format_import_result(result))
+
+    def test_failed_import_removes_rejects(self):
+        """Тест: ошибка БД передается дальше, файл отклоненных строк удаляется"""
+        self.cursor.copy_expert.side_effect = RuntimeError("COPY failed")
+
+        with self.assertRaises(RuntimeError):
+            CsvImporter(self.db).import_file('tasks', self.path)
+
+        self.assertFalse(os.path.exists(rejected_csv_path(self.path)))
+
+    def test_missing_columns(self):
+        """Тест: файл без обязательных колонок не начинает транзакцию"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("description\nтекст\n")
+
+        with self.assertRaises(ValueError):
+            CsvImporter(self.db).import_file('tasks', self.path)
+        self.db.transaction.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,9 +9,10 @@ import os
 # Добавляем путь к проекту для импорта модулей
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from models.employee import Employee
+from models.employee import Employee, EmployeeRef
 from models.task import Task
-from models.project import Project
+from models.project import Project, LazyTaskList
+from models.task_table import TaskTable
 
 class TestEmployee(unittest.TestCase):
     """Тесты для класса Employee"""
@@ -58,6 +59,54 @@ class TestEmployee(unittest.TestCase):
         self.assertEqual(employee.salary, 80000)
         self.assertEqual(employee.hours_worked, 0)
         self.assertIsNone(employee.id)
+    
+    def test_employee_has_no_dict(self):
+        """Тест компактного представления (__slots__)"""
+        self.assertFalse(hasattr(self.employee, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.employee.unknown_field = 1
+
+
+class TestEmployeeRef(unittest.TestCase):
+    """Тесты для общей ссылки на сотрудника"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.employee = Employee("Иван Иванов", "Разработчик", 100000, 40, emp_id=1)
+        self.calls = []
+        
+        def loader(emp_id):
+            self.calls.append(emp_id)
+            return self.employee
+        
+        self.loader = loader
+    
+    def test_name_without_loading(self):
+        """Тест: известное имя не требует загрузки записи"""
+        ref = EmployeeRef(1, "Иван Иванов", self.loader)
+        self.assertEqual(ref.id, 1)
+        self.assertEqual(ref.name, "Иван Иванов")
+        self.assertEqual(self.calls, [])
+    
+    def test_lazy_resolve_once(self):
+        """Тест ленивой загрузки полной записи (один раз)"""
+        ref = EmployeeRef(1, loader=self.loader)
+        self.assertEqual(ref.name, "Иван Иванов")
+        self.assertEqual(ref.salary, 100000)
+        self.assertEqual(ref.position, "Разработчик")
+        self.assertEqual(ref.calculate_pay(), (100000 / 160) * 40)
+        self.assertEqual(self.calls, [1])
+    
+    def test_unresolved_defaults(self):
+        """Тест ссылки на отсутствующего сотрудника"""
+        calls = []
+        ref = EmployeeRef(99, loader=lambda emp_id: calls.append(emp_id))
+        self.assertEqual(ref.name, "")
+        self.assertEqual(ref.salary, 0.0)
+        self.assertEqual(ref.calculate_pay(), 0.0)
+        self.assertIsNone(ref.resolve())
+        # Отсутствие записи запоминается: повторных запросов к БД нет
+        self.assertEqual(calls, [99])
 
 
 class TestTask(unittest.TestCase):
@@ -193,5 +242,101 @@ class TestProject(unittest.TestCase):
         self.assertEqual(project_dict['progress'], "0.0%")
 
 
+
+class TestLazyTaskList(unittest.TestCase):
+    """Тесты для ленивого списка задач проекта"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.load_count = 0
+        
+        def loader():
+            self.load_count += 1
+            return [
+                Task("Дизайн", "Создать дизайн", "Завершено", hours_required=20),
+                Task("Верстка", "Сверстать страницы", "В процессе", hours_required=30)
+            ]
+        
+        self.loader = loader
+        self.summary = {'total_tasks': 2, 'completed_tasks': 1,
+                        'total_hours': 50.0, 'completed_hours': 20.0}
+    
+    def test_summary_without_loading(self):
+        """Тест: количество и прогресс берутся из сводки без загрузки"""
+        project = Project("Проект", LazyTaskList(self.loader, self.summary), project_id=1)
+        self.assertEqual(len(project.tasks), 2)
+        self.assertEqual(project.to_dict()['progress'], "50.0%")
+        self.assertEqual(project.task_totals(), (2, 1, 50.0, 20.0))
+        self.assertEqual(self.load_count, 0)
+    
+    def test_load_on_iteration(self):
+        """Тест загрузки задач при первой итерации (один раз)"""
+        tasks = LazyTaskList(self.loader, self.summary)
+        self.assertEqual([task.title for task in tasks], ["Дизайн", "Верстка"])
+        self.assertEqual(tasks[1].title, "Верстка")
+        self.assertTrue(tasks.loaded)
+        self.assertEqual(self.load_count, 1)
+    
+    def test_add_task_loads_list(self):
+        """Тест добавления задачи в незагруженный список"""
+        project = Project("Проект", LazyTaskList(self.loader, self.summary), project_id=1)
+        project.add_task(Task("Тестирование", "", "В процессе", hours_required=10))
+        self.assertEqual(len(project.tasks), 3)
+        self.assertEqual(project.task_totals(), (3, 1, 60.0, 20.0))
+
+
+class TestTaskTable(unittest.TestCase):
+    """Тесты для колоночного хранилища TaskTable"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.rows = [
+            (1, 'Задача 1', 'Описание 1', 'В процессе', 40, 1, 1, 'Иван Иванов', 'Проект 1'),
+            (2, 'Задача 2', 'Описание 2', 'Завершено', 20, 2, 1, 'Петр Петров', 'Проект 1'),
+            (3, 'Задача 3', None, 'Завершено', None, None, None, None, None)
+        ]
+        self.table = TaskTable.from_rows(self.rows)
+    
+    def test_from_rows(self):
+        """Тест построения таблицы из строк запроса"""
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(list(self.table.ids), [1, 2, 3])
+        self.assertEqual(list(self.table.hours), [40.0, 20.0, 0.0])
+        self.assertEqual(self.table.status(0), 'В процессе')
+        self.assertEqual(self.table.status(1), 'Завершено')
+        self.assertEqual(len(self.table.statuses), 2)
+    
+    def test_missing_ids(self):
+        """Тест задач без сотрудника и проекта"""
+        self.assertIsNone(self.table.employee_id(2))
+        self.assertIsNone(self.table.project_id(2))
+        self.assertEqual(self.table.row(2),
+                         (3, 'Задача 3', None, 'Завершено', 0.0, None, None, None, None))
+    
+    def test_interned_strings(self):
+        """Тест интернирования повторяющихся строк"""
+        table = TaskTable()
+        table.append(1, 'A', '', 'Завершено', 1, 1, 1, 'Иван', ''.join(['Про', 'ект']))
+        table.append(2, 'B', '', 'Завершено', 1, 1, 1, 'Иван', ''.join(['Прое', 'кт']))
+        self.assertIs(table.project_titles[0], table.project_titles[1])
+    
+    def test_to_task(self):
+        """Тест сборки объекта Task из строки таблицы"""
+        task = self.table.to_task(1)
+        self.assertEqual(task.id, 2)
+        self.assertEqual(task.title, 'Задача 2')
+        self.assertEqual(task.status, 'Завершено')
+        self.assertEqual(task.hours_required, 20)
+        self.assertEqual(task.project_id, 1)
+    
+    def test_to_columns(self):
+        """Тест получения колонок для экспорта"""
+        columns = self.table.to_columns()
+        self.assertEqual(columns['id'], [1, 2, 3])
+        self.assertEqual(columns['status'], ['В процессе', 'Завершено', 'Завершено'])
+        self.assertEqual(columns['employee_id'], [1, 2, None])
+        self.assertEqual(columns['project_title'], ['Проект 1', 'Проект 1', None])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
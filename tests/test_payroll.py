@@ -0,0 +1,142 @@
+"""
+Тесты для пакетного расчета заработной платы
+"""
+
+import unittest
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.employee import Employee
+from utils.payroll import PayrollEngine, PayrollPeriod
+
+class TestPayrollPeriod(unittest.TestCase):
+    """Тесты для класса PayrollPeriod"""
+    
+    def test_single_month(self):
+        """Тест периода в один месяц"""
+        period = PayrollPeriod.month(2026, 3)
+        self.assertEqual(period.key, '2026-03')
+        self.assertEqual(period.months(), ['2026-03'])
+    
+    def test_multi_month(self):
+        """Тест периода через границу года"""
+        period = PayrollPeriod(date(2025, 11, 15), date(2026, 2, 1))
+        self.assertEqual(period.key, '2025-11..2026-02')
+        self.assertEqual(period.months(), ['2025-11', '2025-12', '2026-01', '2026-02'])
+        self.assertEqual(period.bounds(), (date(2025, 11, 1), date(2026, 3, 1)))
+    
+    def test_invalid_period(self):
+        """Тест периода с концом раньше начала"""
+        with self.assertRaises(ValueError):
+            PayrollPeriod(date(2026, 2, 1), date(2026, 1, 1))
+
+
+class TestPayrollEngine(unittest.TestCase):
+    """Тесты для класса PayrollEngine"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.mock_db = MagicMock()
+        self.hours_rows = [
+            (1, 'Иван', 'Разработчик', Decimal('100000.00'), Decimal('40.00')),
+            (2, 'Петр', 'Менеджер', Decimal('80000.00'), Decimal('200.00')),
+            (3, 'Анна', 'Дизайнер', Decimal('90000.00'), Decimal('0'))
+        ]
+        self.period = PayrollPeriod.month(2026, 1)
+    
+    def make_engine(self, **kwargs):
+        params = {'norm_hours': 160, 'norms_by_month': {}, 'norms_by_position': {},
+                  'overtime_multiplier': 1.0}
+        params.update(kwargs)
+        return PayrollEngine(self.mock_db, **params)
+    
+    def test_matches_calculate_pay(self):
+        """Тест: без настроек результат совпадает с Employee.calculate_pay"""
+        self.mock_db.execute_query.return_value = self.hours_rows
+        engine = self.make_engine()
+        
+        result = engine.compute(self.period, engine.load_hours(self.period))
+        
+        for row in result.itertuples():
+            employee = Employee('', row.position, row.salary, row.hours_worked)
+            self.assertAlmostEqual(row.pay, employee.calculate_pay())
+        # Часы ограничены задачами, завершенными внутри периода
+        query, params = self.mock_db.execute_query.call_args[0]
+        self.assertIn('completed_at', query)
+        self.assertEqual(params, (date(2026, 1, 1), date(2026, 2, 1)))
+    
+    def test_overtime_and_norms(self):
+        """Тест нормы по должности, по месяцу и сверхурочных"""
+        self.mock_db.execute_query.return_value = self.hours_rows
+        engine = self.make_engine(norms_by_month={'01': 120},
+                                  norms_by_position={'Менеджер': 100},
+                                  overtime_multiplier=2.0)
+        
+        result = engine.compute(self.period, engine.load_hours(self.period)).set_index('employee_id')
+        
+        self.assertEqual(result.loc[1, 'norm_hours'], 120)
+        self.assertAlmostEqual(result.loc[1, 'pay'], 100000 / 120 * 40)
+        self.assertEqual(result.loc[2, 'norm_hours'], 100)
+        self.assertEqual(result.loc[2, 'overtime_hours'], 100)
+        self.assertAlmostEqual(result.loc[2, 'pay'], 80000 / 100 * (100 + 100 * 2.0))
+    
+    def test_run_persists_only_changes(self):
+        """Тест инкрементального сохранения результатов"""
+        stored = [
+            (1, Decimal('40.00'), Decimal('100000.00'), Decimal('160.00'), Decimal('25000.00')),
+            (2, Decimal('150.00'), Decimal('80000.00'), Decimal('160.00'), Decimal('75000.00')),
+            (4, Decimal('1.00'), Decimal('1.00'), Decimal('160.00'), Decimal('0.01'))
+        ]
+        
+        def execute_query(query, params=None, fetch=False):
+            if 'FROM employees' in query:
+                return self.hours_rows
+            if 'FROM payroll_results' in query:
+                return stored
+            return None
+        
+        self.mock_db.execute_query.side_effect = execute_query
+        engine = self.make_engine()
+        
+        result = engine.run(self.period)
+        
+        self.assertEqual(list(result['changed']), [False, True, True])
+        query, rows = self.mock_db.execute_values.call_args[0]
+        self.assertIn('ON CONFLICT', query)
+        self.assertEqual([row[1] for row in rows], [2, 3])
+        self.assertEqual(rows[0][0], '2026-01')
+        # Удален результат сотрудника, которого больше нет
+        self.mock_db.execute_query.assert_any_call(
+            "DELETE FROM payroll_results WHERE period_key = %s AND employee_id = ANY(%s)",
+            ('2026-01', [4])
+        )
+    
+    def test_run_persist_failure(self):
+        """Тест: ошибка сохранения не выдается за успешный расчет"""
+        self.mock_db.execute_query.side_effect = lambda query, params=None, fetch=False: (
+            self.hours_rows if 'FROM employees' in query else [])
+        self.mock_db.execute_values.return_value = False
+        engine = self.make_engine()
+        
+        with self.assertRaises(RuntimeError):
+            engine.run(self.period)
+    
+    def test_run_without_persist(self):
+        """Тест расчета без сохранения"""
+        self.mock_db.execute_query.return_value = self.hours_rows
+        engine = self.make_engine()
+        
+        result = engine.run(self.period, persist=False)
+        
+        self.assertEqual(len(result), 3)
+        self.mock_db.execute_values.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
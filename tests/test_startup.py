@@ -0,0 +1,42 @@
+"""
+Тесты отложенного импорта тяжелых модулей при запуске
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+
+# Добавляем путь к проекту для импорта модулей
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_DIR)
+
+class TestStartupImports(unittest.TestCase):
+    """Тесты импорта модулей главного окна"""
+
+    def loaded_modules(self, code):
+        """Импортировать модули в отдельном процессе и вернуть sys.modules"""
+        result = subprocess.run(
+            [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        )
+        return set(result.stdout.split())
+
+    def test_main_window_does_not_import_pandas(self):
+        """Тест: pandas и numpy не загружаются до показа окна"""
+        modules = self.loaded_modules("import gui.main_window")
+        self.assertIn("gui.main_window", modules)
+        self.assertNotIn("pandas", modules)
+        self.assertNotIn("numpy", modules)
+
+    def test_analytics_loaded_on_access(self):
+        """Тест: TaskAnalytics импортируется при первом обращении"""
+        modules = self.loaded_modules("import utils")
+        self.assertNotIn("utils.analytics", modules)
+
+        modules = self.loaded_modules("from utils import TaskAnalytics")
+        self.assertIn("utils.analytics", modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
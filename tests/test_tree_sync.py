@@ -0,0 +1,108 @@
+"""
+Тесты для обновления Treeview по ключу
+"""
+
+import unittest
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.tree_sync import TreeReconciler, diff_rows
+
+class FakeTree:
+    """Заглушка ttk.Treeview, записывающая вызовы, изменяющие элементы"""
+    
+    def __init__(self, columns):
+        self.columns = columns
+        self.items = []
+        self.values = {}
+        self.calls = []
+    
+    def __getitem__(self, key):
+        return self.columns
+    
+    def get_children(self, parent=''):
+        return tuple(self.items)
+    
+    def delete(self, *iids):
+        self.calls.append(('delete',) + iids)
+        for iid in iids:
+            self.items.remove(iid)
+            del self.values[iid]
+    
+    def insert(self, parent, index, iid, values):
+        self.calls.append(('insert', iid))
+        self.items.insert(index, iid)
+        self.values[iid] = list(values)
+    
+    def set(self, iid, column, value):
+        self.calls.append(('set', iid, column))
+        self.values[iid][self.columns.index(column)] = value
+    
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+
+class TestTreeReconciler(unittest.TestCase):
+    """Тесты для класса TreeReconciler"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.tree = FakeTree(('ID', 'Название', 'Статус'))
+        self.reconciler = TreeReconciler(self.tree)
+        self.rows = [(i, (i, f"Задача {i}", "В процессе")) for i in range(1, 6)]
+        self.reconciler.apply(self.rows)
+        self.tree.calls.clear()
+    
+    def test_initial_insert(self):
+        """Тест первичной отрисовки"""
+        self.assertEqual(self.tree.items, ['1', '2', '3', '4', '5'])
+        self.assertEqual(self.tree.values['3'], [3, "Задача 3", "В процессе"])
+    
+    def test_no_changes_no_calls(self):
+        """Тест: без изменений Tk не вызывается"""
+        self.assertEqual(self.reconciler.apply(self.rows), ([], [], []))
+        self.assertEqual(self.tree.calls, [])
+    
+    def test_update_changed_cell_only(self):
+        """Тест: у измененной строки обновляется только измененная ячейка"""
+        rows = list(self.rows)
+        rows[2] = (3, (3, "Задача 3", "Завершено"))
+        
+        inserted, updated, removed = self.reconciler.apply(rows)
+        
+        self.assertEqual(updated, ['3'])
+        self.assertEqual(self.tree.calls, [('set', '3', 'Статус')])
+        self.assertEqual(self.tree.values['3'], [3, "Задача 3", "Завершено"])
+    
+    def test_insert_and_remove(self):
+        """Тест вставки и удаления строк"""
+        rows = [row for row in self.rows if row[0] != 2]
+        rows.insert(3, (10, (10, "Новая", "В процессе")))
+        
+        inserted, updated, removed = self.reconciler.apply(rows)
+        
+        self.assertEqual((inserted, updated, removed), (['10'], [], ['2']))
+        self.assertEqual(self.tree.items, ['1', '3', '4', '10', '5'])
+        self.assertEqual(self.tree.calls, [('delete', '2'), ('insert', '10')])
+    
+    def test_reorder(self):
+        """Тест изменения порядка строк (сортировка)"""
+        rows = list(reversed(self.rows))
+        self.reconciler.apply(rows)
+        self.assertEqual(self.tree.items, ['5', '4', '3', '2', '1'])
+        self.assertTrue(all(call[0] == 'move' for call in self.tree.calls))
+    
+    def test_diff_rows(self):
+        """Тест сравнения наборов строк"""
+        old = {1: ('a',), 2: ('b',), 3: ('c',)}
+        new = {1: ('a',), 3: ('C',), 4: ('d',)}
+        self.assertEqual(diff_rows(old, new), ([4], [3], [2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
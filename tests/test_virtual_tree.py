@@ -0,0 +1,94 @@
+"""
+Тесты для хранилища строк виртуализированной таблицы
+"""
+
+import unittest
+import sys
+import os
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.virtual_tree import RowStore
+
+class TestRowStore(unittest.TestCase):
+    """Тесты для класса RowStore"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.store = RowStore()
+        self.store.set_rows((i, (i, f"Задача {i}", float(i % 7))) for i in range(1, 101))
+    
+    def test_window(self):
+        """Тест получения окна видимых строк"""
+        window = self.store.window(10, 3)
+        self.assertEqual([row_id for row_id, _ in window], [11, 12, 13])
+        self.assertEqual(window[0][1], (11, "Задача 11", 4.0))
+        self.assertEqual(self.store.window(99, 10), [(100, (100, "Задача 100", 2.0))])
+    
+    def test_index_by_id(self):
+        """Тест индекса строк по id"""
+        self.assertEqual(len(self.store), 100)
+        self.assertIn(42, self.store)
+        self.assertEqual(self.store.index_of(42), 41)
+        self.assertIsNone(self.store.index_of(1000))
+        self.assertEqual(self.store.get(5), (5, "Задача 5", 5.0))
+    
+    def test_sort_is_kept_on_refresh(self):
+        """Тест: порядок сортировки сохраняется при замене строк"""
+        self.store.sort(lambda row_id, values: values[2], reverse=True)
+        self.assertEqual(self.store.get(self.store.ids()[0])[2], 6.0)
+        
+        self.store.set_rows([(1, (1, "A", 1.0)), (2, (2, "B", 3.0)), (3, (3, "C", 2.0))])
+        self.assertEqual(self.store.ids(), [2, 3, 1])
+        self.assertEqual(self.store.index_of(1), 2)
+    
+    def test_reset_sort(self):
+        """Тест возврата к исходному порядку"""
+        self.store.sort(lambda row_id, values: -row_id)
+        self.assertEqual(self.store.ids()[0], 100)
+        self.store.sort(None)
+        self.assertEqual(self.store.ids()[:3], [1, 2, 3])
+
+    
+    def test_sort_column_uses_typed_keys(self):
+        """Тест сортировки по колонке по предрассчитанным числовым ключам"""
+        rows = [(1, (1, "9.5")), (2, (2, "10.0")), (3, (3, "2.0"))]
+        keys = {1: (1, 9.5), 2: (2, 10.0), 3: (3, 2.0)}
+        self.store.set_rows(rows, keys)
+        
+        self.store.sort_column(1)
+        self.assertEqual(self.store.ids(), [3, 1, 2])
+        self.store.sort_column(1, reverse=True)
+        self.assertEqual(self.store.ids(), [2, 1, 3])
+    
+    def test_sort_column_without_keys(self):
+        """Тест сортировки по значениям при отсутствии ключей, пустые значения в конце"""
+        self.store.set_rows([(1, (1, "б")), (2, (2, None)), (3, (3, "а"))])
+        self.store.sort_column(1)
+        self.assertEqual(self.store.ids(), [3, 1, 2])
+    
+    def test_filter_columns(self):
+        """Тест фильтра по подстроке в колонке"""
+        self.store.filter_columns({1: "задача 1"})
+        self.assertEqual(len(self.store), 12)
+        self.assertTrue(self.store.is_visible(15))
+        self.assertFalse(self.store.is_visible(25))
+        self.assertIn(25, self.store)
+        
+        self.store.filter_columns({1: "задача 1", 2: "3.0"})
+        self.assertEqual(self.store.ids(), [10, 17])
+        
+        self.store.filter_columns({1: ""})
+        self.assertEqual(len(self.store), 100)
+    
+    def test_filter_and_sort_kept_on_refresh(self):
+        """Тест: фильтр и сортировка применяются к новым строкам"""
+        self.store.filter_columns({1: "x"})
+        self.store.sort_column(0, reverse=True)
+        self.store.set_rows([(1, (1, "x")), (2, (2, "y")), (3, (3, "xx"))])
+        self.assertEqual(self.store.ids(), [3, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
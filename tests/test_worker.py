@@ -0,0 +1,136 @@
+"""
+Тесты для фонового выполнения операций с БД
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+# Добавляем путь к проекту для импорта модулей
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gui.worker import BackgroundWorker
+
+class FakeRoot:
+    """Заглушка Tk: откладывает колбэки after до явного вызова run_pending"""
+    
+    def __init__(self):
+        self.callbacks = []
+    
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+    
+    def run_pending(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+
+class TestBackgroundWorker(unittest.TestCase):
+    """Тесты для класса BackgroundWorker"""
+    
+    def setUp(self):
+        """Подготовка тестовых данных"""
+        self.root = FakeRoot()
+        self.worker = BackgroundWorker(self.root)
+        self.busy_states = []
+        self.worker.add_busy_listener(self.busy_states.append)
+    
+    def tearDown(self):
+        self.worker.shutdown()
+    
+    def drain(self):
+        """Дождаться выполнения очереди и доставить результаты"""
+        done = threading.Event()
+        self.worker.submit(done.set)
+        done.wait(5)
+        self.root.run_pending()
+    
+    def test_result_delivered_on_main_thread(self):
+        """Тест доставки результата через root.after"""
+        results = []
+        main_thread = threading.current_thread()
+        
+        def on_success(result):
+            results.append((result, threading.current_thread() is main_thread))
+        
+        self.worker.submit(lambda: 42, on_success)
+        self.assertEqual(results, [])
+        self.drain()
+        
+        self.assertEqual(results, [(42, True)])
+        self.assertEqual(self.busy_states, [True, False])
+        self.assertFalse(self.worker.busy)
+    
+    def test_writes_keep_order(self):
+        """Тест: последовательные записи выполняются по порядку"""
+        executed = []
+        for i in range(20):
+            self.worker.submit(lambda i=i: executed.append(i))
+        self.drain()
+        self.assertEqual(executed, list(range(20)))
+    
+    def test_superseded_refresh_cancelled(self):
+        """Тест: новое обновление с тем же ключом отменяет предыдущее"""
+        gate = threading.Event()
+        delivered = []
+        self.worker.submit(gate.wait)
+        self.worker.submit(lambda: 'old', delivered.append, key='tasks')
+        self.worker.submit(lambda: 'new', delivered.append, key='tasks')
+        self.worker.submit(lambda: 'other', delivered.append, key='projects')
+        gate.set()
+        self.drain()
+        self.assertEqual(delivered, ['new', 'other'])
+    
+    def test_cancel(self):
+        """Тест явной отмены задания"""
+        gate = threading.Event()
+        delivered = []
+        self.worker.submit(gate.wait)
+        self.worker.submit(lambda: 'value', delivered.append, key='employees')
+        self.worker.cancel('employees')
+        gate.set()
+        self.drain()
+        self.assertEqual(delivered, [])
+    
+    def test_release(self):
+        """Тест: освобожденный ключ отменяет задания и не хранится"""
+        gate = threading.Event()
+        delivered = []
+        self.worker.submit(gate.wait)
+        self.worker.submit(lambda: 'value', delivered.append, key='lookup-1')
+        self.worker.release('lookup-1')
+        gate.set()
+        self.drain()
+        self.assertEqual(delivered, [])
+        self.assertNotIn('lookup-1', self.worker._generations)
+        self.assertEqual(self.worker._key_jobs, {})
+    
+    def test_release_keeps_stale_job_stale(self):
+        """Тест: задание, поставленное до освобождения ключа, не оживает после нового submit"""
+        gate = threading.Event()
+        delivered = []
+        self.worker.submit(gate.wait)
+        self.worker.submit(lambda: 'stale', delivered.append, key='lookup-1')
+        self.worker.release('lookup-1')
+        self.worker.submit(lambda: 'fresh', delivered.append, key='lookup-1')
+        gate.set()
+        self.drain()
+        self.assertEqual(delivered, ['fresh'])
+        self.assertEqual(self.worker._generations, {'lookup-1': 3})
+    
+    def test_error_callback(self):
+        """Тест передачи исключения в on_error"""
+        errors = []
+        
+        def fail():
+            raise RuntimeError("Ошибка БД")
+        
+        self.worker.submit(fail, on_error=errors.append)
+        self.drain()
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], RuntimeError)
+
+
+if __name__ == '__main__':
+    unittest.main()
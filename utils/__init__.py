@@ -2,14 +2,40 @@
 Утилиты приложения
 """
 
-from .data_processing import extract_emails, clean_csv_data, get_csv_stats
-from .file_operations import export_to_csv, save_cleaned_csv, get_file_info
+from .data_processing import (extract_emails, unique_emails, clean_csv_data, get_csv_stats,
+                              CsvStatsAccumulator, clean_csv_file)
+from .file_operations import (export_to_csv, export_filename, save_cleaned_csv, get_file_info,
+                              read_csv, resolve_csv_engine, CsvChunkWriter,
+                              read_columnar, export_columnar)
+from .batch import clean_csv_directory, format_batch_summary
+from .emails import extract_emails_from_files, save_emails_csv
+
+def __getattr__(name):
+    """Отложенный импорт модулей, зависящих от pandas"""
+    if name == 'TaskAnalytics':
+        from .analytics import TaskAnalytics
+        return TaskAnalytics
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'extract_emails', 
+    'unique_emails',
+    'extract_emails_from_files',
+    'save_emails_csv',
     'clean_csv_data', 
     'get_csv_stats',
+    'CsvStatsAccumulator',
+    'clean_csv_file',
     'export_to_csv', 
+    'export_filename',
     'save_cleaned_csv', 
-    'get_file_info'
+    'get_file_info',
+    'read_csv',
+    'resolve_csv_engine',
+    'CsvChunkWriter',
+    'read_columnar',
+    'export_columnar',
+    'clean_csv_directory',
+    'format_batch_summary',
+    'TaskAnalytics'
 ]
\ No newline at end of file
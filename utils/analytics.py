@@ -0,0 +1,87 @@
+"""
+Векторизованная аналитика по задачам, сотрудникам и проектам
+"""
+
+import numpy as np
+import pandas as pd
+
+import config
+
+COMPLETED_STATUS = "Завершено"
+
+class TaskAnalytics:
+    """Агрегаты по задачам, посчитанные group-by по колоночному фрейму"""
+
+    def __init__(self, tasks, employees, projects):
+        self.tasks = tasks
+        self.employees = employees
+        self.projects = projects
+
+    @classmethod
+    def from_db(cls, db_manager):
+        """Загрузить данные одним проходом (три запроса на все вкладки)"""
+        return cls.from_table(
+            db_manager.get_task_table(),
+            db_manager.get_employee_rows(),
+            db_manager.get_project_rows()
+        )
+
+    @classmethod
+    def from_table(cls, table, employee_rows, project_rows):
+        """Построить фреймы из TaskTable и строк сотрудников/проектов"""
+        codes = np.array(table.status_codes, dtype=np.uint8)
+        if COMPLETED_STATUS in table.statuses:
+            completed = codes == table.statuses.index(COMPLETED_STATUS)
+        else:
+            completed = np.zeros(len(table), dtype=bool)
+
+        tasks = pd.DataFrame({
+            'id': np.array(table.ids, dtype=np.int64),
+            'hours': np.array(table.hours, dtype=np.float64),
+            'completed': completed,
+            'employee_id': np.array(table.employee_ids, dtype=np.int64),
+            'project_id': np.array(table.project_ids, dtype=np.int64)
+        })
+        tasks['completed_hours'] = tasks['hours'].where(tasks['completed'], 0.0)
+
+        employees = pd.DataFrame(
+            list(employee_rows), columns=['id', 'name', 'position', 'salary']
+        ).set_index('id')
+        employees['salary'] = employees['salary'].astype(np.float64)
+
+        projects = pd.DataFrame(list(project_rows), columns=['id', 'title']).set_index('id')
+        return cls(tasks, employees, projects)
+
+    def _group(self, key):
+        grouped = self.tasks[self.tasks[key] != 0].groupby(key)
+        return grouped.agg(
+            total_tasks=('id', 'size'),
+            completed_tasks=('completed', 'sum'),
+            total_hours=('hours', 'sum'),
+            completed_hours=('completed_hours', 'sum')
+        )
+
+    def project_summary(self):
+        """Сводка по проектам: задачи, прогресс (%) и часы"""
+        summary = self.projects.join(self._group('project_id'))
+        summary = summary.fillna({
+            'total_tasks': 0, 'completed_tasks': 0,
+            'total_hours': 0.0, 'completed_hours': 0.0
+        })
+        summary[['total_tasks', 'completed_tasks']] = (
+            summary[['total_tasks', 'completed_tasks']].astype(np.int64)
+        )
+        total = summary['total_tasks'].to_numpy()
+        summary['progress'] = np.divide(
+            summary['completed_tasks'].to_numpy() * 100.0, total,
+            out=np.zeros(len(summary)), where=total > 0
+        )
+        return summary
+
+    def employee_summary(self):
+        """Сводка по сотрудникам: отработанные часы, заработок, завершенные задачи"""
+        summary = self.employees.join(self._group('employee_id'))
+        summary['hours_worked'] = summary['completed_hours'].fillna(0.0)
+        summary['completed_tasks'] = summary['completed_tasks'].fillna(0).astype(np.int64)
+        summary['pay'] = summary['salary'] / config.PAYROLL_NORM_HOURS * summary['hours_worked']
+        return summary[['name', 'position', 'salary', 'hours_worked', 'pay', 'completed_tasks']]
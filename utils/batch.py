@@ -0,0 +1,174 @@
+"""
+Пакетная очистка CSV файлов каталога
+"""
+
+import json
+import os
+
+import config
+from .data_processing import clean_csv_file
+from .file_operations import get_file_info, cleaned_csv_path
+
+CLEANED_SUFFIX = "_cleaned.csv"
+
+def list_csv_files(directory):
+    """CSV файлы каталога по имени, без результатов предыдущей очистки"""
+    with os.scandir(directory) as entries:
+        paths = [
+            entry.path for entry in entries
+            if entry.is_file()
+            and entry.name.lower().endswith('.csv')
+            and not entry.name.endswith(CLEANED_SUFFIX)
+        ]
+    return sorted(paths)
+
+def load_manifest(path=None):
+    """Манифест прошлых запусков: {путь к файлу: запись}"""
+    path = path or config.CSV_BATCH_MANIFEST
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest, path=None):
+    """Сохранить манифест через временный файл, чтобы не оставить его обрезанным"""
+    path = str(path or config.CSV_BATCH_MANIFEST)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def file_signature(filepath):
+    """Размер и время изменения файла из get_file_info"""
+    info = get_file_info(filepath)
+    return {'size': info['size'], 'modified': info['modified'].isoformat()}
+
+def _batch_output_path(filepath, output_dir):
+    if output_dir:
+        return os.path.join(output_dir, os.path.basename(cleaned_csv_path(filepath)))
+    return cleaned_csv_path(filepath)
+
+def _is_unchanged(entry, signature, output_path):
+    return (entry is not None
+            and entry['size'] == signature['size']
+            and entry['modified'] == signature['modified']
+            and entry['output_path'] == output_path
+            and os.path.exists(output_path))
+
+def _clean_batch_file(filepath, output_path, engine):
+    """Очистить один файл пакета (выполняется в процессе пула)"""
+    result = clean_csv_file(filepath, output_path, preview_rows=0, workers=1, engine=engine)
+    stats = result['stats']
+    return {
+        'output_path': output_path,
+        'columns': result['columns'],
+        'total_rows': stats['total_rows'],
+        'cleaned_rows': result['cleaned_rows'],
+        'missing_values': {column: int(count) for column, count in stats['missing_values'].items()}
+    }
+
+def _run_batch(jobs, workers, engine):
+    """Выполнить очистку файлов; выдает (путь, запись или None, ошибка или None)"""
+    if workers <= 1:
+        for filepath, output_path in jobs:
+            try:
+                yield filepath, _clean_batch_file(filepath, output_path, engine), None
+            except Exception as e:
+                yield filepath, None, e
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_clean_batch_file, filepath, output_path, engine): filepath
+            for filepath, output_path in jobs
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+
+def clean_csv_directory(directory, output_dir=None, workers=None, engine=None,
+                        manifest_path=None, force=False):
+    """Очистить все CSV файлы каталога в пуле из workers процессов.
+
+    Файлы, размер и время изменения которых совпадают с манифестом прошлого
+    запуска, пропускаются (если очищенный файл на месте), а их статистика
+    берется из манифеста. force=True очищает все файлы заново. Возвращает
+    сводку с записями по файлам и общей статистикой.
+    """
+    workers = workers or config.CSV_BATCH_WORKERS
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+
+    files = []
+    jobs = []
+    signatures = {}
+    for filepath in list_csv_files(directory):
+        key = os.path.abspath(filepath)
+        signature = file_signature(filepath)
+        output_path = _batch_output_path(filepath, output_dir)
+        if not force and _is_unchanged(manifest.get(key), signature, output_path):
+            files.append(dict(manifest[key], path=filepath, status='skipped'))
+        else:
+            # Подпись берется до очистки: файл, измененный во время нее, очистится снова
+            signatures[filepath] = signature
+            jobs.append((filepath, output_path))
+
+    try:
+        for filepath, entry, error in _run_batch(jobs, workers, engine):
+            if error is not None:
+                files.append({'path': filepath, 'status': 'failed', 'error': str(error)})
+                continue
+            key = os.path.abspath(filepath)
+            manifest[key] = dict(entry, **signatures[filepath])
+            files.append(dict(manifest[key], path=filepath, status='cleaned'))
+    finally:
+        # Манифест сохраняется и при прерывании: готовые файлы не очищаются повторно
+        save_manifest(manifest, manifest_path)
+
+    files.sort(key=lambda entry: entry['path'])
+    return summarize_batch(files)
+
+def summarize_batch(files):
+    """Общая статистика по записям файлов пакета"""
+    missing_values = {}
+    processed = [entry for entry in files if entry['status'] != 'failed']
+    for entry in processed:
+        for column, count in entry['missing_values'].items():
+            missing_values[column] = missing_values.get(column, 0) + count
+    return {
+        'files': files,
+        'total_files': len(files),
+        'cleaned': sum(entry['status'] == 'cleaned' for entry in files),
+        'skipped': sum(entry['status'] == 'skipped' for entry in files),
+        'failed': sum(entry['status'] == 'failed' for entry in files),
+        'total_rows': sum(entry['total_rows'] for entry in processed),
+        'cleaned_rows': sum(entry['cleaned_rows'] for entry in processed),
+        'missing_values': missing_values,
+        'total_missing': sum(missing_values.values())
+    }
+
+def format_batch_summary(summary):
+    """Строки отчета о пакетной очистке для GUI и командной строки"""
+    lines = [
+        f"Файлов: {summary['total_files']} (очищено: {summary['cleaned']}, "
+        f"без изменений: {summary['skipped']}, ошибок: {summary['failed']})",
+        f"Записей в исходных файлах: {summary['total_rows']}",
+        f"Записей после удаления пустых значений: {summary['cleaned_rows']}",
+        f"Удалено записей: {summary['total_rows'] - summary['cleaned_rows']}",
+    ]
+    for column, count in summary['missing_values'].items():
+        if count > 0:
+            lines.append(f"  {column}: {count} пропущенных значений")
+    status_names = {'cleaned': 'очищен', 'skipped': 'без изменений', 'failed': 'ошибка'}
+    lines.append("")
+    for entry in summary['files']:
+        name = os.path.basename(entry['path'])
+        if entry['status'] == 'failed':
+            lines.append(f"{name}: {status_names['failed']} - {entry['error']}")
+        else:
+            lines.append(f"{name}: {status_names[entry['status']]}, "
+                         f"{entry['total_rows']} -> {entry['cleaned_rows']} записей")
+    return lines
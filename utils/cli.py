@@ -0,0 +1,102 @@
+"""
+Обработка CSV из командной строки (без GUI)
+
+Запуск: python -m utils.cli clean ФАЙЛ [-o ВЫХОДНОЙ_ФАЙЛ] [--workers N] [--chunksize N]
+                                 [--engine c|pyarrow] [--columns A,B]
+        python -m utils.cli batch КАТАЛОГ [-o КАТАЛОГ_РЕЗУЛЬТАТОВ] [--workers N]
+                                 [--engine c|pyarrow] [--force]
+        python -m utils.cli emails ПУТЬ [ПУТЬ ...] [-o ФАЙЛ.csv] [--workers N]
+"""
+
+import argparse
+import sys
+
+import config
+from .data_processing import clean_csv_file
+from .batch import clean_csv_directory, format_batch_summary
+from .emails import extract_emails_from_files, save_emails_csv
+
+def print_clean_result(result, filepath):
+    """Вывести итог очистки файла"""
+    stats = result['stats']
+    removed = stats['total_rows'] - result['cleaned_rows']
+    print(f"Исходный файл: {filepath}")
+    print(f"Очищенный файл: {result['output_path']}")
+    print(f"Записей в исходном файле: {stats['total_rows']}")
+    print(f"Записей после удаления пустых значений: {result['cleaned_rows']}")
+    print(f"Удалено записей: {removed}")
+    for column, count in stats['missing_values'].items():
+        if count > 0:
+            print(f"  {column}: {count} пропущенных значений")
+
+def command_clean(args):
+    result = clean_csv_file(args.file, args.output, chunksize=args.chunksize,
+                            workers=args.workers, engine=args.engine,
+                            columns=args.columns.split(',') if args.columns else None)
+    print_clean_result(result, args.file)
+    return 0
+
+def command_batch(args):
+    summary = clean_csv_directory(args.directory, args.output, workers=args.workers,
+                                  engine=args.engine, force=args.force)
+    print("\n".join(format_batch_summary(summary)))
+    return 1 if summary['failed'] else 0
+
+def command_emails(args):
+    matches = extract_emails_from_files(args.paths, workers=args.workers)
+    if args.output:
+        save_emails_csv(matches, args.output)
+        print(f"Найдено адресов: {len(matches)}, сохранено в {args.output}")
+    else:
+        for match in matches:
+            print(match.email)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m utils.cli",
+                                     description="Обработка CSV файлов учета времени")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    clean = commands.add_parser("clean", help="удалить строки с пустыми значениями")
+    clean.add_argument("file", help="исходный файл CSV, Parquet или Feather")
+    clean.add_argument("-o", "--output", help="путь к очищенному файлу (по умолчанию *_cleaned.csv)")
+    clean.add_argument("--workers", type=int, default=config.CSV_WORKERS,
+                       help="количество процессов (по умолчанию %(default)s)")
+    clean.add_argument("--chunksize", type=int, default=config.CSV_CHUNK_SIZE,
+                       help="строк в части при последовательной обработке")
+    clean.add_argument("--engine", choices=config.CSV_ENGINES, default=config.CSV_ENGINE,
+                       help="движок чтения CSV; без pyarrow используется c (по умолчанию %(default)s)")
+    clean.add_argument("--columns",
+                       help="колонки Parquet/Feather через запятую (по умолчанию все)")
+    clean.set_defaults(func=command_clean)
+
+    batch = commands.add_parser("batch", help="очистить все CSV файлы каталога")
+    batch.add_argument("directory", help="каталог с CSV файлами")
+    batch.add_argument("-o", "--output", help="каталог для очищенных файлов (по умолчанию рядом с исходными)")
+    batch.add_argument("--workers", type=int, default=config.CSV_BATCH_WORKERS,
+                       help="файлов, очищаемых одновременно (по умолчанию %(default)s)")
+    batch.add_argument("--engine", choices=config.CSV_ENGINES, default=config.CSV_ENGINE,
+                       help="движок чтения CSV (по умолчанию %(default)s)")
+    batch.add_argument("--force", action="store_true",
+                       help="очистить и файлы, не изменившиеся с прошлого запуска")
+    batch.set_defaults(func=command_batch)
+
+    emails = commands.add_parser("emails", help="найти email-адреса в файлах и каталогах")
+    emails.add_argument("paths", nargs="+", help="файлы или каталоги (просматриваются рекурсивно)")
+    emails.add_argument("-o", "--output", help="сохранить адреса в CSV (email, count, source)")
+    emails.add_argument("--workers", type=int, default=config.EMAIL_SCAN_WORKERS,
+                        help="количество процессов (по умолчанию %(default)s)")
+    emails.set_defaults(func=command_emails)
+    return parser
+
+def main(argv=None):
+    """Точка входа командной строки; возвращает код завершения"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except FileNotFoundError as e:
+        print(f"Файл не найден: {e.filename}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
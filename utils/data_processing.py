@@ -2,34 +2,233 @@
 Утилиты для обработки данных
 """
 
+import os
 import re
-import pandas as pd
-import numpy as np
+import shutil
+import tempfile
+
+import config
+from .file_operations import (read_csv, read_csv_range, split_csv_ranges,
+                              cleaned_csv_path, resolve_csv_engine, CsvChunkWriter,
+                              columnar_format, read_columnar, read_columnar_schema,
+                              ColumnarChunkWriter)
+
+# pandas не импортируется на уровне модуля: функции работают с переданным
+# DataFrame, а сам pandas загружается при первом вызове
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
 
 def extract_emails(text):
     """Находит все email-адреса в строке"""
-    pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(pattern, text)
+    return EMAIL_PATTERN.findall(text)
 
-def clean_csv_data(df):
-    """Очищает csv от строк с пустыми значениями"""
-    df = df.replace(r'^\s*$', np.nan, regex=True)
-    df_cleaned = df.dropna()
-    return df_cleaned
+def unique_emails(emails):
+    """Адреса без повторов без учета регистра, в порядке первого появления"""
+    seen = {}
+    for email in emails:
+        seen.setdefault(email.lower(), email)
+    return list(seen.values())
 
-def get_csv_stats(df):
-    """Получить статистику по DataFrame"""
+def blank_mask(df):
+    r"""Маска пустых ячеек (NaN, пустая строка или только пробелы) как numpy-массив.
+    
+    Эквивалентна df.replace(r'^\s*$', NaN, regex=True).isna(), но вычисляется
+    векторными строковыми операциями без копии DataFrame. Колонки object,
+    в которых не только строки (например, логические значения), проверяются
+    поэлементно: аксессор .str для них недоступен.
+    """
+    from pandas.api.types import infer_dtype, is_object_dtype, is_string_dtype
+    
+    mask = df.isna().to_numpy(dtype=bool, copy=True)
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if is_object_dtype(column.dtype) and infer_dtype(column, skipna=True) != 'string':
+            blank = column.map(lambda value: isinstance(value, str) and not value.strip())
+            mask[:, position] |= blank.to_numpy(dtype=bool)
+        elif is_object_dtype(column.dtype) or is_string_dtype(column.dtype):
+            text = column.str
+            blank = (text.len() == 0) | text.isspace().fillna(False).astype(bool)
+            mask[:, position] |= blank.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+def analyze_and_clean(df):
+    """Статистика get_csv_stats и очищенный DataFrame за один проход.
+    
+    Маска пустых значений вычисляется один раз и используется
+    и для подсчета пропусков, и для удаления строк.
+    """
+    import pandas as pd
+    
+    mask = blank_mask(df)
+    empty_counts = pd.Series(mask.sum(axis=0), index=df.columns)
     stats = {
         'total_rows': len(df),
         'total_columns': len(df.columns),
         'columns': list(df.columns),
-        'dtypes': df.dtypes.to_dict()
+        'dtypes': df.dtypes.to_dict(),
+        'missing_values': empty_counts.to_dict(),
+        'total_missing': int(mask.sum())
     }
+    cleaned = df[~mask.any(axis=1)]
+    return stats, cleaned
+
+def clean_csv_data(df):
+    """Очищает csv от строк с пустыми значениями"""
+    return df[~blank_mask(df).any(axis=1)]
+
+def get_csv_stats(df):
+    """Получить статистику по DataFrame"""
+    stats, _ = analyze_and_clean(df)
+    return stats
+
+class CsvStatsAccumulator:
+    """Статистика get_csv_stats, накапливаемая по частям файла"""
+    
+    def __init__(self):
+        self.total_rows = 0
+        self.columns = None
+        self.dtypes = {}
+        self.missing_values = {}
+    
+    def add(self, chunk):
+        """Учесть очередную часть DataFrame"""
+        self.merge(get_csv_stats(chunk))
+    
+    def merge(self, stats):
+        """Учесть статистику части в формате get_csv_stats"""
+        if self.columns is None:
+            self.columns = list(stats['columns'])
+            self.dtypes = dict(stats['dtypes'])
+            self.missing_values = {column: 0 for column in self.columns}
+        else:
+            # Разные типы в частях сводятся к object, как при чтении целиком
+            for column, dtype in stats['dtypes'].items():
+                if self.dtypes.get(column) != dtype:
+                    self.dtypes[column] = object
+        
+        self.total_rows += stats['total_rows']
+        for column, count in stats['missing_values'].items():
+            self.missing_values[column] += int(count)
+    
+    def result(self):
+        """Словарь в формате get_csv_stats"""
+        columns = self.columns or []
+        return {
+            'total_rows': self.total_rows,
+            'total_columns': len(columns),
+            'columns': list(columns),
+            'dtypes': dict(self.dtypes),
+            'missing_values': dict(self.missing_values),
+            'total_missing': sum(self.missing_values.values())
+        }
+
+def clean_csv_file(filepath, output_path=None, chunksize=None, preview_rows=10, workers=None,
+                   engine=None, columns=None):
+    """Потоковая очистка CSV файла: память ограничена размером части.
+    
+    Каждая часть очищается analyze_and_clean и дописывается в выходной файл,
+    статистика накапливается по частям. Результат совпадает с очисткой
+    файла, прочитанного целиком через read_csv. При workers > 1 диапазоны
+    файла очищаются в пуле процессов, а результат остается побайтно тем же.
+    engine выбирает движок чтения (см. read_csv) и не влияет на результат.
+    
+    Файлы Parquet/Feather читаются по частям через pyarrow, причем только
+    колонки columns (по умолчанию все); очищенный файл сохраняется в том же
+    формате с исходными типами колонок.
+    """
+    import pandas as pd
     
-    # Подсчет пропущенных значений
-    df_for_stats = df.replace(r'^\s*$', np.nan, regex=True)
-    empty_counts = df_for_stats.isna().sum()
-    stats['missing_values'] = empty_counts.to_dict()
-    stats['total_missing'] = empty_counts.sum()
+    output_path = output_path or cleaned_csv_path(filepath)
+    workers = workers or config.CSV_WORKERS
+    engine = resolve_csv_engine(engine)
+    if columnar_format(filepath):
+        # Колоночный файл читается многопоточно самим pyarrow, пул процессов не нужен
+        parts = _clean_columnar_chunks(filepath, output_path, chunksize, preview_rows, columns)
+    elif workers > 1:
+        parts = _clean_csv_parallel(filepath, output_path, workers, preview_rows, engine)
+    else:
+        parts = _clean_csv_chunks(filepath, output_path, chunksize, preview_rows, engine)
     
-    return stats
\ No newline at end of file
+    stats = CsvStatsAccumulator()
+    cleaned_rows = 0
+    preview = []
+    for part_stats, part_rows, part_preview in parts:
+        stats.merge(part_stats)
+        cleaned_rows += part_rows
+        shown = sum(len(part) for part in preview)
+        if shown < preview_rows:
+            preview.append(part_preview.head(preview_rows - shown))
+    
+    result = stats.result()
+    return {
+        'stats': result,
+        'cleaned_rows': cleaned_rows,
+        'output_path': output_path,
+        'columns': result['columns'],
+        'preview': pd.concat(preview) if preview else pd.DataFrame(columns=result['columns'])
+    }
+
+def _clean_csv_chunks(filepath, output_path, chunksize, preview_rows, engine=None):
+    """Последовательная очистка по частям: (статистика, строк, первые строки)"""
+    with CsvChunkWriter(output_path) as writer:
+        for chunk in read_csv(filepath, chunksize=chunksize or config.CSV_CHUNK_SIZE,
+                              engine=engine):
+            chunk_stats, cleaned = analyze_and_clean(chunk)
+            writer.write(cleaned)
+            yield chunk_stats, len(cleaned), cleaned.head(preview_rows)
+
+def _clean_columnar_chunks(filepath, output_path, chunksize, preview_rows, columns=None):
+    """Очистка Parquet/Feather по частям с записью в формате выходного файла"""
+    import pyarrow as pa
+    schema = read_columnar_schema(filepath)
+    if columns:
+        schema = pa.schema([schema.field(name) for name in columns])
+    if columnar_format(output_path):
+        writer = ColumnarChunkWriter(output_path, schema)
+    else:
+        writer = CsvChunkWriter(output_path)
+    with writer:
+        for chunk in read_columnar(filepath, columns, chunksize or config.CSV_CHUNK_SIZE):
+            chunk_stats, cleaned = analyze_and_clean(chunk)
+            writer.write(cleaned)
+            yield chunk_stats, len(cleaned), cleaned.head(preview_rows)
+
+def _clean_csv_range(filepath, header, start, end, part_path, write_header, preview_rows,
+                     engine=None):
+    """Очистить диапазон байтов CSV в отдельном процессе и записать его часть"""
+    chunk = read_csv_range(filepath, header, start, end, engine=engine)
+    chunk_stats, cleaned = analyze_and_clean(chunk)
+    if write_header or len(cleaned):
+        with CsvChunkWriter(part_path, header=write_header) as writer:
+            writer.write(cleaned)
+    return chunk_stats, len(cleaned), cleaned.head(preview_rows)
+
+def _clean_csv_parallel(filepath, output_path, workers, preview_rows, engine=None):
+    """Очистка диапазонов файла в пуле процессов со сборкой в исходном порядке"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    header, ranges = split_csv_ranges(filepath)
+    # Файл только с заголовком: одна пустая часть, чтобы записать заголовок
+    ranges = ranges or [(len(header), len(header))]
+    part_dir = tempfile.mkdtemp(prefix='csv_parts_',
+                                dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool, open(output_path, 'wb') as output:
+            futures = [
+                pool.submit(_clean_csv_range, filepath, header, start, end,
+                            os.path.join(part_dir, f"{index}.csv"), index == 0, preview_rows,
+                            engine)
+                for index, (start, end) in enumerate(ranges)
+            ]
+            # Части дописываются по порядку по мере готовности и сразу удаляются
+            for index, future in enumerate(futures):
+                result = future.result()
+                part_path = os.path.join(part_dir, f"{index}.csv")
+                if os.path.exists(part_path):
+                    with open(part_path, 'rb') as part:
+                        shutil.copyfileobj(part, output)
+                    os.remove(part_path)
+                yield result
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
@@ -0,0 +1,169 @@
+"""
+Поиск email-адресов в файлах и каталогах
+"""
+
+import csv
+import mmap
+import os
+from collections import namedtuple
+
+import config
+from .data_processing import EMAIL_PATTERN
+
+EmailMatch = namedtuple('EmailMatch', ['email', 'count', 'source'])
+
+def _at_positions(mm, start, end):
+    """Позиции '@' в байтах [start, end)"""
+    positions = []
+    at = mm.find(b'@', start, end)
+    while at >= 0:
+        positions.append(at)
+        at = mm.find(b'@', at + 1, end)
+    return positions
+
+def _at_window(mm, at, window):
+    """Байты вокруг '@', где может быть его адрес: не дальше window и до переводов строк"""
+    low = max(0, at - window)
+    newline = mm.rfind(b'\n', low, at)
+    if newline >= 0:
+        low = newline + 1
+    high = min(len(mm), at + window + 1)
+    newline = mm.find(b'\n', at, high)
+    if newline >= 0:
+        high = newline
+    return low, high
+
+def scan_email_range(mm, start=0, end=None):
+    r"""Адреса, символ '@' которых находится в байтах [start, end) файла mm.
+
+    В каждом адресе ровно один '@', поэтому адрес относится к одной части
+    файла, и части можно брать по любым смещениям: адрес на границе не
+    теряется и не дублируется. Декодируется не строка целиком, а окно вокруг
+    каждого '@' (не больше config.EMAIL_SCAN_WINDOW_BYTES байтов в каждую
+    сторону и не за переводом строки; пересекающиеся окна объединяются),
+    поэтому длинные строки и файлы без переводов строк делятся на части так
+    же, как обычные. Окна проверяются тем же EMAIL_PATTERN, что и в
+    extract_emails, поэтому границы слов (\b с учетом кириллицы) совпадают
+    с поиском по тексту для адресов не длиннее окна.
+    """
+    end = len(mm) if end is None else min(end, len(mm))
+    window = config.EMAIL_SCAN_WINDOW_BYTES
+    emails = []
+    at = mm.find(b'@', start, end)
+    if at < 0:
+        return emails
+    low, high = _at_window(mm, at, window)
+    positions = [at]
+    # Окно '@' перед частью может пересекаться с окном первого '@' части
+    previous = mm.rfind(b'@', max(0, start - 2 * window), start)
+    if previous >= 0:
+        previous_low, previous_high = _at_window(mm, previous, window)
+        if previous_high > low:
+            low = previous_low
+            positions = _at_positions(mm, low, start) + positions
+
+    while at >= 0:
+        # Пересекающиеся окна следующих '@' части объединяются в одно
+        following = mm.find(b'@', at + 1, end)
+        while following >= 0:
+            following_low, following_high = _at_window(mm, following, window)
+            if following_low >= high:
+                break
+            high = following_high
+            positions.append(following)
+            following = mm.find(b'@', following + 1, end)
+        # '@' следующей части, попавшие в окно, нужны только для нумерации
+        positions.extend(_at_positions(mm, max(end, positions[-1] + 1), high))
+
+        text = mm[low:high].decode('utf-8', errors='replace')
+        # '@' - однобайтовый символ, поэтому k-й '@' текста - k-й '@' окна в байтах
+        index = 0
+        counted = 0
+        for match in EMAIL_PATTERN.finditer(text):
+            index += text.count('@', counted, match.start())
+            counted = match.start()
+            if start <= positions[index] < end:
+                emails.append(match.group())
+        at = following
+        if at >= 0:
+            low, high = following_low, following_high
+            positions = [at]
+    return emails
+
+def scan_email_file(path, start=0, end=None):
+    """Адреса файла (или его части) в порядке появления"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return scan_email_range(mm, start, end)
+
+def _count_emails(path, start, end):
+    """Адреса части файла без повторов: {адрес в нижнем регистре: [адрес, количество]}.
+
+    Выполняется в процессе пула; в главный процесс передаются только
+    уникальные адреса, а не все совпадения.
+    """
+    found = {}
+    for email in scan_email_file(path, start, end):
+        entry = found.setdefault(email.lower(), [email, 0])
+        entry[1] += 1
+    return found
+
+def list_email_sources(paths):
+    """Файлы для поиска: файлы из paths и все файлы каталогов (рекурсивно)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+    return files
+
+def _file_ranges(files, range_bytes):
+    """Части файлов по range_bytes байтов: (путь, начало, конец)"""
+    for path in files:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), range_bytes):
+            yield path, start, min(start + range_bytes, size)
+
+def extract_emails_from_files(paths, workers=None, range_bytes=None):
+    """Найти адреса в файлах и каталогах.
+
+    Большие файлы делятся на части по range_bytes байтов, части
+    просматриваются в пуле из workers процессов. Повторы объединяются без
+    учета регистра. Возвращает список EmailMatch (адрес в первом
+    встреченном написании, количество, файл первого появления) в порядке
+    первого появления.
+    """
+    workers = workers or config.EMAIL_SCAN_WORKERS
+    range_bytes = range_bytes or config.EMAIL_SCAN_RANGE_BYTES
+    ranges = list(_file_ranges(list_email_sources(paths), range_bytes))
+
+    if workers > 1 and len(ranges) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map сохраняет порядок частей, поэтому порядок адресов не зависит от пула
+            results = list(pool.map(_count_emails, *zip(*ranges)))
+    else:
+        results = [_count_emails(path, start, end) for path, start, end in ranges]
+
+    found = {}
+    for (path, _, _), counts in zip(ranges, results):
+        for key, (email, count) in counts.items():
+            match = found.get(key)
+            if match is None:
+                found[key] = EmailMatch(email, count, path)
+            else:
+                found[key] = match._replace(count=match.count + count)
+    return list(found.values())
+
+def save_emails_csv(matches, path):
+    """Сохранить найденные адреса в CSV (email, count, source)"""
+    with open(path, 'w', encoding=config.CSV_ENCODING, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EmailMatch._fields)
+        writer.writerows(matches)
+    return path
@@ -0,0 +1,192 @@
+"""
+Фоновые выгрузки данных из БД с прогрессом и отменой
+"""
+
+import os
+import queue
+import threading
+
+import config
+from database.db_connection import DatabaseConnection
+from database.db_manager import DatabaseManager
+from .file_operations import export_filename, write_columnar
+
+EXPORT_ENTITIES = ('employees', 'tasks', 'projects')
+
+# Пути, выбранные незавершенными выгрузками
+_claimed_paths = set()
+_claimed_lock = threading.Lock()
+
+def claim_export_path(path):
+    """Занять свободное имя файла выгрузки: path, иначе <имя>_1, <имя>_2 ...
+
+    Имя занято, если существует файл или его .part либо имя выбрано
+    незавершенной выгрузкой. Имя в export_filename точно до секунды, поэтому
+    две выгрузки, запущенные в одну секунду, иначе писали бы в один файл.
+    """
+    base, extension = os.path.splitext(path)
+    candidate = path
+    index = 0
+    with _claimed_lock:
+        while (candidate in _claimed_paths or os.path.exists(candidate)
+               or os.path.exists(candidate + '.part')):
+            index += 1
+            candidate = f"{base}_{index}{extension}"
+        _claimed_paths.add(candidate)
+    return candidate
+
+def release_export_path(path):
+    with _claimed_lock:
+        _claimed_paths.discard(path)
+
+class ExportCancelled(Exception):
+    """Выгрузка отменена пользователем"""
+
+class ExportJob:
+    """Выгрузка одной сущности в CSV, Parquet или Feather.
+
+    Выполняется в рабочем потоке через собственное подключение к БД,
+    поэтому не блокирует общее подключение приложения и может идти
+    параллельно с другими выгрузками. Данные пишутся во временный файл
+    <путь>.part, который переименовывается только после успешной выгрузки:
+    отмененная или неудачная выгрузка не оставляет файла.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+    def __init__(self, db_config, entity, file_format='csv', path=None):
+        if entity not in EXPORT_ENTITIES:
+            raise ValueError(f"Неизвестный тип данных для экспорта: {entity}")
+        if file_format != 'csv' and file_format not in config.EXPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат экспорта: {file_format}")
+        self.db_config = db_config
+        self.entity = entity
+        self.file_format = file_format
+        extension = '.csv' if file_format == 'csv' else config.EXPORT_FORMATS[file_format]
+        self.path = path or claim_export_path(export_filename(entity, extension))
+        self.rows = 0
+        self.status = self.PENDING
+        self.error = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._db = None
+
+    @property
+    def finished(self):
+        return self.status in (self.DONE, self.CANCELLED, self.FAILED)
+
+    def cancel(self):
+        """Отменить выгрузку: ожидающая не начнется, выполняемый запрос прерывается сервером"""
+        with self._lock:
+            self._cancelled.set()
+            if self._db is not None:
+                self._db.cancel()
+
+    def run(self):
+        """Выполнить выгрузку (в рабочем потоке)"""
+        if self._cancelled.is_set():
+            self.status = self.CANCELLED
+            release_export_path(self.path)
+            return
+        self.status = self.RUNNING
+        tmp_path = self.path + '.part'
+        db = DatabaseConnection(self.db_config)
+        try:
+            if not db.connect():
+                raise ConnectionError("Нет подключения к БД")
+            with self._lock:
+                self._db = db
+            self._check_cancelled()
+            self._export(DatabaseManager(db), tmp_path)
+            self._check_cancelled()
+            os.replace(tmp_path, self.path)
+            self.status = self.DONE
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if self._cancelled.is_set():
+                self.status = self.CANCELLED
+            else:
+                if isinstance(e, ImportError):
+                    self.error = "Для экспорта в Parquet/Feather установите pyarrow"
+                else:
+                    self.error = str(e)
+                self.status = self.FAILED
+        finally:
+            with self._lock:
+                self._db = None
+            db.disconnect()
+            release_export_path(self.path)
+
+    def _check_cancelled(self):
+        if self._cancelled.is_set():
+            raise ExportCancelled()
+
+    def _export(self, db_manager, path):
+        if self.file_format == 'csv':
+            export_csv = getattr(db_manager, f"export_{self.entity}_csv")
+            if not export_csv(path, progress=self._set_rows):
+                raise RuntimeError("Не удалось экспортировать данные")
+        else:
+            write_columnar(self._counted(db_manager.iter_export_rows(self.entity)),
+                           path, self.file_format)
+
+    def _set_rows(self, rows):
+        self.rows = rows
+
+    def _counted(self, batches):
+        """Пакеты строк с подсчетом прогресса и проверкой отмены между пакетами"""
+        for description, rows in batches:
+            self._check_cancelled()
+            yield description, rows
+            self.rows += len(rows)
+
+
+class ExportQueue:
+    """Очередь выгрузок: до workers выгрузок выполняются одновременно, остальные ждут"""
+
+    def __init__(self, workers=None):
+        self.jobs = []
+        self._queue = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"export-worker-{index}", daemon=True)
+            for index in range(workers or config.EXPORT_WORKERS)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job):
+        """Поставить выгрузку в очередь"""
+        self.jobs.append(job)
+        self._queue.put(job)
+        return job
+
+    def active(self):
+        """Выгрузки, которые ждут или выполняются"""
+        return [job for job in self.jobs if not job.finished]
+
+    def prune(self):
+        """Убрать из списка завершенные выгрузки, вернуть их"""
+        finished = [job for job in self.jobs if job.finished]
+        self.jobs = [job for job in self.jobs if not job.finished]
+        return finished
+
+    def cancel_all(self):
+        for job in self.active():
+            job.cancel()
+
+    def shutdown(self):
+        """Остановить рабочие потоки после выполнения очереди"""
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            job.run()
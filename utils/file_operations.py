@@ -2,28 +2,353 @@
 Утилиты для работы с файлами
 """
 
-import pandas as pd
 import os
 from datetime import datetime
 import config
 
+# Значения, читаемые как пропуски, для обоих движков CSV (совпадают со
+# значениями pandas по умолчанию)
+CSV_NA_VALUES = (
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+)
+
+def export_filename(filename_prefix, extension='.csv'):
+    """Имя файла экспорта с датой и временем"""
+    return f"{filename_prefix}_{datetime.now().strftime(config.DATE_FORMAT)}{extension}"
+
 def export_to_csv(data, filename_prefix, index=False):
     """Экспорт данных в CSV файл"""
-    filename = f"{filename_prefix}_{datetime.now().strftime(config.DATE_FORMAT)}.csv"
+    filename = export_filename(filename_prefix)
     data.to_csv(filename, index=index, encoding=config.CSV_ENCODING)
     return filename
 
-def save_cleaned_csv(df, original_path):
-    """Сохранить очищенный CSV файл"""
+def resolve_csv_engine(engine=None):
+    """Движок чтения CSV: 'pyarrow', если он выбран и установлен, иначе 'c'"""
+    import importlib.util
+    engine = engine or config.CSV_ENGINE
+    if engine not in config.CSV_ENGINES:
+        raise ValueError(f"Неизвестный движок CSV: {engine}")
+    if engine == 'pyarrow' and importlib.util.find_spec('pyarrow') is None:
+        return 'c'
+    return engine
+
+def read_csv(filepath, chunksize=None, engine=None):
+    """Прочитать CSV целиком или итератором по chunksize строк.
+    
+    Значения читаются как строки: очищенный файл сохраняет их исходный
+    формат, а результат не зависит от разбиения файла на части.
+    engine='pyarrow' разбирает файл в несколько потоков через Arrow
+    (строки в Arrow-типе string[pyarrow]); без pyarrow используется 'c'.
+    """
+    import pandas as pd
+    if resolve_csv_engine(engine) == 'pyarrow':
+        names = _csv_header_names(filepath)
+        # Повторяющиеся имена pandas переименовывает (a, a.1), Arrow - нет
+        if names and len(set(names)) == len(names):
+            if chunksize:
+                return _read_csv_arrow_chunks(filepath, names, chunksize)
+            return _read_csv_arrow(filepath, names)
+    return _read_csv_c(filepath, chunksize)
+
+def _read_csv_c(source, chunksize=None):
+    """Прочитать CSV движком c с общими для обоих движков параметрами"""
+    import pandas as pd
+    return pd.read_csv(source, dtype=str, chunksize=chunksize,
+                       keep_default_na=False, na_values=list(CSV_NA_VALUES))
+
+def _csv_header_names(source):
+    """Имена колонок из первой строки CSV (путь или двоичный файловый объект)"""
+    import csv
+    if hasattr(source, 'read'):
+        header_end, _ = _next_row_end(source, 0, False)
+        source.seek(0)
+        header = source.read(header_end) if header_end else source.read()
+        source.seek(0)
+    else:
+        with open(source, 'rb') as f:
+            header_end, _ = _next_row_end(f, 0, False)
+            f.seek(0)
+            header = f.read(header_end) if header_end else f.read()
+    text = header.decode('utf-8-sig').rstrip('\r\n')
+    return next(csv.reader([text]), []) if text else []
+
+def _arrow_csv_options(names):
+    """Параметры Arrow, повторяющие pd.read_csv(dtype=str)"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    return {
+        'read_options': pa_csv.ReadOptions(use_threads=True,
+                                           block_size=config.CSV_ARROW_BLOCK_BYTES),
+        'parse_options': pa_csv.ParseOptions(newlines_in_values=True),
+        'convert_options': pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            null_values=list(CSV_NA_VALUES),
+            strings_can_be_null=True
+        )
+    }
+
+def _arrow_to_frame(table, start=0):
+    """DataFrame со строками string[pyarrow] и индексом, продолжающим нумерацию"""
+    import pandas as pd
+    import pyarrow as pa
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+def _read_csv_arrow(source, names):
+    """Прочитать CSV целиком многопоточным читателем Arrow"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    try:
+        table = pa_csv.read_csv(source, **_arrow_csv_options(names))
+    except pa.ArrowInvalid:
+        # Строки с другим числом полей и т.п. разбирает движок pandas
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return _read_csv_c(source)
+    return _arrow_to_frame(table)
+
+def _read_csv_arrow_chunks(source, names, chunksize):
+    """Итератор DataFrame по chunksize строк из потокового читателя Arrow.
+    
+    Arrow разбирает файл по блокам, поэтому строку, которую он не принимает
+    (другое число полей и т.п.), может встретить после выдачи первых частей.
+    Тогда файл перечитывается движком c, и выдача продолжается с первой
+    невыданной строки с той же нумерацией и тем же размером частей.
+    """
+    import itertools
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    emitted = 0
+    try:
+        reader = pa_csv.open_csv(source, **_arrow_csv_options(names))
+        for frame in _arrow_frames(reader, reader.schema, chunksize):
+            emitted += len(frame)
+            yield frame
+    except pa.ArrowInvalid:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        # Выданы только полные части: последняя неполная выдается после конца файла
+        yield from itertools.islice(_read_csv_c(source, chunksize), emitted // chunksize, None)
+
+def _arrow_frames(batches, schema, chunksize):
+    """DataFrame по chunksize строк из пакетов Arrow произвольного размера"""
+    import pyarrow as pa
+    # Блоки Arrow ограничены байтами, поэтому пакеты собираются в части по строкам
+    pending = []
+    buffered = 0
+    start = 0
+    for batch in batches:
+        pending.append(batch)
+        buffered += batch.num_rows
+        while buffered >= chunksize:
+            table = pa.Table.from_batches(pending, schema=schema)
+            yield _arrow_to_frame(table.slice(0, chunksize), start)
+            start += chunksize
+            rest = table.slice(chunksize)
+            pending = rest.to_batches()
+            buffered = rest.num_rows
+    if buffered or start == 0:
+        yield _arrow_to_frame(pa.Table.from_batches(pending, schema=schema), start)
+
+def cleaned_csv_path(original_path):
+    """Путь к очищенному файлу рядом с исходным (Parquet/Feather сохраняют формат)"""
     file_dir = os.path.dirname(original_path)
     file_name = os.path.basename(original_path)
-    name_without_ext = os.path.splitext(file_name)[0]
-    cleaned_file_name = f"{name_without_ext}_cleaned.csv"
-    cleaned_file_path = os.path.join(file_dir, cleaned_file_name)
-    
+    name_without_ext, ext = os.path.splitext(file_name)
+    if not columnar_format(original_path):
+        ext = '.csv'
+    return os.path.join(file_dir, f"{name_without_ext}_cleaned{ext}")
+
+def save_cleaned_csv(df, original_path):
+    """Сохранить очищенный CSV файл"""
+    cleaned_file_path = cleaned_csv_path(original_path)
     df.to_csv(cleaned_file_path, index=False, encoding=config.CSV_ENCODING)
     return cleaned_file_path
 
+class CsvChunkWriter:
+    """Последовательная запись частей DataFrame в один CSV файл"""
+    
+    def __init__(self, path, header=True):
+        self.path = path
+        self.header = header
+        self._file = None
+    
+    def write(self, chunk):
+        """Дописать часть; заголовок пишется вместе с первой частью"""
+        header = self._file is None and self.header
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding=config.CSV_ENCODING, newline='')
+        chunk.to_csv(self._file, index=False, header=header)
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# Колоночные форматы: Parquet и Feather (Arrow IPC) читаются и пишутся через pyarrow
+COLUMNAR_EXTENSIONS = {'.parquet': 'parquet', '.pq': 'parquet',
+                       '.feather': 'feather', '.arrow': 'feather'}
+
+def columnar_format(filepath):
+    """'parquet' или 'feather' по расширению файла, иначе None"""
+    return COLUMNAR_EXTENSIONS.get(os.path.splitext(str(filepath))[1].lower())
+
+def read_columnar_schema(filepath):
+    """Схема Arrow файла Parquet/Feather без чтения данных"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if columnar_format(filepath) == 'parquet':
+        return pq.read_schema(filepath)
+    with pa.memory_map(str(filepath)) as source:
+        return pa.ipc.open_file(source).schema
+
+def read_columnar(filepath, columns=None, chunksize=None):
+    """Прочитать Parquet/Feather целиком или итератором по chunksize строк.
+    
+    Читаются только колонки columns (по умолчанию все): в Parquet остальные
+    колонки не загружаются с диска, в Feather - не распаковываются.
+    """
+    if chunksize:
+        return _read_columnar_chunks(filepath, columns, chunksize)
+    frames = list(_read_columnar_chunks(filepath, columns, None))
+    return frames[0]
+
+def _read_columnar_chunks(filepath, columns, chunksize):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = read_columnar_schema(filepath)
+    if columns:
+        schema = pa.schema([schema.field(name) for name in columns])
+    
+    if columnar_format(filepath) == 'parquet':
+        parquet = pq.ParquetFile(filepath)
+        if chunksize is None:
+            yield _arrow_to_frame(parquet.read(columns=columns))
+            return
+        batches = parquet.iter_batches(batch_size=chunksize, columns=columns)
+        yield from _arrow_frames(batches, schema, chunksize)
+        return
+    
+    with pa.memory_map(str(filepath)) as source:
+        reader = pa.ipc.open_file(source)
+        batches = (
+            reader.get_batch(i).select(schema.names) for i in range(reader.num_record_batches)
+        )
+        if chunksize is None:
+            yield _arrow_to_frame(pa.Table.from_batches(list(batches), schema=schema))
+            return
+        yield from _arrow_frames(batches, schema, chunksize)
+
+class ColumnarChunkWriter:
+    """Последовательная запись частей DataFrame в один файл Parquet/Feather"""
+    
+    def __init__(self, path, schema, file_format=None):
+        self.path = path
+        self.schema = schema
+        self.file_format = file_format or columnar_format(path)
+        self._writer = None
+        self._closed = False
+    
+    def _open(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.file_format == 'parquet':
+            return pq.ParquetWriter(self.path, self.schema,
+                                    compression=config.PARQUET_COMPRESSION)
+        options = pa.ipc.IpcWriteOptions(compression=config.FEATHER_COMPRESSION)
+        return pa.ipc.new_file(self.path, self.schema, options=options)
+    
+    def write_table(self, table):
+        """Дописать таблицу Arrow; файл создается при первой записи"""
+        if self._writer is None:
+            self._writer = self._open()
+        self._writer.write_table(table)
+    
+    def write(self, chunk):
+        """Дописать DataFrame в типах схемы файла"""
+        import pyarrow as pa
+        self.write_table(pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+    
+    def close(self):
+        if self._closed:
+            return
+        # Файл без строк все равно содержит схему
+        if self._writer is None:
+            self._writer = self._open()
+        self._writer.close()
+        self._closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# Типы Arrow для OID типов PostgreSQL из cursor.description
+PG_ARROW_TYPES = {
+    16: 'bool', 20: 'int64', 21: 'int16', 23: 'int32',
+    700: 'float32', 701: 'float64', 1700: 'float64',
+    25: 'string', 1042: 'string', 1043: 'string',
+    1082: 'date32', 1114: 'timestamp'
+}
+
+def _arrow_type(type_code):
+    import pyarrow as pa
+    name = PG_ARROW_TYPES.get(type_code, 'string')
+    return pa.timestamp('us') if name == 'timestamp' else getattr(pa, name)()
+
+def write_columnar(batches, path, file_format=None):
+    """Записать пакеты строк запроса в Parquet/Feather с типизированными колонками.
+    
+    batches - итератор (cursor.description, список строк), например
+    DatabaseConnection.iter_batches. Типы колонок берутся из описания
+    курсора, каждый пакет записывается сразу, поэтому память ограничена
+    размером пакета. Возвращает количество записанных строк.
+    """
+    import pyarrow as pa
+    writer = None
+    rows_written = 0
+    try:
+        for description, rows in batches:
+            if writer is None:
+                schema = pa.schema([(column.name, _arrow_type(column.type_code))
+                                    for column in description])
+                writer = ColumnarChunkWriter(path, schema, file_format)
+            columns = list(zip(*rows)) or [[] for _ in schema]
+            arrays = [
+                # numeric приходит как Decimal и сохраняется как float64
+                pa.array([None if value is None else float(value) for value in values], field.type)
+                if pa.types.is_floating(field.type) else pa.array(values, field.type)
+                for values, field in zip(columns, schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows_written += len(rows)
+    except BaseException:
+        # Недописанный файл не оставляем
+        if writer is not None:
+            writer.close()
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    if writer is not None:
+        writer.close()
+    return rows_written
+
+def export_columnar(batches, filename_prefix, file_format):
+    """Экспорт пакетов строк в файл Parquet/Feather с датой в имени"""
+    filename = export_filename(filename_prefix, config.EXPORT_FORMATS[file_format])
+    write_columnar(batches, filename, file_format)
+    return filename
+
 def get_file_info(filepath):
     """Получить информацию о файле"""
     if not os.path.exists(filepath):
@@ -36,4 +361,83 @@ def get_file_info(filepath):
         'size': stats.st_size,
         'created': datetime.fromtimestamp(stats.st_ctime),
         'modified': datetime.fromtimestamp(stats.st_mtime)
-    }
\ No newline at end of file
+    }
+
+def _next_row_end(f, position, inside_quotes, block_size=1024 * 1024):
+    """Позиция после ближайшего конца строки CSV, не входящего в кавычки.
+    
+    inside_quotes - находится ли position внутри значения в кавычках.
+    Возвращает (позиция, inside_quotes) или (None, ...) в конце файла.
+    """
+    f.seek(position)
+    while True:
+        block = f.read(block_size)
+        if not block:
+            return None, inside_quotes
+        start = 0
+        while True:
+            newline = block.find(b'\n', start)
+            if newline < 0:
+                inside_quotes ^= block.count(b'"', start) % 2 == 1
+                break
+            inside_quotes ^= block.count(b'"', start, newline) % 2 == 1
+            if not inside_quotes:
+                return position + newline + 1, inside_quotes
+            start = newline + 1
+        position += len(block)
+
+def _count_quotes(f, start, end, block_size=1024 * 1024):
+    """Количество кавычек в байтах [start, end)"""
+    f.seek(start)
+    count = 0
+    remaining = end - start
+    while remaining > 0:
+        block = f.read(min(block_size, remaining))
+        if not block:
+            break
+        count += block.count(b'"')
+        remaining -= len(block)
+    return count
+
+def split_csv_ranges(filepath, range_bytes=None):
+    """Разбить CSV на заголовок и диапазоны байтов по границам строк.
+    
+    Границы выбираются только вне значений в кавычках, поэтому переводы
+    строк внутри кавычек не разрывают запись. Возвращает (байты заголовка,
+    список (начало, конец)).
+    """
+    range_bytes = range_bytes or config.CSV_RANGE_BYTES
+    size = os.path.getsize(filepath)
+    ranges = []
+    with open(filepath, 'rb') as f:
+        header_end, _ = _next_row_end(f, 0, False)
+        if header_end is None:
+            f.seek(0)
+            return f.read(), []
+        f.seek(0)
+        header = f.read(header_end)
+        
+        start = header_end
+        while start < size:
+            target = start + range_bytes
+            if target >= size:
+                ranges.append((start, size))
+                break
+            # Четность кавычек в [start, target) определяет, попали ли мы в значение
+            inside_quotes = _count_quotes(f, start, target) % 2 == 1
+            end, _ = _next_row_end(f, target, inside_quotes)
+            if end is None:
+                ranges.append((start, size))
+                break
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+def read_csv_range(filepath, header, start, end, engine=None):
+    """Прочитать диапазон байтов CSV как DataFrame (значения - строки)"""
+    import io
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return read_csv(io.BytesIO(header + data), engine=engine)
+
@@ -0,0 +1,164 @@
+"""
+Пакетный расчет заработной платы
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import config
+from database.schema import ensure_schema
+
+# Учитываются задачи, завершенные внутри периода (tasks.completed_at
+# заполняется триггером из database/schema.py)
+PAYROLL_HOURS_QUERY = """
+    SELECT e.id, e.name, e.position, e.salary,
+           COALESCE(SUM(t.hours_required) FILTER (
+               WHERE t.status = 'Завершено'
+                 AND t.completed_at >= %s AND t.completed_at < %s
+           ), 0)
+    FROM employees e
+    LEFT JOIN tasks t ON t.employee_id = e.id
+    GROUP BY e.id, e.name, e.position, e.salary
+    ORDER BY e.id
+"""
+
+class PayrollPeriod:
+    """Расчетный период: границы по месяцам включительно"""
+
+    def __init__(self, start, end=None):
+        self.start = date(start.year, start.month, 1)
+        end = end or start
+        self.end = date(end.year, end.month, 1)
+        if self.end < self.start:
+            raise ValueError("Конец периода раньше начала")
+
+    @classmethod
+    def month(cls, year, month):
+        return cls(date(year, month, 1))
+
+    @property
+    def key(self):
+        if self.start == self.end:
+            return self.start.strftime('%Y-%m')
+        return f"{self.start.strftime('%Y-%m')}..{self.end.strftime('%Y-%m')}"
+
+    def bounds(self):
+        """Границы периода [начало, начало следующего месяца после конца)"""
+        year, month = self.end.year, self.end.month
+        after_end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return self.start, after_end
+
+    def months(self):
+        """Список месяцев периода в формате YYYY-MM"""
+        result = []
+        year, month = self.start.year, self.start.month
+        while (year, month) <= (self.end.year, self.end.month):
+            result.append(f"{year:04d}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return result
+
+
+class PayrollEngine:
+    """Расчет зарплаты всех сотрудников одним векторизованным проходом"""
+
+    def __init__(self, db_connection, norm_hours=None, norms_by_month=None,
+                 norms_by_position=None, overtime_multiplier=None):
+        self.db = db_connection
+        self.norm_hours = norm_hours or config.PAYROLL_NORM_HOURS
+        self.norms_by_month = config.PAYROLL_NORMS_BY_MONTH if norms_by_month is None else norms_by_month
+        self.norms_by_position = (config.PAYROLL_NORMS_BY_POSITION
+                                  if norms_by_position is None else norms_by_position)
+        self.overtime_multiplier = (config.PAYROLL_OVERTIME_MULTIPLIER
+                                    if overtime_multiplier is None else overtime_multiplier)
+        self._schema_ready = False
+
+    def month_norm(self, month_key):
+        """Норма часов для месяца YYYY-MM (по дате, по номеру месяца или по умолчанию)"""
+        if month_key in self.norms_by_month:
+            return self.norms_by_month[month_key]
+        return self.norms_by_month.get(month_key[5:], self.norm_hours)
+
+    def load_hours(self, period):
+        """Часы, отработанные всеми сотрудниками за период, одним агрегирующим запросом"""
+        rows = self.db.execute_query(PAYROLL_HOURS_QUERY.strip(), period.bounds(), fetch=True) or []
+        frame = pd.DataFrame(rows, columns=['employee_id', 'name', 'position', 'salary', 'hours_worked'])
+        frame['salary'] = frame['salary'].astype(np.float64)
+        frame['hours_worked'] = frame['hours_worked'].astype(np.float64)
+        return frame
+
+    def compute(self, period, hours_frame):
+        """Рассчитать зарплату за период для фрейма из load_hours"""
+        months = period.months()
+        period_norm = float(sum(self.month_norm(month) for month in months))
+
+        result = hours_frame.copy()
+        position_norm = result['position'].map(self.norms_by_position).astype(np.float64)
+        result['norm_hours'] = (position_norm * len(months)).fillna(period_norm)
+
+        hours = result['hours_worked'].to_numpy()
+        norm = result['norm_hours'].to_numpy()
+        regular = np.minimum(hours, norm)
+        overtime = hours - regular
+        rate = np.divide(result['salary'].to_numpy() * len(months), norm,
+                         out=np.zeros(len(result)), where=norm > 0)
+        result['overtime_hours'] = overtime
+        result['pay'] = rate * (regular + overtime * self.overtime_multiplier)
+        result['period_key'] = period.key
+        return result
+
+    def run(self, period, persist=True):
+        """Рассчитать зарплату за период и сохранить изменившиеся результаты"""
+        result = self.compute(period, self.load_hours(period))
+        result['changed'] = True
+        if persist:
+            result['changed'] = self._persist(period, result)
+        return result
+
+    def load_results(self, period):
+        """Сохраненные результаты за период"""
+        query = """
+            SELECT employee_id, hours_worked, salary, norm_hours, pay
+            FROM payroll_results WHERE period_key = %s
+        """
+        rows = self.db.execute_query(query, (period.key,), fetch=True) or []
+        frame = pd.DataFrame(rows, columns=['employee_id', 'hours_worked', 'salary', 'norm_hours', 'pay'])
+        return frame.astype({'hours_worked': np.float64, 'salary': np.float64,
+                             'norm_hours': np.float64, 'pay': np.float64})
+
+    def _persist(self, period, result):
+        """Записать только новые и изменившиеся строки, вернуть маску изменений"""
+        if not self._schema_ready:
+            ensure_schema(self.db)
+            self._schema_ready = True
+
+        columns = ['hours_worked', 'salary', 'norm_hours', 'pay']
+        stored = self.load_results(period).set_index('employee_id')
+        current = result.set_index('employee_id')[columns].round(2)
+        previous = stored.reindex(current.index)[columns]
+        changed = (previous.isna() | (previous != current)).any(axis=1).to_numpy()
+
+        if changed.any():
+            rows = [
+                (period.key, int(emp_id), *values)
+                for emp_id, values in zip(current.index[changed],
+                                          current[changed].itertuples(index=False))
+            ]
+            query = """
+                INSERT INTO payroll_results
+                    (period_key, employee_id, hours_worked, salary, norm_hours, pay)
+                VALUES %s
+                ON CONFLICT (period_key, employee_id) DO UPDATE
+                SET hours_worked = EXCLUDED.hours_worked, salary = EXCLUDED.salary,
+                    norm_hours = EXCLUDED.norm_hours, pay = EXCLUDED.pay,
+                    computed_at = now()
+            """
+            if not self.db.execute_values(query, rows):
+                raise RuntimeError("Не удалось сохранить расчет зарплаты")
+
+        removed = stored.index.difference(current.index)
+        if len(removed):
+            query = "DELETE FROM payroll_results WHERE period_key = %s AND employee_id = ANY(%s)"
+            self.db.execute_query(query, (period.key, [int(emp_id) for emp_id in removed]))
+        return changed